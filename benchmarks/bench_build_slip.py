@@ -0,0 +1,99 @@
+"""
+bench_build_slip.py - builder preview latency
+---------------------------------------------
+Loads a realistic match frame into BetAssistant and times build_slip(), which
+is what the dashboard's builder preview runs on every change.  The candidate
+table is built once per load (timed separately); each preview then masks it
+and selects legs with score_pick_arrays.  For reference the former selection
+(score_pick on every remaining CandidateLeg, full sort every round) is timed
+on the same candidates, and both must pick the same legs.  The target is
+50 ms at 50k candidates.
+
+Usage:
+  python -m benchmarks.bench_build_slip
+  python -m benchmarks.bench_build_slip --rows 17000 --profile medium_risk --repeat 5 --target-ms 50
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_load_matches import _frame
+from bet_framework.BetAssistant import BetAssistant
+from bet_framework.core.scoring import resolve_max_legs, resolve_min_pick_quality, resolve_stop_threshold, score_pick
+from bet_framework.core.Slip import PROFILES, get_profile
+
+
+def _former_select(candidates, cfg) -> list:
+    """_select_legs before the array kernel."""
+    max_sources = max((c.sources for c in candidates), default=1)
+    min_legs = max(1, int(cfg.target_legs * cfg.min_legs_fill_ratio))
+    selected, seen, total_odds = [], set(), 1.0
+    while len(selected) < resolve_max_legs(cfg):
+        if total_odds >= cfg.target_odds * resolve_stop_threshold(cfg) and len(selected) >= min_legs:
+            break
+        ideal = (cfg.target_odds / total_odds) ** (1.0 / max(1, cfg.target_legs - len(selected)))
+        scored = [
+            (*score_pick(c, ideal, max_sources, cfg, use_preadjusted=True), c) for c in candidates if c.match_name not in seen
+        ]
+        if not scored:
+            break
+        scored.sort(key=lambda x: (-x[1], x[0]))
+        tier, score, quality, best = scored[0]
+        if resolve_min_pick_quality(cfg) > 0.0 and quality < resolve_min_pick_quality(cfg):
+            break
+        selected.append((best.result_url, best.market, tier, score, quality))
+        seen.add(best.match_name)
+        total_odds *= best.odds
+    return selected if len(selected) >= min_legs else []
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(rows: int, profile: str, repeat: int, target_ms: float) -> bool:
+    cfg = get_profile(profile)
+    with tempfile.TemporaryDirectory() as tmp:
+        assistant = BetAssistant(os.path.join(tmp, "slips.db"))
+        assistant.load_matches(_frame(rows))
+        started = time.perf_counter()
+        assistant._candidate_table()
+        table_ms = (time.perf_counter() - started) * 1000
+
+        candidates = assistant._collect_candidates(cfg)
+        legs = assistant.build_slip(cfg)
+        assert [(c.result_url, c.market, c.tier, c.score, c.quality) for c in legs] == _former_select(candidates, cfg)
+
+        preview_ms = _median_ms(lambda: assistant.build_slip(cfg), repeat)
+        former_ms = _median_ms(lambda: _former_select(candidates, cfg), 1)
+        assistant.close()
+
+    passed = preview_ms <= target_ms
+    print(f"{rows} matches, {len(candidates)} {profile} candidates, {len(legs)} legs (same picks as before)")
+    print(f"  candidate table  {table_ms:8.1f} ms   once per load")
+    print(f"  build_slip       {preview_ms:8.1f} ms   (target {target_ms:.0f} ms)")
+    print(f"  former selection {former_ms:8.1f} ms   on prebuilt CandidateLegs")
+    print(f"  {'PASS' if passed else 'FAIL'}")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the builder preview (BetAssistant.build_slip)")
+    parser.add_argument("--rows", type=int, default=17_000)
+    parser.add_argument("--profile", default="medium_risk", choices=list(PROFILES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    raise SystemExit(0 if run(args.rows, args.profile, args.repeat, args.target_ms) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+bench_fetch_matches.py - MatchesManager.fetch_matches latency
+-------------------------------------------------------------
+Builds a matches DB of realistic rows (several predictions per match, a full
+odds dict) and times fetch_matches() on the loaded buffer, which is what the
+dashboard pays on every refresh_data().  The target is 200 ms for 20k matches
+on a Raspberry Pi-class CPU.
+
+Usage:
+  python -m benchmarks.bench_fetch_matches
+  python -m benchmarks.bench_fetch_matches --rows 20000 --repeat 5 --target-ms 200
+  python -m benchmarks.bench_fetch_matches --columnar-odds
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+from bet_framework.core.Match import Odds
+from bet_framework.MatchesManager import ODDS_FIELDS, MatchesManager
+
+START = datetime(2026, 4, 1)
+SOURCES = ["forebet", "predictz", "soccervista", "vitibet", "whoscored", "windrawwin"]
+
+
+def _rows(n: int, seed: int = 7) -> list[tuple]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        dt = START + timedelta(days=rng.randrange(14), hours=rng.choice((0, 13, 15, 18, 20)))
+        preds = [
+            {"source": s, "home": float(rng.randint(0, 3)), "away": float(rng.randint(0, 3))} for s in rng.sample(SOURCES, 4)
+        ]
+        odds = asdict(Odds(**{name: round(rng.uniform(1.05, 6.0), 2) for name in ODDS_FIELDS}))
+        rows.append((f"Home Club {i}", f"Away Club {i}", dt.isoformat(), json.dumps(preds), json.dumps(odds), None, "League"))
+    return rows
+
+
+def run(n: int, repeat: int, target_ms: float, columnar_odds: bool) -> bool:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        seed = MatchesManager(path)
+        seed.conn.executemany(
+            "INSERT INTO matches (home_team_name, away_team_name, datetime, predictions_scores, odds, result_url, league)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            _rows(n),
+        )
+        seed.conn.commit()
+        seed.close()
+        # Reopening with columnar_odds migrates the prices into the REAL columns
+        manager = MatchesManager(path, columnar_odds=columnar_odds)
+        manager.ensure_buffer()
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            df = manager.fetch_matches()
+            timings.append((time.perf_counter() - started) * 1000)
+        manager.close()
+
+    median = statistics.median(timings)
+    passed = median <= target_ms
+    print(f"fetch_matches: {len(df)} rows, columnar_odds={'on' if columnar_odds else 'off'}")
+    print(f"  median {median:.1f} ms, best {min(timings):.1f} ms over {repeat} runs (target {target_ms:.0f} ms)")
+    print(f"  {'PASS' if passed else 'FAIL'}")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MatchesManager.fetch_matches")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=200.0, help="Budget for one fetch on a Pi-class CPU")
+    parser.add_argument("--columnar-odds", action="store_true", help="Read prices from the REAL odds columns")
+    args = parser.parse_args()
+    raise SystemExit(0 if run(args.rows, args.repeat, args.target_ms, args.columnar_odds) else 1)
+
+
+if __name__ == "__main__":
+    main()
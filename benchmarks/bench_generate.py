@@ -0,0 +1,84 @@
+"""
+bench_generate.py - generator tick: one slip at a time vs one run
+-----------------------------------------------------------------
+Times what AppLogic.generate_slips does for every built-in profile × count:
+
+  per slip   build_slip_auto_exclude() + save_slip() for each slip
+             (a candidate selection and a commit per slip)
+  run        build_slips() once for the whole plan + save_slips()
+             (a candidate selection per profile, one commit)
+
+Both start from a copy of the same slips DB and must build the same slips.
+
+Usage:
+  python -m benchmarks.bench_generate
+  python -m benchmarks.bench_generate --rows 17000 --count 5 --history 200
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.bench_load_matches import _frame
+from bet_framework.BetAssistant import BetAssistant
+from bet_framework.core.Slip import PROFILES, get_profile
+
+
+def _per_slip(assistant: BetAssistant, plan) -> list:
+    built = []
+    for name, cfg, count in plan:
+        for _ in range(count):
+            legs = assistant.build_slip_auto_exclude(cfg)
+            if not legs:
+                break
+            assistant.save_slip(name, legs)
+            built.append((name, [leg.result_url for leg in legs]))
+    return built
+
+
+def _run(assistant: BetAssistant, plan) -> list:
+    slips = assistant.build_slips(plan)
+    assistant.save_slips([(name, legs, 1.0) for name, legs in slips])
+    return [(name, [leg.result_url for leg in legs]) for name, legs in slips]
+
+
+def run(rows: int, count: int, history: int) -> None:
+    df = _frame(rows)
+    plan = [(name, get_profile(name), count) for name in PROFILES]
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_path = os.path.join(tmp, "seed.db")
+        with BetAssistant(seed_path) as seed:
+            seed.load_matches(df)
+            for name, legs in seed.build_slips([("history", get_profile("high_risk"), history)]):
+                seed.save_slip(name, legs)
+
+        timings, outputs = {}, {}
+        for label, fn in (("per slip", _per_slip), ("run", _run)):
+            path = os.path.join(tmp, f"{label.replace(' ', '_')}.db")
+            shutil.copy(seed_path, path)
+            with BetAssistant(path) as assistant:
+                assistant.load_matches(df)
+                assistant._candidate_table()  # built once per load in both cases
+                started = time.perf_counter()
+                outputs[label] = fn(assistant, plan)
+                timings[label] = (time.perf_counter() - started) * 1000
+
+    assert outputs["run"] == outputs["per slip"]
+    print(f"{rows} matches, {history} earlier slips, {len(outputs['run'])} slips built (same slips both ways)")
+    print(f"  per slip {timings['per slip']:8.1f} ms")
+    print(f"  run      {timings['run']:8.1f} ms   ({timings['per slip'] / timings['run']:.1f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark a generator tick (AppLogic.generate_slips)")
+    parser.add_argument("--rows", type=int, default=17_000)
+    parser.add_argument("--count", type=int, default=5, help="Slips per profile")
+    parser.add_argument("--history", type=int, default=200, help="Slips already in the DB")
+    args = parser.parse_args()
+    run(args.rows, args.count, args.history)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+bench_load_matches.py - BetAssistant.load_matches throughput
+------------------------------------------------------------
+Builds a match frame shaped like MatchesManager.fetch_matches() output
+(several predicted scores per match, a full odds dict) and times
+load_matches() against the former row-by-row implementation (iterrows, one
+calc_consensus and one 40-key dict per match).  Both results are compared
+column by column before any timing is reported.
+
+Usage:
+  python -m benchmarks.bench_load_matches
+  python -m benchmarks.bench_load_matches --rows 20000 --repeat 5
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import statistics
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from bet_framework.BetAssistant import BetAssistant, _compact_match_frame
+from bet_framework.core.consensus import calc_consensus
+from bet_framework.core.Match import Odds
+from bet_framework.MatchesManager import ODDS_FIELDS
+
+START = datetime(2026, 4, 1)
+SOURCES = ["forebet", "predictz", "soccervista", "vitibet", "whoscored", "windrawwin"]
+
+
+def _frame(n: int, seed: int = 7) -> pd.DataFrame:
+    rng = random.Random(seed)
+    teams = [f"Football Club {i}" for i in range(max(2, n // 8))]
+    leagues = [f"Country {i} - Division {i % 3 + 1}" for i in range(200)]
+    rows = []
+    for i in range(n):
+        home, away = rng.sample(teams, 2)
+        rows.append(
+            {
+                "home_name": home,
+                "away_name": away,
+                "datetime": START + timedelta(days=rng.randrange(14), hours=rng.choice((0, 13, 15, 18, 20))),
+                "scores": [
+                    {"source": s, "home": float(rng.randint(0, 3)), "away": float(rng.randint(0, 3))}
+                    for s in rng.sample(SOURCES, rng.randint(1, 6))
+                ],
+                "odds": asdict(Odds(**{name: round(rng.uniform(1.05, 6.0), 2) for name in ODDS_FIELDS})),
+                "result_url": f"https://example.com/match/{i}",
+                "league": rng.choice(leagues),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _former_load_matches(df: pd.DataFrame) -> tuple[pd.DataFrame, list]:
+    """load_matches before the columnar rewrite."""
+    rows, raw_odds = [], []
+    for idx, row in df.iterrows():
+        match_key = f"{row['home_name']}_{row['away_name']}_{row['datetime']}"
+        match_id = f"match_{idx}_{hashlib.md5(match_key.encode(), usedforsecurity=False).hexdigest()}"
+        odds = row.get("odds") or {}
+        scores = row.get("scores") or []
+        cons = calc_consensus(scores)
+        rows.append(
+            {
+                "match_id": match_id,
+                "datetime": row["datetime"],
+                "home": row["home_name"],
+                "away": row["away_name"],
+                "sources": len({s.get("source", "") for s in scores if s.get("source")}),
+                "result_url": row.get("result_url"),
+                "league": row.get("league"),
+                "cons_home": cons["result"]["home"],
+                "cons_draw": cons["result"]["draw"],
+                "cons_away": cons["result"]["away"],
+                "cons_over_15": cons["over_under_15"]["over"],
+                "cons_under_15": cons["over_under_15"]["under"],
+                "cons_over_05": cons["over_under_05"]["over"],
+                "cons_under_05": cons["over_under_05"]["under"],
+                "cons_over_25": cons["over_under_25"]["over"],
+                "cons_under_25": cons["over_under_25"]["under"],
+                "cons_over_35": cons["over_under_35"]["over"],
+                "cons_under_35": cons["over_under_35"]["under"],
+                "cons_over_45": cons["over_under_45"]["over"],
+                "cons_under_45": cons["over_under_45"]["under"],
+                "cons_btts_yes": cons["btts"]["yes"],
+                "cons_btts_no": cons["btts"]["no"],
+                "cons_dc_1x": cons["double_chance"]["1x"],
+                "cons_dc_12": cons["double_chance"]["12"],
+                "cons_dc_x2": cons["double_chance"]["x2"],
+                "odds_home": odds.get("home", 0.0),
+                "odds_draw": odds.get("draw", 0.0),
+                "odds_away": odds.get("away", 0.0),
+                "odds_over_15": odds.get("over_15", 0.0),
+                "odds_under_15": odds.get("under_15", 0.0),
+                "odds_over_25": odds.get("over_25", 0.0),
+                "odds_under_25": odds.get("under_25", 0.0),
+                "odds_btts_yes": odds.get("btts_y", 0.0),
+                "odds_btts_no": odds.get("btts_n", 0.0),
+                "odds_over_05": odds.get("over_05", 0.0),
+                "odds_under_05": odds.get("under_05", 0.0),
+                "odds_over_35": odds.get("over_35", 0.0),
+                "odds_under_35": odds.get("under_35", 0.0),
+                "odds_over_45": odds.get("over_45", 0.0),
+                "odds_under_45": odds.get("under_45", 0.0),
+                "odds_dc_1x": odds.get("dc_1x", 0.0),
+                "odds_dc_12": odds.get("dc_12", 0.0),
+                "odds_dc_x2": odds.get("dc_x2", 0.0),
+            }
+        )
+        raw_odds.append(row.get("odds"))
+    return _compact_match_frame(rows), raw_odds
+
+
+def _time_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(n: int, repeat: int) -> None:
+    df = _frame(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        assistant = BetAssistant(os.path.join(tmp, "slips.db"))
+        assistant.load_matches(df)
+        expected, expected_odds = _former_load_matches(df)
+        pd.testing.assert_frame_equal(assistant._df, expected)
+        assert assistant._odds == expected_odds
+
+        former_ms = _time_ms(lambda: _former_load_matches(df), repeat)
+        columnar_ms = _time_ms(lambda: assistant.load_matches(df), repeat)
+        assistant.close()
+
+    print(f"{n} matches, {sum(len(s) for s in df['scores'])} predicted scores (output identical)")
+    print(f"  row by row  {former_ms:8.1f} ms")
+    print(f"  columnar    {columnar_ms:8.1f} ms   ({former_ms / columnar_ms:.1f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark BetAssistant.load_matches")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+bench_matches_manager.py - MatchesManager.add_match throughput
+--------------------------------------------------------------
+Feeds synthetic matches spread over a scraping window into a fresh
+MatchesManager and reports add_match throughput per buffer size.  About a
+quarter of the calls re-add an already-known fixture from a second source so
+the update path is exercised alongside inserts.
+
+Usage:
+  python -m benchmarks.bench_matches_manager
+  python -m benchmarks.bench_matches_manager --sizes 1000 10000 100000 --days 14
+  python -m benchmarks.bench_matches_manager --sizes 1000 10000 --fuzzy
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from bet_framework.core.Match import Match, Score
+from bet_framework.MatchesManager import MatchesManager
+
+SIMILARITY_CONFIG = {
+    "threshold": 65,
+    "acronyms": {"fc": "football club", "utd": "united"},
+    "synonyms": {},
+    "weights": {"token": 0.5, "substr": 0.1, "phonetic": 0.1, "ratio": 0.3},
+}
+
+START = datetime(2026, 4, 1)
+
+
+def _workload(n: int, days: int, seed: int = 7) -> list[Match]:
+    rng = random.Random(seed)
+    fixtures: list[tuple[str, str, datetime]] = []
+    matches: list[Match] = []
+    while len(matches) < n:
+        if fixtures and rng.random() < 0.25:
+            home, away, dt = rng.choice(fixtures)
+            matches.append(Match(home, away, dt, [Score("source_b", 1, 1)], None))
+            continue
+        i = len(fixtures)
+        dt = START + timedelta(days=rng.randrange(days), hours=rng.choice((0, 13, 15, 18, 20)))
+        home, away = f"Home Club {i}", f"Away Club {i}"
+        fixtures.append((home, away, dt))
+        matches.append(Match(home, away, dt, [Score("source_a", 2, 1)], None))
+    return matches
+
+
+def run(sizes: list[int], days: int, fuzzy: bool) -> None:
+    config = SIMILARITY_CONFIG if fuzzy else None
+    print(f"add_match throughput ({days}-day window, similarity={'on' if fuzzy else 'off'})")
+    print(f"{'rows':>10} {'seconds':>10} {'rows/s':>12} {'buffer':>10}")
+    for n in sizes:
+        workload = _workload(n, days)
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = MatchesManager(os.path.join(tmp, "bench.db"), config)
+            manager.ensure_buffer()
+            started = time.perf_counter()
+            for match in workload:
+                manager.add_match(match)
+            elapsed = time.perf_counter() - started
+            buffered = len(manager.ensure_buffer())
+            manager._dirty = False  # nothing to persist for the benchmark
+            manager.close()
+        print(f"{n:>10} {elapsed:>10.2f} {n / elapsed:>12.0f} {buffered:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MatchesManager.add_match")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--days", type=int, default=14, help="Spread of match dates (scraping window)")
+    parser.add_argument("--fuzzy", action="store_true", help="Enable the SimilarityEngine on lookups")
+    args = parser.parse_args()
+    run(args.sizes, args.days, args.fuzzy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+bench_memory.py - resident size of the dashboard's match data
+-------------------------------------------------------------
+Builds a matches DB of realistic rows (teams and leagues drawn from fixed
+pools, a full odds dict) and reports the deep memory of the two frames the
+dashboard keeps resident: the MatchesManager buffer (plain vs
+compact_buffer) and BetAssistant's match frame (compact vs the former
+layout: object names and kickoffs, float64 consensus / odds and the raw odds
+dict per row).  The target is a 50 % smaller match frame, so the dashboard
+fits next to nginx on a Raspberry Pi.
+
+Usage:
+  python -m benchmarks.bench_memory
+  python -m benchmarks.bench_memory --rows 20000 --target-reduction 0.5
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from bet_framework.BetAssistant import BetAssistant
+from bet_framework.core.Match import Odds
+from bet_framework.core.utils import frame_memory_report
+from bet_framework.MatchesManager import ODDS_FIELDS, MatchesManager
+
+START = datetime(2026, 4, 1)
+SOURCES = ["forebet", "predictz", "soccervista", "vitibet", "whoscored", "windrawwin"]
+
+
+def _rows(n: int, seed: int = 7) -> list[tuple]:
+    rng = random.Random(seed)
+    teams = [f"Football Club {i}" for i in range(max(2, n // 8))]
+    leagues = [f"Country {i} - Division {i % 3 + 1}" for i in range(200)]
+    rows = []
+    for i in range(n):
+        home, away = rng.sample(teams, 2)
+        dt = START + timedelta(days=rng.randrange(14), hours=rng.choice((0, 13, 15, 18, 20)))
+        preds = [
+            {"source": s, "home": float(rng.randint(0, 3)), "away": float(rng.randint(0, 3))} for s in rng.sample(SOURCES, 4)
+        ]
+        odds = asdict(Odds(**{name: round(rng.uniform(1.05, 6.0), 2) for name in ODDS_FIELDS}))
+        url = f"https://example.com/match/{i}"
+        rows.append((home, away, dt.isoformat(), json.dumps(preds), json.dumps(odds), url, rng.choice(leagues)))
+    return rows
+
+
+def _former_layout_bytes(assistant: BetAssistant) -> int:
+    """Deep size the match frame had before the compact dtypes."""
+    wide = assistant._df.astype(dict.fromkeys(("home", "away", "league", "datetime"), object))
+    wide = wide.astype({c: np.float64 for c in wide.columns if c.startswith(("cons_", "odds_"))})
+    wide["sources"] = wide["sources"].astype(np.int64)
+    wide["odds"] = assistant._odds
+    return frame_memory_report(wide)["total_bytes"]
+
+
+def _mb(n: int) -> str:
+    return f"{n / 2**20:.1f} MB"
+
+
+def run(n: int, target_reduction: float) -> bool:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        seed = MatchesManager(path)
+        seed.conn.executemany(
+            "INSERT INTO matches (home_team_name, away_team_name, datetime, predictions_scores, odds, result_url, league)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            _rows(n),
+        )
+        seed.conn.commit()
+        seed.close()
+
+        plain = MatchesManager(path)
+        plain.ensure_buffer()
+        compact = MatchesManager(path, compact_buffer=True)
+        compact.ensure_buffer()
+        buffer_plain = plain.memory_report()["total_bytes"]
+        buffer_compact = compact.memory_report()["total_bytes"]
+
+        assistant = BetAssistant(os.path.join(tmp, "slips.db"))
+        assistant.load_matches(compact.fetch_matches())
+        frame_compact = assistant.memory_report()["total_bytes"]
+        frame_former = _former_layout_bytes(assistant)
+        for manager in (plain, compact, assistant):
+            manager.close()
+
+    reduction = 1 - frame_compact / frame_former
+    passed = reduction >= target_reduction
+    print(f"{n} matches")
+    print(f"  MatchesManager buffer: {_mb(buffer_plain)} plain, {_mb(buffer_compact)} compact")
+    print(f"  BetAssistant frame:    {_mb(frame_former)} former, {_mb(frame_compact)} compact")
+    print(f"  frame reduction {reduction:.0%} (target {target_reduction:.0%})")
+    print(f"  {'PASS' if passed else 'FAIL'}")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the memory of the dashboard's match frames")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--target-reduction", type=float, default=0.5, help="Required shrink of the match frame")
+    args = parser.parse_args()
+    raise SystemExit(0 if run(args.rows, args.target_reduction) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+bench_optimizer.py - greedy vs dp leg selection
+-----------------------------------------------
+Builds slips for each built-in profile on several generated match frames,
+once with the greedy loop and once with optimizer="dp", and compares:
+
+  avg score   mean leg score against the even split of the target
+              (target_odds ** (1 / target_legs)), the score the dp search
+              maximises, so both are judged on the same scale
+  in band     share of slips whose total odds land within
+              [target × stop_threshold, target / stop_threshold]
+  ms          median build_slip() latency (the builder preview)
+
+The dp search stops at its time budget and falls back to greedy when it
+has no slip in the band, so it should never cost more than the budget on
+top of greedy; the run passes when that holds for every profile.
+
+Usage:
+  python -m benchmarks.bench_optimizer
+  python -m benchmarks.bench_optimizer --rows 1000 17000 --frames 3 --repeat 5 --budget-ms 25
+"""
+
+import argparse
+import math
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_load_matches import _frame
+from bet_framework.BetAssistant import BetAssistant
+from bet_framework.core.scoring import adjusted_consensus, resolve_shrinkage_k, resolve_stop_threshold, score_pick_arrays
+from bet_framework.core.Slip import PROFILES, get_profile
+
+
+def _judge(legs, cfg, max_sources: int) -> tuple[float, bool]:
+    """(mean leg score against the even split, total odds in the target band)."""
+    if not legs:
+        return 0.0, False
+    _, score, _ = score_pick_arrays(
+        np.array([leg.odds for leg in legs]),
+        np.array([adjusted_consensus(leg.consensus, leg.sources, resolve_shrinkage_k(cfg)) for leg in legs]),
+        np.array([leg.sources for leg in legs]),
+        cfg.target_odds ** (1.0 / cfg.target_legs),
+        max_sources,
+        cfg,
+    )
+    total = math.prod(leg.odds for leg in legs)
+    stop = resolve_stop_threshold(cfg)
+    return float(score.mean()), cfg.target_odds * stop <= total <= cfg.target_odds / stop
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(rows: int, frames: int, repeat: int, budget_ms: float) -> float:
+    """Print the comparison for one frame size; returns the largest dp overhead over greedy in ms."""
+    results = {name: {"greedy": [], "dp": []} for name in PROFILES}
+    with tempfile.TemporaryDirectory() as tmp:
+        assistant = BetAssistant(os.path.join(tmp, "slips.db"))
+        for seed in range(frames):
+            assistant.load_matches(_frame(rows, seed=seed))
+            for name in PROFILES:
+                cfg = get_profile(name)
+                max_sources = max(int(assistant._candidate_table().sources.max()), 1)
+                for mode in ("greedy", "dp"):
+                    cfg.optimizer, cfg.optimizer_budget_ms = mode, budget_ms
+                    legs = assistant.build_slip(cfg)
+                    results[name][mode].append(
+                        (*_judge(legs, cfg, max_sources), _median_ms(lambda c=cfg: assistant.build_slip(c), repeat))
+                    )
+        assistant.close()
+
+    print(f"{rows} matches × {frames} frames, dp budget {budget_ms:.0f} ms")
+    print(f"{'profile':>14} {'':>7} {'avg score':>10} {'in band':>8} {'ms':>8}")
+    overhead = 0.0
+    for name, modes in results.items():
+        p50 = {}
+        for mode, runs in modes.items():
+            scores, in_band, ms = zip(*runs, strict=True)
+            p50[mode] = statistics.median(ms)
+            print(f"{name:>14} {mode:>7} {statistics.mean(scores):10.4f} {sum(in_band) / len(in_band):8.0%} {p50[mode]:8.1f}")
+        overhead = max(overhead, p50["dp"] - p50["greedy"])
+    return overhead
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark greedy vs dp leg selection")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 17_000], help="Frame sizes (matches)")
+    parser.add_argument("--frames", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=25.0)
+    args = parser.parse_args()
+    overhead = max(run(rows, args.frames, args.repeat, args.budget_ms) for rows in args.rows)
+    passed = overhead <= args.budget_ms
+    print(
+        f"largest dp overhead over greedy {overhead:.1f} ms (budget {args.budget_ms:.0f} ms)  {'PASS' if passed else 'FAIL'}"
+    )
+    raise SystemExit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
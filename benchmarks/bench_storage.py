@@ -0,0 +1,106 @@
+"""
+bench_storage.py - SQLite write throughput per storage profile
+--------------------------------------------------------------
+Runs the writes the dashboard's ticker threads do against a fresh slips DB
+and matches DB under each storage profile (bet_framework.core.storage):
+
+  save_slip   one slip with 3 legs per call (one commit)
+  update_leg  one leg status per call (one commit)
+  flush       MatchesManager.flush() after every batch of new matches
+
+Usage:
+  python -m benchmarks.bench_storage
+  python -m benchmarks.bench_storage --slips 500 --updates 2000 --flushes 50 --batch 100
+  python -m benchmarks.bench_storage --profiles default wal
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from bet_framework.BetAssistant import BetAssistant
+from bet_framework.core.Match import Match, Odds, Score
+from bet_framework.core.Slip import CandidateLeg
+from bet_framework.core.storage import STORAGE_PROFILES
+from bet_framework.core.types import MarketLabel, MarketType
+from bet_framework.MatchesManager import MatchesManager
+
+START = datetime(2026, 4, 1, 15, 0)
+
+
+def _legs(i: int) -> list[CandidateLeg]:
+    return [
+        CandidateLeg(
+            match_name=f"Home {i}-{j} vs Away {i}-{j}",
+            datetime=START + timedelta(hours=j),
+            market=MarketLabel.HOME,
+            market_type=MarketType.RESULT,
+            consensus=70.0,
+            odds=1.5 + j / 10,
+            result_url=f"https://example.com/match/{i}/{j}",
+            sources=4,
+        )
+        for j in range(3)
+    ]
+
+
+def _rate(n: int, seconds: float) -> str:
+    return f"{n / seconds:9.0f}/s" if seconds else "      inf"
+
+
+def run_profile(name: str, slips: int, updates: int, flushes: int, batch: int) -> tuple[float, float, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        assistant = BetAssistant(os.path.join(tmp, "slips.db"), storage_profile=name)
+        started = time.perf_counter()
+        for i in range(slips):
+            assistant.save_slip("bench", _legs(i))
+        save_s = time.perf_counter() - started
+
+        leg_ids = [row[0] for row in assistant.fetch_rows("SELECT leg_id FROM legs")]
+        started = time.perf_counter()
+        for i in range(updates):
+            assistant.update_leg(leg_ids[i % len(leg_ids)], "Won" if i % 2 else "Lost")
+        update_s = time.perf_counter() - started
+        assistant.close()
+
+        manager = MatchesManager(os.path.join(tmp, "matches.db"), ingest=True, storage_profile=name)
+        flush_s = 0.0
+        for f in range(flushes):
+            for i in range(batch):
+                manager.add_match(
+                    Match(
+                        home_team=f"Home Club {f}-{i}",
+                        away_team=f"Away Club {f}-{i}",
+                        datetime=START + timedelta(days=i % 7),
+                        predictions=[Score("forebet", 2.0, 1.0)],
+                        odds=Odds(home=1.8, draw=3.4, away=4.5),
+                    )
+                )
+            started = time.perf_counter()
+            manager.flush()
+            flush_s += time.perf_counter() - started
+        manager.close()
+    return save_s, update_s, flush_s
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark SQLite writes per storage profile")
+    parser.add_argument("--profiles", nargs="+", default=list(STORAGE_PROFILES), choices=list(STORAGE_PROFILES))
+    parser.add_argument("--slips", type=int, default=300)
+    parser.add_argument("--updates", type=int, default=1000)
+    parser.add_argument("--flushes", type=int, default=30)
+    parser.add_argument("--batch", type=int, default=100, help="New matches added before each flush")
+    args = parser.parse_args()
+
+    print(f"{'profile':>16} {'save_slip':>11} {'update_leg':>11} {'flush':>11}")
+    for name in args.profiles:
+        save_s, update_s, flush_s = run_profile(name, args.slips, args.updates, args.flushes, args.batch)
+        print(
+            f"{name:>16} {_rate(args.slips, save_s):>11} {_rate(args.updates, update_s):>11} {_rate(args.flushes, flush_s):>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,21 @@ Modes:
   merge                Merge all chunk DBs into a single final DB.
   generate-slips       Run all daily-enabled profiles and insert slips.
   validate-slips       Scrape match results and update pending leg outcomes.
+  suggest-synonyms     Propose similarity_config synonyms from recurring near misses.
+  team-aliases         Inspect or correct the team alias registry.
 
 Usage examples:
   python -m main --mode prepare-scrape --runners actions
   python -m main --mode scrape --matches_db_path chunk-1.db --urls "url1,url2,..."
   python -m main --mode merge --matches_db_path final.db --chunks_dir ./chunks
+  python -m main --mode merge --matches_db_path final.db --chunks_dir ./chunks --merge_workers 4
+  python -m main --mode merge --matches_db_path final.db --chunks_dir ./chunks --columnar_odds
   python -m main --mode generate-slips --matches_db_path final.db --slips_db_path slips.db --config_path ./config
   python -m main --mode validate-slips --slips_db_path slips.db
+  python -m main --mode merge --matches_db_path final.db --chunks_dir ./chunks --registry_path teams.db
+  python -m main --mode suggest-synonyms --registry_path teams.db --config_dir ./config --min_runs 3
+  python -m main --mode team-aliases --registry_path teams.db --alias "Man U" --canonical "Man Utd"
+  python -m main --mode team-aliases --registry_path teams.db --alias "Arsenal U21" --unlink
 """
 
 import argparse
@@ -28,6 +36,8 @@ from bet_crawler.crawl_core.generate_slips import generate_slips
 from bet_crawler.crawl_core.merge import merge
 from bet_crawler.crawl_core.prepare_scrape import prepare_scrape
 from bet_crawler.crawl_core.scrape import scrape
+from bet_crawler.crawl_core.suggest_synonyms import suggest_synonyms
+from bet_crawler.crawl_core.team_aliases import team_aliases
 from bet_crawler.crawl_core.validate_slips import validate_slips
 
 logger = get_logger(__name__)
@@ -145,6 +155,8 @@ def build_parser() -> argparse.ArgumentParser:
             "merge",
             "generate-slips",
             "validate-slips",
+            "suggest-synonyms",
+            "team-aliases",
         ],
     )
     p.add_argument("--matches_db_path", help="Path to the matches SQLite DB")
@@ -157,6 +169,41 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--config_dir", help="Directory containing config files")
     p.add_argument("--profile_path", help="Path to a specific YAML profile file")
     p.add_argument("--runners")
+    p.add_argument(
+        "--merge_workers",
+        type=int,
+        default=1,
+        help="merge: >1 selects the date-partitioned merge with this many scoring processes",
+    )
+    p.add_argument(
+        "--columnar_odds",
+        action="store_true",
+        help="merge: also store odds prices in REAL columns (the odds JSON is still written)",
+    )
+    p.add_argument(
+        "--fuzzy_scrape",
+        action="store_true",
+        help="scrape: deduplicate fuzzily while scraping instead of leaving it to merge",
+    )
+    p.add_argument(
+        "--registry_path",
+        help="scrape / merge / suggest-synonyms / team-aliases: team registry DB kept across runs",
+    )
+    p.add_argument(
+        "--min_runs",
+        type=int,
+        default=3,
+        help="suggest-synonyms: runs a near-miss pair must recur in",
+    )
+    p.add_argument(
+        "--min_score",
+        type=float,
+        default=50.0,
+        help="suggest-synonyms: lowest best similarity score of a proposed pair",
+    )
+    p.add_argument("--alias", help="team-aliases: team name to link (with --canonical) or --unlink")
+    p.add_argument("--canonical", help="team-aliases: team the alias belongs to; alone, lists that team's aliases")
+    p.add_argument("--unlink", action="store_true", help="team-aliases: remove --alias and never learn it again")
     return p
 
 
@@ -173,7 +220,14 @@ if __name__ == "__main__":
         if not args.urls or not args.matches_db_path or not args.config_dir:
             build_parser().error("--urls, --matches_db_path, and --config_dir are required for scrape")
         runtime = load_runtime(args.config_dir)
-        scrape(args.matches_db_path, args.urls, runtime["factory"], runtime["similarity_config"])
+        scrape(
+            args.matches_db_path,
+            args.urls,
+            runtime["factory"],
+            runtime["similarity_config"],
+            args.registry_path,
+            ingest=not args.fuzzy_scrape,
+        )
 
     elif args.mode == "merge":
         if not args.matches_db_path or not args.chunks_dir or not args.config_dir:
@@ -185,6 +239,9 @@ if __name__ == "__main__":
             runtime["similarity_config"],
             runtime["factory"].crawler_keys,
             runtime["factory"].runner_sets,
+            workers=args.merge_workers,
+            columnar_odds=args.columnar_odds,
+            registry_path=args.registry_path,
         )
 
     elif args.mode == "generate-slips":
@@ -197,3 +254,16 @@ if __name__ == "__main__":
         if not args.slips_db_path:
             build_parser().error("--slips_db_path is required for validate-slips")
         validate_slips(args.slips_db_path)
+
+    elif args.mode == "suggest-synonyms":
+        if not args.registry_path or not args.config_dir:
+            build_parser().error("--registry_path and --config_dir are required for suggest-synonyms")
+        runtime = load_runtime(args.config_dir)
+        suggest_synonyms(args.registry_path, runtime["similarity_config"], args.min_runs, args.min_score)
+
+    elif args.mode == "team-aliases":
+        if not args.registry_path:
+            build_parser().error("--registry_path is required for team-aliases")
+        if args.unlink and not args.alias:
+            build_parser().error("--unlink needs --alias")
+        team_aliases(args.registry_path, args.alias, args.canonical, args.unlink)
@@ -18,10 +18,12 @@ def generate_slips(matches_db_path: str, slips_db_path: str, profile_name: str,
         logger.error(f"❌ No data found in profile: {profile_name}")
         raise SystemExit(1)
 
-    raw_df = MatchesManager(matches_db_path).fetch_matches()
+    matches_manager = MatchesManager(matches_db_path)
+    raw_df = matches_manager.fetch_matches()
 
     assistant = BetAssistant(slips_db_path)
-    assistant.load_matches(raw_df)
+    assistant.load_matches(raw_df, matches_manager.odds_history_lookup())
+    matches_manager.close()
 
     units = float(profile_data.get("units", 1.0))
 
@@ -42,6 +44,8 @@ def generate_slips(matches_db_path: str, slips_db_path: str, profile_name: str,
         excluded_urls=profile_data.get("excluded_urls"),
         odds_movement_weight=profile_data.get("odds_movement_weight"),
         odds_movement_strength_min=profile_data.get("odds_movement_strength_min"),
+        optimizer=profile_data.get("optimizer", "greedy"),
+        optimizer_budget_ms=profile_data.get("optimizer_budget_ms"),
     )
 
     logger.info(f"\n▶ Profile: {profile_name.upper()}")
@@ -18,23 +18,41 @@ def merge(
     similarity_config: dict | None,
     crawler_keys: dict,
     runner_sets: dict[str, list[str]],
+    workers: int = 1,
+    columnar_odds: bool = False,
+    registry_path: str | None = None,
 ) -> None:
-    """Merge multiple chunk databases into a single database and generate summary."""
+    """Merge multiple chunk databases into a single database and generate summary.
+
+    ``workers > 1`` selects the date-partitioned merge (same result, fuzzy
+    scoring spread over a process pool).  ``columnar_odds`` also stores the
+    odds prices in REAL columns of the final DB.  With ``registry_path`` the
+    run's near misses are added to that TeamRegistry DB.
+    """
     if not os.path.isdir(chunks_dir):
         logger.error(f"❌ Not a valid directory: {chunks_dir}")
         raise SystemExit(1)
 
-    matches_df = _perform_merge(db_path, chunks_dir, similarity_config)
+    matches_df = _perform_merge(db_path, chunks_dir, similarity_config, workers, columnar_odds, registry_path)
     _generate_merge_summary(matches_df, chunks_dir, db_path, crawler_keys, runner_sets)
 
 
-def _perform_merge(db_path: str, chunks_dir: str, similarity_config: dict | None) -> pd.DataFrame:
+def _perform_merge(
+    db_path: str,
+    chunks_dir: str,
+    similarity_config: dict | None,
+    workers: int = 1,
+    columnar_odds: bool = False,
+    registry_path: str | None = None,
+) -> pd.DataFrame:
     """Perform the database merge operation. Returns the merged DataFrame."""
     from bet_framework.MatchesManager import MatchesManager
 
-    matches_manager = MatchesManager(db_path, similarity_config=similarity_config)
+    matches_manager = MatchesManager(
+        db_path, similarity_config=similarity_config, columnar_odds=columnar_odds, registry_path=registry_path
+    )
     matches_manager.reset_matches_db()
-    matches_manager.merge_databases(chunks_dir)
+    matches_manager.merge_databases(chunks_dir, workers=workers)
     matches_df = matches_manager.fetch_matches()
     matches_manager.close()
     return matches_df
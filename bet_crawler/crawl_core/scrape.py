@@ -9,11 +9,30 @@ from urllib.parse import urlparse
 from scrape_kit import get_logger
 
 from bet_framework.MatchesManager import MatchesManager
+from bet_framework.MatchWriter import WRITER_QUEUE_SIZE, MatchWriter
 
 logger = get_logger(__name__)
 
 
-def scrape(db_path: str, urls_str: str, crawler_factory, similarity_config: dict | None = None) -> None:
+def scrape(
+    db_path: str,
+    urls_str: str,
+    crawler_factory,
+    similarity_config: dict | None = None,
+    registry_path: str | None = None,
+    ingest: bool = True,
+    queue_size: int = WRITER_QUEUE_SIZE,
+) -> None:
+    """Scrape *urls_str* into the chunk DB at *db_path*.
+
+    By default the chunk is written in ingest mode: matches are appended
+    with exact-key collapse only and fuzzy deduplication is left to merge.
+    ``ingest=False`` deduplicates fuzzily while scraping (the former behaviour).
+
+    Finders hand their matches to a MatchWriter: a queue of *queue_size*
+    matches drained into the MatchesManager by one writer thread, so
+    scraping threads never wait on add_match.
+    """
     if os.path.isfile(urls_str):
         with open(urls_str) as f:
             urls = [u.strip() for u in f.read().split(",") if u.strip()]
@@ -26,18 +45,21 @@ def scrape(db_path: str, urls_str: str, crawler_factory, similarity_config: dict
         core_name = domain.split(".")[-2] if "." in domain else domain
         groups[core_name].append(url)
 
-    matches_manager = MatchesManager(db_path, similarity_config=similarity_config)
+    matches_manager = MatchesManager(
+        db_path,
+        similarity_config=similarity_config,
+        registry_path=registry_path,
+        ingest=ingest,
+    )
     matches_manager.reset_matches_db()
 
-    def _on_match(match) -> None:
-        matches_manager.add_match(match)
-
-    for i, (domain_key, group_urls) in enumerate(groups.items()):
-        logger.info(f"  [{i + 1}/{len(groups)}] Scraping {domain_key} ({len(group_urls)} URLs)...")
-        try:
-            crawler = crawler_factory.create_for_url(group_urls[0], _on_match)
-            crawler.get_matches(group_urls)
-        except Exception as e:
-            logger.error(f"    ⚠️ Error scraping {domain_key}: {e}")
+    with MatchWriter(matches_manager, maxsize=queue_size) as writer:
+        for i, (domain_key, group_urls) in enumerate(groups.items()):
+            logger.info(f"  [{i + 1}/{len(groups)}] Scraping {domain_key} ({len(group_urls)} URLs)...")
+            try:
+                crawler = crawler_factory.create_for_url(group_urls[0], writer.submit)
+                crawler.get_matches(group_urls)
+            except Exception as e:
+                logger.error(f"    ⚠️ Error scraping {domain_key}: {e}")
 
     matches_manager.close()
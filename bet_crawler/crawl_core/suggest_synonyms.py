@@ -0,0 +1,37 @@
+"""
+suggest_synonyms module for handling the suggest-synonyms mode logic
+"""
+
+from scrape_kit import get_logger
+
+from bet_framework.TeamRegistry import SynonymSuggestion, TeamRegistry
+
+logger = get_logger(__name__)
+
+
+def suggest_synonyms(
+    registry_path: str,
+    similarity_config: dict | None,
+    min_runs: int = 3,
+    min_score: float = 50.0,
+) -> list[SynonymSuggestion]:
+    """Log recurring near-miss team pairs as ``synonyms`` entries for similarity_config.yaml.
+
+    Nothing is written to the config; the entries are proposals to review
+    and paste.  Pairs already covered by the configured synonyms are skipped.
+    """
+    registry = TeamRegistry(registry_path)
+    try:
+        suggestions = registry.synonym_suggestions(min_runs, min_score, (similarity_config or {}).get("synonyms"))
+    finally:
+        registry.close()
+
+    if not suggestions:
+        logger.info(f"No near-miss pairs seen in {min_runs}+ runs with score >= {min_score:.0f}")
+        return []
+
+    logger.info(f"Proposed synonyms ({len(suggestions)}) — review before adding to similarity_config.yaml:")
+    logger.info("synonyms:")
+    for s in suggestions:
+        logger.info(f'  "{s.name}": "{s.canonical}"  # {s.runs} runs, {s.hits} near misses, best score {s.best_score:.0f}')
+    return suggestions
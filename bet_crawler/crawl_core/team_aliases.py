@@ -0,0 +1,50 @@
+"""
+team_aliases module for handling the team-aliases mode logic
+"""
+
+from datetime import datetime
+
+from scrape_kit import get_logger
+
+from bet_framework.TeamRegistry import TeamAlias, TeamRegistry
+
+logger = get_logger(__name__)
+
+
+def team_aliases(
+    registry_path: str,
+    alias: str | None = None,
+    canonical: str | None = None,
+    unlink: bool = False,
+) -> list[TeamAlias]:
+    """Inspect or correct the alias registry.
+
+    • ``alias`` + ``canonical``  link the alias to that team (manual correction)
+    • ``alias`` + ``unlink``     remove a wrong alias and block it from being re-learned
+    • ``alias`` alone            show that alias
+    • otherwise                  list the entries, only *canonical*'s team if given
+
+    Names are lower-cased, as the merge stores them.
+    Returns the entries shown (after any change).
+    """
+    alias = alias.lower() if alias else None
+    canonical = canonical.lower() if canonical else None
+    now = datetime.now().isoformat()
+
+    registry = TeamRegistry(registry_path)
+    try:
+        if alias and unlink:
+            was_linked = registry.unlink_alias(alias, now)
+            logger.info(f"{'Unlinked' if was_linked else 'Blocked'} alias '{alias}'")
+        elif alias and canonical:
+            registry.set_alias(alias, canonical, now)
+            logger.info(f"Linked alias '{alias}' → '{canonical}'")
+        entries = [e for e in registry.aliases() if e.alias == alias] if alias else registry.aliases(canonical)
+    finally:
+        registry.close()
+
+    for e in entries:
+        target = e.canonical if e.canonical is not None else "(blocked)"
+        logger.info(f"  {e.alias:<32} → {target:<32} [{e.source}, {e.created_at or '-'}]")
+    logger.info(f"{len(entries)} alias entries")
+    return entries
@@ -27,6 +27,7 @@ from scrape_kit import SettingsManager, configure
 
 from bet_framework.BetAssistant import BetAssistant, BetSlipConfig
 from bet_framework.core import leagues
+from bet_framework.core.storage import DEFAULT_STORAGE_PROFILE
 from bet_framework.MatchesManager import MatchesManager
 
 
@@ -61,9 +62,10 @@ class AppLogic:
         self._settings = SettingsManager(config_path)
         ensure_default_profiles(config_path + "/profiles", self._settings)
 
-        # Initialize core assistants
-        self._assistant = BetAssistant(slips_db_path)
-        self._matches_manager = MatchesManager(matches_db_path)
+        # Initialize core assistants (SQLite tuning: scraper_config.storage_profile)
+        storage_profile = (self._settings.get("scraper_config") or {}).get("storage_profile") or DEFAULT_STORAGE_PROFILE
+        self._assistant = BetAssistant(slips_db_path, storage_profile=storage_profile)
+        self._matches_manager = MatchesManager(matches_db_path, compact_buffer=True, storage_profile=storage_profile)
         self._manual_excluded: set[str] = set()
 
         # Pre-load match data
@@ -191,35 +193,39 @@ class AppLogic:
         except Exception as exc:
             print(f"[Puller] ERROR: {exc}")
 
+    def _match_history(self, row) -> list[dict]:
+        """Odds history snapshots of a match_df row (odds_history table)."""
+        key = self._matches_manager.history_key(row.get("home"), row.get("away"), row.get("datetime"))
+        return self._matches_manager.odds_history(key)
+
     def get_odds_movement(self, match_id: int) -> dict:
-        """Get odds movement direction for a match (from embedded history)."""
+        """Get odds movement direction for a match (from its odds history)."""
         df = self.match_df
         if df.empty or match_id < 0 or match_id >= len(df):
             return {}
-        odds_dict = df.iloc[match_id].get("odds")
+        row = df.iloc[match_id]
+        odds_dict = self._assistant.match_odds(match_id)
         if not odds_dict or not isinstance(odds_dict, dict):
             return {}
-        return self._matches_manager.calculate_movement_from_odds(odds_dict)
+        return self._matches_manager.calculate_movement_from_odds(odds_dict, self._match_history(row))
 
     def get_odds_movement_with_strength(self, match_id: int) -> dict:
         """Get odds movement with strength metrics for a match."""
         df = self.match_df
         if df.empty or match_id < 0 or match_id >= len(df):
             return {}
-        odds_dict = df.iloc[match_id].get("odds")
+        row = df.iloc[match_id]
+        odds_dict = self._assistant.match_odds(match_id)
         if not odds_dict or not isinstance(odds_dict, dict):
             return {}
-        return self._matches_manager.calculate_movement_with_strength(odds_dict)
+        return self._matches_manager.calculate_movement_with_strength(odds_dict, self._match_history(row))
 
     def get_odds_history(self, match_id: int) -> list[dict]:
-        """Get all odds snapshots for a match (from embedded history)."""
+        """Get all odds snapshots for a match (from its odds history)."""
         df = self.match_df
         if df.empty or match_id < 0 or match_id >= len(df):
             return []
-        odds_dict = df.iloc[match_id].get("odds")
-        if not odds_dict or not isinstance(odds_dict, dict):
-            return []
-        history = MatchesManager._extract_history_from_odds(odds_dict)
+        history = self._match_history(df.iloc[match_id])
         return [{"timestamp": h.get("ts", ""), "odds": {k: v for k, v in h.items() if k != "ts"}} for h in history]
 
     def _do_generate(self) -> None:
@@ -322,7 +328,7 @@ class AppLogic:
 
     def refresh_data(self) -> pd.DataFrame:
         raw_df = self._matches_manager.fetch_matches()
-        self._assistant.load_matches(raw_df)
+        self._assistant.load_matches(raw_df, self._matches_manager.odds_history_lookup())
         return self._assistant._df.copy()
 
     def filter_matches(
@@ -356,16 +362,17 @@ class AppLogic:
             os.unlink(temp_path)
             raise RuntimeError(f"Failed to download DB from Release: {e}")
 
-        # Get config values for history preservation
+        # Get config values for history preservation: a match is listed at most
+        # num_days_ahead days before kickoff, so older snapshots are for past matches
         scraper_cfg = self._settings.get("scraper_config") or {}
-        max_history = int(scraper_cfg.get("num_days_ahead", 3))
+        history_days = int(scraper_cfg.get("num_days_ahead", 3)) + 1
         local_tz = scraper_cfg.get("local_timezone", "Europe/Bucharest")
 
         # Merge with history preservation
         try:
             self._matches_manager.merge_with_history_preservation(
                 fresh_db_path=temp_path,
-                max_history=max_history,
+                history_days=history_days,
                 local_tz=local_tz,
             )
         finally:
@@ -402,28 +409,31 @@ class AppLogic:
         """
         Build and save slips for the given profiles.
 
+        The whole run is built from one candidate pass (each slip's matches
+        are excluded from the next) and saved in one transaction.
+
         Parameters
         ----------
         profiles : {profile_name: (BetSlipConfig, units, count, target_payout)}
         """
+        built = self._assistant.build_slips([(name, cfg, count) for name, (cfg, _, count, _) in profiles.items()])
+
+        slips = []
+        for name, legs in built:
+            _, units, _, target_payout = profiles[name]
+            # Dynamic units calculation if target_payout is set
+            final_units = units
+            if target_payout and target_payout > 0:
+                total_odds = math.prod(leg.odds for leg in legs)
+                if total_odds > 0:
+                    # Round to 1 decimal place to match dashboard convention
+                    final_units = round(target_payout / total_odds, 1) or 0.1
+            slips.append((name, legs, final_units))
+
         results = {}
-        for name, (cfg, units, count, target_payout) in profiles.items():
-            for _ in range(count):
-                legs = self._assistant.build_slip_auto_exclude(cfg)
-                if not legs:
-                    break
-
-                # Dynamic units calculation if target_payout is set
-                final_units = units
-                if target_payout and target_payout > 0:
-                    total_odds = math.prod(leg.odds for leg in legs)
-                    if total_odds > 0:
-                        # Round to 1 decimal place to match dashboard convention
-                        final_units = round(target_payout / total_odds, 1) or 0.1
-
-                slip_id = self._assistant.save_slip(name, legs, final_units)
-                results[name] = results.get(name, [])
-                results[name].append(slip_id)
+        for (name, _, _), slip_id in zip(slips, self._assistant.save_slips(slips), strict=True):
+            results[name] = results.get(name, [])
+            results[name].append(slip_id)
         return results
 
     # ── Slip persistence ──────────────────────────────────────────────────────
@@ -30,6 +30,8 @@ class BetSlipConfigIn(BaseModel):
     min_pick_quality: float | None = None
     odds_movement_weight: float | None = None
     odds_movement_strength_min: float | None = None
+    optimizer: str = "greedy"
+    optimizer_budget_ms: float | None = None
 
 
 class ExcludeUrlIn(BaseModel):
@@ -88,6 +90,8 @@ class ProfileIn(BaseModel):
     min_pick_quality: float | None = None
     odds_movement_weight: float | None = None
     odds_movement_strength_min: float | None = None
+    optimizer: str = "greedy"
+    optimizer_budget_ms: float | None = None
 
 
 # ── Slips ─────────────────────────────────────────────────────────────────────
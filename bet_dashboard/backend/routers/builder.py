@@ -41,6 +41,8 @@ def _to_config(body: BetSlipConfigIn) -> BetSlipConfig:
         min_pick_quality=body.min_pick_quality,
         odds_movement_weight=body.odds_movement_weight,
         odds_movement_strength_min=body.odds_movement_strength_min,
+        optimizer=body.optimizer,
+        optimizer_budget_ms=body.optimizer_budget_ms,
     )
 
 
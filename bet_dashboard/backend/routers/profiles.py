@@ -52,6 +52,8 @@ def save_profile(request: Request, body: ProfileIn):
             min_pick_quality=body.min_pick_quality,
             odds_movement_weight=body.odds_movement_weight,
             odds_movement_strength_min=body.odds_movement_strength_min,
+            optimizer=body.optimizer,
+            optimizer_budget_ms=body.optimizer_budget_ms,
         ),
         units=body.units,
         target_payout=body.target_payout,
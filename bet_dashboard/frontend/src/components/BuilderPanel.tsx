@@ -512,6 +512,26 @@ export default function BuilderPanel({ cfg, availableLeagues, onChange }: Props)
                         <option value="gaussian">Gaussian</option>
                     </select>
                 </Row>
+                <Row label="Leg Selection"
+                    tip="Greedy = best leg per round toward the ideal odds. DP = best-scoring slip within the target odds band (searches all leg combinations within a time budget).">
+                    <select className="field w-28" value={cfg.optimizer}
+                        onChange={e => up('optimizer', e.target.value as 'greedy' | 'dp')}>
+                        <option value="greedy">Greedy</option>
+                        <option value="dp">DP</option>
+                    </select>
+                </Row>
+                {cfg.optimizer === 'dp' && (
+                    <NullableRow label="Search Budget"
+                        tip="Time limit of the DP search in ms. Auto = 25 ms."
+                        enabled={cfg.optimizer_budget_ms !== null}
+                        onToggle={v => up('optimizer_budget_ms', v ? 25 : null)}>
+                        <InlineSlider
+                            value={cfg.optimizer_budget_ms ?? 25}
+                            min={5} max={200} step={5}
+                            format={v => `${v} ms`}
+                            onChange={v => up('optimizer_budget_ms', v)} />
+                    </NullableRow>
+                )}
                 <NullableRow label="Min Quality"
                     tip="Minimum quality score to accept a pick. Auto = 0.20."
                     enabled={cfg.min_pick_quality !== null}
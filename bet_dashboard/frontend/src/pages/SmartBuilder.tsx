@@ -27,6 +27,8 @@ const DEFAULT_CFG: BuilderConfig = {
     min_pick_quality: null,
     odds_movement_weight: null,
     odds_movement_strength_min: null,
+    optimizer: 'greedy',
+    optimizer_budget_ms: null,
 };
 
 interface Props { filters: GlobalFilters; refreshKey: number }
@@ -172,6 +174,8 @@ export default function SmartBuilder({ filters, refreshKey }: Props) {
             min_pick_quality: data.min_pick_quality ?? null,
             odds_movement_weight: data.odds_movement_weight ?? null,
             odds_movement_strength_min: data.odds_movement_strength_min ?? null,
+            optimizer: data.optimizer ?? 'greedy',
+            optimizer_budget_ms: data.optimizer_budget_ms ?? null,
         };
         setCfg(next);
         setActiveName(name);
@@ -74,6 +74,8 @@ export interface BuilderConfig {
     min_pick_quality: number | null;
     odds_movement_weight: number | null;
     odds_movement_strength_min: number | null;
+    optimizer: 'greedy' | 'dp';
+    optimizer_budget_ms: number | null;
 }
 
 export interface CandidateLeg {
@@ -123,6 +125,8 @@ export interface Profile {
     min_pick_quality: number | null;
     odds_movement_weight: number | null;
     odds_movement_strength_min: number | null;
+    optimizer: 'greedy' | 'dp';
+    optimizer_budget_ms: number | null;
 }
 
 export type ProfilesMap = Record<string, Profile>;
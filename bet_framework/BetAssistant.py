@@ -40,27 +40,34 @@ picks, preventing the slip from drifting far from the target total odds.
 
 from __future__ import annotations
 
+import contextlib
 import hashlib
 import math
 import re
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
+import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
 from scrape_kit import BaseStorageManager, get_logger, scrape
 
-from bet_framework.core.consensus import calc_consensus
+from bet_framework.core.candidates import CandidateTable
+from bet_framework.core.consensus import CONSENSUS_KEYS, batch_consensus, calc_consensus
+from bet_framework.core.exclusions import ExclusionSet
+from bet_framework.core.optimizer import optimize_legs
 from bet_framework.core.outcomes import determine_outcome, parse_score
 from bet_framework.core.scoring import (
     adjusted_consensus,
+    movement_factor,
     resolve_max_legs,
-    resolve_max_single_leg_odds,
     resolve_min_pick_quality,
-    resolve_min_source_edge,
+    resolve_optimizer,
     resolve_shrinkage_k,
     resolve_stop_threshold,
     score_pick,
+    score_pick_arrays,
 )
 from bet_framework.core.Slip import (
     BetLeg,
@@ -72,8 +79,19 @@ from bet_framework.core.Slip import (
     ValidationReport,
     get_profile,
 )
+from bet_framework.core.storage import (
+    DEFAULT_STORAGE_PROFILE,
+    StorageProfile,
+    apply_storage_profile,
+    resolve_storage_profile,
+)
 from bet_framework.core.types import MarketLabel, MarketType, MatchStatus, Outcome
-from bet_framework.core.utils import coerce_datetime_str, is_valid_url
+from bet_framework.core.utils import (
+    coerce_datetime_str,
+    frame_memory_report,
+    is_valid_url,
+    widen_float32,
+)
 
 logger = get_logger(__name__)
 
@@ -115,6 +133,158 @@ MARKET_MAP: dict[MarketType, list[tuple[str, str, MarketLabel]]] = {
     ],
 }
 
+# Compact dtypes of the match frame: names repeat across rows (categories),
+# consensus percentages and prices fit float32, source counts fit int16.
+_CATEGORY_COLUMNS = ("home", "away", "league")
+_FLOAT32_PREFIXES = ("cons_", "odds_")
+
+
+def _compact_match_frame(rows: list[dict] | dict[str, Any]) -> pd.DataFrame:
+    """Match frame of *rows* (records or columns) with the compact dtypes of load_matches."""
+    df = pd.DataFrame(rows)
+    for col in _CATEGORY_COLUMNS:
+        df[col] = df[col].astype("category")
+    with contextlib.suppress(TypeError, ValueError):  # mixed offsets / unparsable: keep as given
+        df["datetime"] = pd.to_datetime(df["datetime"])
+    df["sources"] = df["sources"].astype(np.int16)
+    narrow = {col: np.float32 for col in df.columns if col.startswith(_FLOAT32_PREFIXES)}
+    return df.astype(narrow)
+
+
+# Consensus / odds columns of the match frame, in frame order
+_CONSENSUS_COLUMNS: dict[str, tuple[str, str]] = {
+    "cons_home": ("result", "home"),
+    "cons_draw": ("result", "draw"),
+    "cons_away": ("result", "away"),
+    "cons_over_15": ("over_under_15", "over"),
+    "cons_under_15": ("over_under_15", "under"),
+    "cons_over_05": ("over_under_05", "over"),
+    "cons_under_05": ("over_under_05", "under"),
+    "cons_over_25": ("over_under_25", "over"),
+    "cons_under_25": ("over_under_25", "under"),
+    "cons_over_35": ("over_under_35", "over"),
+    "cons_under_35": ("over_under_35", "under"),
+    "cons_over_45": ("over_under_45", "over"),
+    "cons_under_45": ("over_under_45", "under"),
+    "cons_btts_yes": ("btts", "yes"),
+    "cons_btts_no": ("btts", "no"),
+    "cons_dc_1x": ("double_chance", "1x"),
+    "cons_dc_12": ("double_chance", "12"),
+    "cons_dc_x2": ("double_chance", "x2"),
+}
+_ODDS_COLUMNS: dict[str, str] = {  # frame column → key of the raw odds dict
+    "odds_home": "home",
+    "odds_draw": "draw",
+    "odds_away": "away",
+    "odds_over_15": "over_15",
+    "odds_under_15": "under_15",
+    "odds_over_25": "over_25",
+    "odds_under_25": "under_25",
+    "odds_btts_yes": "btts_y",
+    "odds_btts_no": "btts_n",
+    "odds_over_05": "over_05",
+    "odds_under_05": "under_05",
+    "odds_over_35": "over_35",
+    "odds_under_35": "under_35",
+    "odds_over_45": "over_45",
+    "odds_under_45": "under_45",
+    "odds_dc_1x": "dc_1x",
+    "odds_dc_12": "dc_12",
+    "odds_dc_x2": "dc_x2",
+}
+_NUMERIC = (int, float, np.integer, np.floating)
+# (home, away, kickoff) → odds history snapshots, oldest first
+OddsHistoryLookup = Callable[[Any, Any, Any], list[dict]]
+
+
+def _build_match_frame(
+    df: pd.DataFrame, odds_history: OddsHistoryLookup | None = None
+) -> tuple[pd.DataFrame, list[dict | None], list[list[dict]]]:
+    """
+    Columnar core of load_matches → (compact match frame, raw odds per row, odds history per row).
+
+    One pass over the input columns flattens every predicted score into
+    home / away arrays with a per-match count; batch_consensus then scores
+    all matches at once.  A row is skipped when its scores or odds are not
+    the expected dicts; a row whose goal values are not plain numbers (or
+    None) goes through the scalar calc_consensus, as every row used to.
+    """
+    missing = [col for col in ("home_name", "away_name", "datetime") if col not in df.columns]
+    if missing:
+        logger.info(f"[BetAssistant] Skipping all {len(df)} rows: missing column(s) {missing}")
+        return pd.DataFrame(), [], []
+
+    def column(name: str) -> list:
+        return df[name].tolist() if name in df.columns else [None] * len(df)
+
+    keep: list[int] = []
+    match_ids: list[str] = []
+    n_sources: list[int] = []
+    counts: list[int] = []
+    flat_home: list = []
+    flat_away: list = []
+    scalar_cons: dict[int, dict[str, dict[str, float]]] = {}  # kept position → calc_consensus
+    odds_values: list[list] = []
+    raw_odds: list[dict | None] = []
+    histories: list[list[dict]] = []
+    inputs = zip(
+        df.index, column("home_name"), column("away_name"), column("datetime"), column("odds"), column("scores"), strict=True
+    )
+    for pos, (idx, home, away, dt, odds, scores) in enumerate(inputs):
+        try:
+            odds_dict = odds or {}
+            scores = scores or []
+            goals = [(s.get("home", 0), s.get("away", 0)) for s in scores]
+            sources = len({s.get("source", "") for s in scores if s.get("source")})
+            prices = [odds_dict.get(key, 0.0) for key in _ODDS_COLUMNS.values()]
+        except Exception as e:
+            logger.info(f"[BetAssistant] Skipping row {idx}: {e}")
+            continue
+
+        if all((h is None or isinstance(h, _NUMERIC)) and (a is None or isinstance(a, _NUMERIC)) for h, a in goals):
+            flat_home.extend(h or 0 for h, _ in goals)
+            flat_away.extend(a or 0 for _, a in goals)
+            counts.append(len(goals))
+        else:
+            scalar_cons[len(keep)] = calc_consensus(scores)
+            counts.append(0)
+
+        match_key = f"{home}_{away}_{dt}"
+        # MD5 used for deterministic ID generation, not security (B324 fix)
+        match_ids.append(f"match_{idx}_{hashlib.md5(match_key.encode(), usedforsecurity=False).hexdigest()}")
+        n_sources.append(sources)
+        odds_values.append(prices)
+        raw_odds.append(odds)
+        # Without a lookup, history embedded in the odds dict (older layout) is used
+        histories.append(odds_history(home, away, dt) if odds_history else odds_dict.get("history") or [])
+        keep.append(pos)
+
+    if not keep:
+        return pd.DataFrame(), [], []
+
+    cons = batch_consensus(np.array(flat_home, dtype=np.float64), np.array(flat_away, dtype=np.float64), np.array(counts))
+    for row, data in scalar_cons.items():
+        for key in CONSENSUS_KEYS:
+            cons[key][row] = data[key[0]][key[1]]
+
+    def kept(name: str) -> list:
+        values = column(name)
+        return [values[pos] for pos in keep]
+
+    columns: dict[str, Any] = {
+        "match_id": match_ids,
+        "datetime": kept("datetime"),
+        "home": kept("home_name"),
+        "away": kept("away_name"),
+        "sources": n_sources,
+        "result_url": kept("result_url"),
+        "league": kept("league"),
+    }
+    columns.update({col: cons[key] for col, key in _CONSENSUS_COLUMNS.items()})
+    prices_by_column = zip(*odds_values, strict=True)
+    columns.update({col: list(values) for col, values in zip(_ODDS_COLUMNS, prices_by_column, strict=True)})
+    return _compact_match_frame(columns), raw_odds, histories
+
 
 def _parse_match_result_html(html: str, url: str) -> MatchResultInfo:
     """
@@ -244,17 +414,26 @@ class BetAssistant(BaseStorageManager):
         self,
         db_path: str,
         config_path: str | None = None,
+        storage_profile: str | StorageProfile = DEFAULT_STORAGE_PROFILE,
     ) -> None:
         """
         Parameters
         ----------
-        db_path     : Path to the SQLite file (created if it doesn't exist).
+        db_path         : Path to the SQLite file (created if it doesn't exist).
+        storage_profile : STORAGE_PROFILES name or StorageProfile for the connection PRAGMAs.
         """
+        self._storage_profile = resolve_storage_profile(storage_profile)
         super().__init__(db_path)
         self._df = pd.DataFrame()
+        self._odds: list[dict | None] = []  # raw odds dict per _df row, kept out of the frame
+        self._histories: list[list[dict]] = []  # odds history snapshots per _df row, oldest first
+        self._exclusions_version: int | None = None  # PRAGMA data_version the exclusion set was read at
+        self._candidates: CandidateTable | None = None
+        self._candidates_df: pd.DataFrame | None = None  # the _df the candidate table was built from
 
     def _create_tables(self) -> None:
         with self.db_lock:
+            apply_storage_profile(self.conn, self._storage_profile)  # runs on every fresh connection
             self.conn.executescript("""
                 CREATE TABLE IF NOT EXISTS slips (
                     slip_id        INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -277,6 +456,10 @@ class BetAssistant(BaseStorageManager):
                     league      TEXT,
                     FOREIGN KEY(slip_id) REFERENCES slips(slip_id)
                 );
+
+                CREATE INDEX IF NOT EXISTS idx_legs_slip_id    ON legs(slip_id);
+                CREATE INDEX IF NOT EXISTS idx_legs_status     ON legs(status);
+                CREATE INDEX IF NOT EXISTS idx_legs_result_url ON legs(result_url);
             """)
 
             # Schema Migration: Add league column to legs if it doesn't exist
@@ -287,6 +470,7 @@ class BetAssistant(BaseStorageManager):
                 self.conn.execute("ALTER TABLE legs ADD COLUMN league TEXT")
 
             self.conn.commit()
+            self._exclusions: ExclusionSet | None = None  # rebuilt lazily for the new connection
 
     def close(self) -> None:
         """Flush and close the SQLite connection."""
@@ -300,7 +484,7 @@ class BetAssistant(BaseStorageManager):
 
     # ── Data loading ──────────────────────────────────────────────────────────
 
-    def load_matches(self, df: pd.DataFrame) -> None:
+    def load_matches(self, df: pd.DataFrame, odds_history: OddsHistoryLookup | None = None) -> None:
         """
         Ingest a raw match DataFrame and build the internal flat representation.
 
@@ -309,77 +493,38 @@ class BetAssistant(BaseStorageManager):
 
         The 'scores' column must be a list of dicts with keys:
             home, away, source  (source used to count unique data providers)
+
+        The frame is stored compact (categorical names, datetime64 kickoffs,
+        float32 consensus / odds); the raw odds dicts are kept beside it and
+        read with :meth:`match_odds`.
+
+        *odds_history(home, away, kickoff)* returns a match's odds history
+        snapshots, oldest first (MatchesManager.odds_history_lookup()); they
+        drive the odds movement of the candidate legs.  Without it, history
+        embedded in the odds dicts is used.
         """
         if df.empty:
             self._df = pd.DataFrame()
+            self._odds, self._histories = [], []
             return
 
-        rows: list[dict] = []
-        for idx, row in df.iterrows():
-            try:
-                match_key = f"{row['home_name']}_{row['away_name']}_{row['datetime']}"
-                # MD5 used for deterministic ID generation, not security (B324 fix)
-                match_id = f"match_{idx}_{hashlib.md5(match_key.encode(), usedforsecurity=False).hexdigest()}"
-                dt = row["datetime"]
-                odds = row.get("odds") or {}
-                scores = row.get("scores") or []
-                cons_data = calc_consensus(scores)
-                n_sources = len({s.get("source", "") for s in scores if s.get("source")})
-
-                rows.append(
-                    {
-                        "match_id": match_id,
-                        "datetime": dt,
-                        "home": row["home_name"],
-                        "away": row["away_name"],
-                        "sources": n_sources,
-                        "odds": row.get("odds"),
-                        "result_url": row.get("result_url"),
-                        "league": row.get("league"),
-                        # Consensus
-                        "cons_home": cons_data["result"]["home"],
-                        "cons_draw": cons_data["result"]["draw"],
-                        "cons_away": cons_data["result"]["away"],
-                        "cons_over_15": cons_data["over_under_15"]["over"],
-                        "cons_under_15": cons_data["over_under_15"]["under"],
-                        "cons_over_05": cons_data["over_under_05"]["over"],
-                        "cons_under_05": cons_data["over_under_05"]["under"],
-                        "cons_over_25": cons_data["over_under_25"]["over"],
-                        "cons_under_25": cons_data["over_under_25"]["under"],
-                        "cons_over_35": cons_data["over_under_35"]["over"],
-                        "cons_under_35": cons_data["over_under_35"]["under"],
-                        "cons_over_45": cons_data["over_under_45"]["over"],
-                        "cons_under_45": cons_data["over_under_45"]["under"],
-                        "cons_btts_yes": cons_data["btts"]["yes"],
-                        "cons_btts_no": cons_data["btts"]["no"],
-                        "cons_dc_1x": cons_data["double_chance"]["1x"],
-                        "cons_dc_12": cons_data["double_chance"]["12"],
-                        "cons_dc_x2": cons_data["double_chance"]["x2"],
-                        # Odds
-                        "odds_home": odds.get("home", 0.0),
-                        "odds_draw": odds.get("draw", 0.0),
-                        "odds_away": odds.get("away", 0.0),
-                        "odds_over_15": odds.get("over_15", 0.0),
-                        "odds_under_15": odds.get("under_15", 0.0),
-                        "odds_over_25": odds.get("over_25", 0.0),
-                        "odds_under_25": odds.get("under_25", 0.0),
-                        "odds_btts_yes": odds.get("btts_y", 0.0),
-                        "odds_btts_no": odds.get("btts_n", 0.0),
-                        "odds_over_05": odds.get("over_05", 0.0),
-                        "odds_under_05": odds.get("under_05", 0.0),
-                        "odds_over_35": odds.get("over_35", 0.0),
-                        "odds_under_35": odds.get("under_35", 0.0),
-                        "odds_over_45": odds.get("over_45", 0.0),
-                        "odds_under_45": odds.get("under_45", 0.0),
-                        "odds_dc_1x": odds.get("dc_1x", 0.0),
-                        "odds_dc_12": odds.get("dc_12", 0.0),
-                        "odds_dc_x2": odds.get("dc_x2", 0.0),
-                    }
-                )
-            except Exception as e:
-                logger.info(f"[BetAssistant] Skipping row {idx}: {e}")
+        self._df, self._odds, self._histories = _build_match_frame(df, odds_history)
 
-        self._df = pd.DataFrame(rows)
+    def match_odds(self, pos: int) -> dict | None:
+        """Raw odds dict of the match at row position *pos* of the loaded frame."""
+        if 0 <= pos < len(self._odds):
+            return self._odds[pos]
+        return None
+
+    def match_history(self, pos: int) -> list[dict]:
+        """Odds history snapshots of the match at row position *pos* of the loaded frame."""
+        if 0 <= pos < len(self._histories):
+            return self._histories[pos]
+        return []
+
+    def memory_report(self) -> dict[str, Any]:
+        """Deep memory footprint of the loaded match frame (see frame_memory_report)."""
+        return frame_memory_report(self._df)
 
     # ── Match browsing ────────────────────────────────────────────────────────
 
@@ -399,11 +544,13 @@ class BetAssistant(BaseStorageManager):
         date_from    : ISO date string; include only matches on or after this date.
         date_to      : ISO date string; include only matches on or before this date.
         min_sources  : Keep only rows with at least this many data sources.
+
+        Consensus and odds columns are returned as float64.
         """
         if self._df.empty:
             return self._df.copy()
 
-        out = self._df.copy()
+        out = widen_float32(self._df)
 
         if search_text:
             mask = out["home"].str.contains(search_text, case=False, na=False) | out["away"].str.contains(
@@ -445,11 +592,7 @@ class BetAssistant(BaseStorageManager):
             current = list(cfg.excluded_urls or [])
             cfg.excluded_urls = current + extra_excluded_urls
 
-        candidates = self._collect_candidates(cfg)
-        if not candidates:
-            return []
-
-        return self._select_legs(candidates, cfg)
+        return self._build_from_table(cfg)
 
     def build_slip_auto_exclude(
         self,
@@ -458,9 +601,50 @@ class BetAssistant(BaseStorageManager):
         """
         Convenience wrapper that automatically excludes all URLs that are
         already present in the slip database (active pending slips + settled).
+
+        The slip history is consulted through the maintained exclusion set,
+        so *profile_or_config* is left untouched.
         """
-        excluded = self.get_excluded_urls()
-        return self.build_slip(profile_or_config, extra_excluded_urls=excluded)
+        if self._df.empty:
+            return []
+
+        cfg = get_profile(profile_or_config) if isinstance(profile_or_config, str) else profile_or_config
+        return self._build_from_table(cfg, self._exclusion_set())
+
+    def build_slips(self, plan: list[tuple[str, BetSlipConfig, int]]) -> list[tuple[str, list[CandidateLeg]]]:
+        """
+        Build the slips of a generation run: up to *count* slips for every
+        (profile, cfg, count) of *plan*, in order → [(profile, legs), ...].
+
+        The result is what calling build_slip_auto_exclude and save_slip
+        once per slip would produce, without touching the database: every
+        profile's candidates are selected once against the slip history,
+        and each slip's URLs are dropped from the pool before the next one
+        is built.  A profile stops at its first empty slip.  Write the run
+        with save_slips.
+        """
+        if self._df.empty:
+            return []
+
+        table = self._candidate_table()
+        history = self._exclusion_set()
+        url_keys, url_index = pd.factorize(pd.Series(table.urls, dtype=object))
+        key_of = {url: key for key, url in enumerate(url_index)}
+        taken: set[str] = set()  # URLs of the slips built so far in this run
+
+        slips = []
+        for profile, cfg, count in plan:
+            cells, adj_cons = table.select(cfg, set(cfg.excluded_urls or []) | taken, history)
+            for _ in range(count):
+                legs = self._legs_from_cells(table, cells, adj_cons, cfg)
+                if not legs:
+                    break
+                slips.append((profile, legs))
+                urls = [leg.result_url for leg in legs]
+                taken.update(urls)
+                keep = ~np.isin(url_keys[table.match_pos[cells]], [key_of[url] for url in urls])
+                cells, adj_cons = cells[keep], adj_cons[keep]
+        return slips
 
     # ── Slip persistence ──────────────────────────────────────────────────────
 
@@ -484,43 +668,76 @@ class BetAssistant(BaseStorageManager):
         The auto-assigned slip_id.
         """
         with self.db_lock:
-            total_odds = math.prod(leg.odds for leg in legs)
-            date_today = pd.Timestamp.now().strftime("%Y-%m-%d")
+            slip_id, leg_rows = self._insert_slip(profile, legs, units)
+            self.conn.commit()
+            self._record_legs(slip_id, leg_rows)
+            return slip_id
+
+    def save_slips(self, slips: list[tuple[str, list[CandidateLeg], float]]) -> list[int]:
+        """
+        Persist several (profile, legs, units) slips in one transaction.
 
+        Either every slip is written or, on error, none is.  Returns the
+        slip_ids in order.
+        """
+        with self.db_lock:
+            inserted = []
+            try:
+                for profile, legs, units in slips:
+                    inserted.append(self._insert_slip(profile, legs, units))
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            for slip_id, leg_rows in inserted:
+                self._record_legs(slip_id, leg_rows)
+            return [slip_id for slip_id, _ in inserted]
+
+    def _insert_slip(self, profile: str, legs: list[CandidateLeg], units: float) -> tuple[int, list[tuple[int, str]]]:
+        """INSERT one slip and its legs (no commit) → (slip_id, [(leg_id, result_url)])."""
+        total_odds = math.prod(leg.odds for leg in legs)
+        date_today = pd.Timestamp.now().strftime("%Y-%m-%d")
+
+        cursor = self.conn.execute(
+            "INSERT INTO slips (date_generated, profile, total_odds, units) VALUES (?, ?, ?, ?)",
+            (date_today, profile, total_odds, units),
+        )
+        slip_id = cursor.lastrowid
+
+        leg_rows = []
+        for leg in legs:
+            # Store market value as string, not enum representation
+            market_value = leg.market.value if hasattr(leg.market, "value") else str(leg.market)
+            market_type_value = (
+                leg.market_type.value
+                if hasattr(leg.market_type, "value")
+                else str(leg.market_type)
+                if leg.market_type
+                else None
+            )
             cursor = self.conn.execute(
-                "INSERT INTO slips (date_generated, profile, total_odds, units) VALUES (?, ?, ?, ?)",
-                (date_today, profile, total_odds, units),
+                """INSERT INTO legs
+                (slip_id, match_name, match_datetime, market, market_type, odds, result_url, league)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    slip_id,
+                    leg.match_name,
+                    coerce_datetime_str(leg.datetime),
+                    market_value,
+                    market_type_value,
+                    leg.odds,
+                    leg.result_url,
+                    leg.league,
+                ),
             )
-            slip_id = cursor.lastrowid
-
-            for leg in legs:
-                # Store market value as string, not enum representation
-                market_value = leg.market.value if hasattr(leg.market, "value") else str(leg.market)
-                market_type_value = (
-                    leg.market_type.value
-                    if hasattr(leg.market_type, "value")
-                    else str(leg.market_type)
-                    if leg.market_type
-                    else None
-                )
-                self.conn.execute(
-                    """INSERT INTO legs
-                    (slip_id, match_name, match_datetime, market, market_type, odds, result_url, league)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        slip_id,
-                        leg.match_name,
-                        coerce_datetime_str(leg.datetime),
-                        market_value,
-                        market_type_value,
-                        leg.odds,
-                        leg.result_url,
-                        leg.league,
-                    ),
-                )
+            leg_rows.append((cursor.lastrowid, leg.result_url))
+        return slip_id, leg_rows
 
-            self.conn.commit()
-            return slip_id
+    def _record_legs(self, slip_id: int, leg_rows: list[tuple[int, str]]) -> None:
+        # Committed legs go straight into the exclusion set (when it is built)
+        if self._exclusions is not None:
+            for leg_id, url in leg_rows:
+                self._exclusions.add_leg(leg_id, slip_id, url)
 
     # ── Slip retrieval ────────────────────────────────────────────────────────
 
@@ -572,6 +789,8 @@ class BetAssistant(BaseStorageManager):
             self.conn.execute("DELETE FROM legs  WHERE slip_id = ?", (slip_id,))
             self.conn.execute("DELETE FROM slips WHERE slip_id = ?", (slip_id,))
             self.conn.commit()
+            if self._exclusions is not None:
+                self._exclusions.remove_slip(slip_id)
 
     def get_excluded_urls(self) -> list[str]:
         """
@@ -582,21 +801,31 @@ class BetAssistant(BaseStorageManager):
                  (i.e. the slip has no Lost leg yet).
         """
         try:
-            rows = self.fetch_rows("""
-                SELECT DISTINCT result_url FROM legs
-                WHERE status IN ('Won', 'Lost', 'Live')
-                   OR (
-                       status = 'Pending'
-                       AND slip_id NOT IN (
-                           SELECT slip_id FROM legs WHERE status = 'Lost'
-                       )
-                   )
-            """)
-            return [r[0] for r in rows if r[0] is not None]
+            return self._exclusion_set().urls()
         except Exception as e:
             logger.info(f"[BetAssistant] get_excluded_urls error: {e}")
             return []
 
+    def is_excluded(self, url: str) -> bool:
+        """True if *url* is in :meth:`get_excluded_urls` (a set lookup)."""
+        return url in self._exclusion_set()
+
+    def _exclusion_set(self) -> ExclusionSet:
+        """
+        The maintained exclusion set, built from the legs table on first use.
+
+        save_slip / update_leg / delete_slip keep it current.  Commits made by
+        another connection (dashboard vs. crawler) bump PRAGMA data_version,
+        which triggers a rebuild.
+        """
+        with self.db_lock:
+            version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._exclusions is None or version != self._exclusions_version:
+                rows = self.conn.execute("SELECT leg_id, slip_id, result_url, status FROM legs").fetchall()
+                self._exclusions = ExclusionSet.from_rows(rows)
+                self._exclusions_version = version
+            return self._exclusions
+
     # ── Validation ────────────────────────────────────────────────────────────
 
     def settle_leg_manually(
@@ -712,12 +941,12 @@ class BetAssistant(BaseStorageManager):
         but restores the original internal DataFrame afterwards so callers
         that already have data loaded are not affected.
         """
-        previous_df = self._df.copy()
+        previous_df, previous_odds, previous_histories = self._df.copy(), self._odds, self._histories
         try:
             self.load_matches(df)
             return self.build_slip(profile_or_config, extra_excluded_urls)
         finally:
-            self._df = previous_df
+            self._df, self._odds, self._histories = previous_df, previous_odds, previous_histories
 
     def process_leg_result(
         self,
@@ -825,6 +1054,8 @@ class BetAssistant(BaseStorageManager):
         with self.db_lock:
             self.conn.execute("UPDATE legs SET status = ? WHERE leg_id = ?", (status, leg_id))
             self.conn.commit()
+            if self._exclusions is not None:
+                self._exclusions.set_status(leg_id, status)
 
     # ══════════════════════════════════════════════════════════════════════════
     # Private helpers
@@ -839,82 +1070,71 @@ class BetAssistant(BaseStorageManager):
 
     # ── Candidate collection ──────────────────────────────────────────────────
 
-    def _collect_candidates(self, cfg: BetSlipConfig) -> list[dict]:
-        # TODO - this wont work unless datetimes are fixed first!
-        # now       = pd.Timestamp.now()
-        # date_from = max(pd.to_datetime(cfg.date_from), now) if cfg.date_from else now
-        date_from = pd.to_datetime(cfg.date_from) if cfg.date_from else None
-        date_to = (pd.to_datetime(cfg.date_to) + pd.Timedelta(days=1)) if cfg.date_to else None
-        excluded = set(cfg.excluded_urls or [])
-        markets = cfg.included_markets
-
-        candidates = []
-        for _, row in self._df.iterrows():
-            if date_from and row["datetime"] < date_from:
-                continue
-            if date_to and row["datetime"] >= date_to:
-                continue
-            url = row.get("result_url")
-            if not is_valid_url(url) or url in excluded:
-                continue
-
-            # --- league filter ---
-            league = row.get("league", None)
-            if pd.isna(league):
-                league = None
-            if cfg.included_leagues and (league is None or league not in cfg.included_leagues):
-                continue
-
-            match_name = f"{row['home']} vs {row['away']}"
-
-            for m_type, market_cols in MARKET_MAP.items():
-                for cons_col, odds_col, label in market_cols:
-                    if markets and label not in markets:
-                        continue
-                    consensus = float(row.get(cons_col, 0))
-                    odds = float(row.get(odds_col, 0))
-                    if consensus >= cfg.consensus_floor and odds >= cfg.min_odds:
-                        # Hard filter for max single leg odds
-                        if odds > resolve_max_single_leg_odds(cfg):
-                            continue
-
-                        # Apply shrinkage BEFORE edge check (Phase 1 fix)
-                        sources = int(row["sources"])
-                        shrinkage_k = resolve_shrinkage_k(cfg)
-                        adj_cons = adjusted_consensus(consensus, sources, shrinkage_k)
-                        # Apply min_source_edge hard filter with adjusted consensus
-                        min_edge = resolve_min_source_edge(cfg)
-                        implied_prob = 1.0 / odds
-                        source_edge = (adj_cons / 100.0) - implied_prob
-                        if source_edge < min_edge:
-                            continue
-                        # Odds movement per market
-                        mov_dir, mov_str = self._get_market_movement(row.get("odds"), odds_col.replace("odds_", ""))
-                        candidates.append(
-                            CandidateLeg(
-                                match_name=match_name,
-                                datetime=row["datetime"],
-                                market=label,
-                                market_type=m_type,
-                                consensus=consensus,
-                                odds=odds,
-                                result_url=row["result_url"],
-                                sources=sources,
-                                league=league,
-                                _adjusted_consensus=adj_cons,
-                                odds_movement_direction=mov_dir,
-                                odds_movement_strength=mov_str,
-                            )
-                        )
+    def _candidate_table(self) -> CandidateTable:
+        """(match × market) table of the loaded frame, rebuilt whenever _df is replaced."""
+        if self._candidates is None or self._candidates_df is not self._df:
+            self._candidates = CandidateTable.from_frame(
+                widen_float32(self._df), MARKET_MAP, self._odds, self._get_market_movement, self._histories
+            )
+            self._candidates_df = self._df
+        return self._candidates
 
-        return candidates
+    def _collect_candidates(self, cfg: BetSlipConfig, history: ExclusionSet | None = None) -> list[CandidateLeg]:
+        table = self._candidate_table()
+        cells, adj_cons = table.select(cfg, set(cfg.excluded_urls or []), history)
+
+        survivors = zip(cells.tolist(), adj_cons.tolist(), strict=True)
+        return [self._candidate_leg(table, cell, adjusted) for cell, adjusted in survivors]
+
+    @staticmethod
+    def _candidate_leg(table: CandidateTable, cell: int, adjusted: float) -> CandidateLeg:
+        pos = int(table.match_pos[cell])
+        m_type, _, label = table.markets[table.market[cell]]
+        return CandidateLeg(
+            match_name=table.match_names[pos],
+            datetime=table.kickoffs[pos],
+            market=label,
+            market_type=m_type,
+            consensus=float(table.consensus[cell]),
+            odds=float(table.odds[cell]),
+            result_url=table.urls[pos],
+            sources=int(table.sources[cell]),
+            league=table.leagues[pos],
+            _adjusted_consensus=adjusted,
+            odds_movement_direction=table.directions.get(cell),
+            odds_movement_strength=float(table.movement_strength[cell]),
+        )
+
+    def _build_from_table(self, cfg: BetSlipConfig, history: ExclusionSet | None = None) -> list[CandidateLeg]:
+        """Select legs straight from the candidate arrays; only the picked legs become CandidateLegs."""
+        table = self._candidate_table()
+        cells, adj_cons = table.select(cfg, set(cfg.excluded_urls or []), history)
+        return self._legs_from_cells(table, cells, adj_cons, cfg)
+
+    def _legs_from_cells(
+        self, table: CandidateTable, cells: np.ndarray, adj_cons: np.ndarray, cfg: BetSlipConfig
+    ) -> list[CandidateLeg]:
+        picks = self._pick_legs(
+            table.odds[cells],
+            adj_cons,
+            table.sources[cells],
+            table.movement_factors[cells],
+            table.movement_strength[cells],
+            table.match_keys[table.match_pos[cells]],
+            cfg,
+        )
+        legs = []
+        for i, tier, score, quality in picks:
+            leg = self._candidate_leg(table, int(cells[i]), float(adj_cons[i]))
+            leg.tier, leg.score, leg.quality = tier, score, quality
+            legs.append(leg)
+        return legs
 
     @staticmethod
-    def _get_market_movement(odds_dict: dict | None, market_key: str) -> tuple[str | None, float]:
-        """Extract movement direction and strength for a specific market from odds history."""
+    def _get_market_movement(odds_dict: dict | None, history: list[dict], market_key: str) -> tuple[str | None, float]:
+        """Movement direction and strength of one market: current odds against the first history snapshot."""
         if not odds_dict or not isinstance(odds_dict, dict):
             return None, 0.0
-        history = odds_dict.get("history", [])
         if not history or len(history) < 2:
             return None, 0.0
         first = history[0]
@@ -935,54 +1155,108 @@ class BetAssistant(BaseStorageManager):
 
     @staticmethod
     def _select_legs(candidates: list[CandidateLeg], cfg: BetSlipConfig) -> list[CandidateLeg]:
+        if not candidates:
+            return []
+        shrinkage_k = resolve_shrinkage_k(cfg)
+        # score_pick(use_preadjusted=True): the pre-computed shrunk consensus when there is one
+        adjusted = [
+            c._adjusted_consensus if c._adjusted_consensus > 0 else adjusted_consensus(c.consensus, c.sources, shrinkage_k)
+            for c in candidates
+        ]
+        picks = BetAssistant._pick_legs(
+            np.array([c.odds for c in candidates], dtype=np.float64),
+            np.array(adjusted, dtype=np.float64),
+            np.array([c.sources for c in candidates], dtype=np.int64),
+            np.array([movement_factor(c.odds_movement_direction) for c in candidates], dtype=np.float64),
+            np.array([c.odds_movement_strength for c in candidates], dtype=np.float64),
+            pd.factorize(pd.Series([c.match_name for c in candidates], dtype=object))[0],
+            cfg,
+        )
+        selected = []
+        for i, tier, score, quality in picks:
+            # Populate UI-only fields
+            best = candidates[i]
+            best.tier, best.score, best.quality = tier, score, quality
+            selected.append(best)
+        return selected
+
+    @staticmethod
+    def _pick_legs(
+        odds: np.ndarray,
+        consensus: np.ndarray,
+        sources: np.ndarray,
+        movement_factors: np.ndarray,
+        movement_strength: np.ndarray,
+        match_keys: np.ndarray,
+        cfg: BetSlipConfig,
+    ) -> list[tuple[int, int, float, float]]:
+        """
+        Greedy leg selection over candidate arrays → [(index, tier, score, quality)].
+
+        Each round scores the candidates of matches not yet in the slip
+        against the current ideal per-leg odds and takes the best score
+        (lower tier, then earlier candidate, on ties).  Returns [] when fewer
+        than the minimum number of legs could be picked.
+
+        With optimizer "dp" the slip comes from optimize_legs, and
+        this greedy loop only runs when that finds no slip in the target band.
+        """
+        if not len(odds):
+            return []
+        if resolve_optimizer(cfg) == "dp":
+            picks = optimize_legs(odds, consensus, sources, movement_factors, movement_strength, match_keys, cfg)
+            if picks:
+                return picks
         stop_threshold = resolve_stop_threshold(cfg)
         max_legs = resolve_max_legs(cfg)
         min_legs = max(1, int(cfg.target_legs * cfg.min_legs_fill_ratio))
-        max_sources = max((c.sources for c in candidates), default=1)
+        min_quality = resolve_min_pick_quality(cfg)
+        max_sources = int(sources.max())
 
-        selected: list[CandidateLeg] = []
-        seen_matches: set = set()
+        picks: list[tuple[int, int, float, float]] = []
+        used = np.zeros(len(odds), dtype=bool)  # candidates of matches already in the slip
         total_odds: float = 1.0
 
-        while len(selected) < max_legs:
-            if total_odds >= cfg.target_odds * stop_threshold and len(selected) >= min_legs:
+        while len(picks) < max_legs:
+            if total_odds >= cfg.target_odds * stop_threshold and len(picks) >= min_legs:
                 break
 
             remaining_target = cfg.target_odds / total_odds
-            remaining_legs = max(1, cfg.target_legs - len(selected))
+            remaining_legs = max(1, cfg.target_legs - len(picks))
             ideal_per_leg = remaining_target ** (1.0 / remaining_legs)
 
-            scored = []
-            for c in candidates:
-                if c.match_name not in seen_matches:
-                    tier, score, quality = score_pick(c, ideal_per_leg, max_sources, cfg, use_preadjusted=True)
-                    scored.append((tier, score, quality, c))
-
-            if not scored:
+            avail = np.flatnonzero(~used)
+            if not len(avail):
                 break
-
-            # Sort by score DESC (continuous penalty already applied), tier as tiebreaker
-            scored.sort(key=lambda x: (-x[1], x[0]))
-            tier, score, quality, best = scored[0]
+            tier, score, quality = score_pick_arrays(
+                odds[avail],
+                consensus[avail],
+                sources[avail],
+                ideal_per_leg,
+                max_sources,
+                cfg,
+                movement_factors[avail],
+                movement_strength[avail],
+            )
+            # Best score (continuous penalty already applied), tier as tiebreaker
+            best = np.flatnonzero(score == score.max())
+            if len(best) > 1:
+                best = best[tier[best] == tier[best].min()]
+            b = int(best[0])
 
             # Quality floor check using pre-computed value
-            min_quality = resolve_min_pick_quality(cfg)
-            if min_quality > 0.0 and quality < min_quality:
+            if min_quality > 0.0 and quality[b] < min_quality:
                 break
 
-            # Populate UI-only fields
-            best.tier = tier
-            best.score = score
-            best.quality = quality
+            i = int(avail[b])
+            picks.append((i, int(tier[b]), float(score[b]), float(quality[b])))
+            used |= match_keys == match_keys[i]
+            total_odds *= float(odds[i])
 
-            selected.append(best)
-            seen_matches.add(best.match_name)
-            total_odds *= best.odds
-
-        if len(selected) < min_legs:
+        if len(picks) < min_legs:
             return []
 
-        return selected
+        return picks
 
     # ── DB row → structured slip ──────────────────────────────────────────────
 
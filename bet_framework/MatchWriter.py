@@ -0,0 +1,152 @@
+"""
+MatchWriter — single writer thread in front of a MatchesManager.
+═════════════════════════════════════════════════════════════════
+
+Finders that scrape with several threads used to call
+MatchesManager.add_match on their own threads, one at a time, so every
+scraping thread waited for the matching and JSON work of the others.  A
+MatchWriter takes the matches through a bounded queue instead and a single
+dedicated thread drains it into the manager:
+
+  • submit(match) is the finder's ``add_match_callback``; it only enqueues
+  • a full queue blocks the caller (backpressure) — time spent blocked is
+    counted, so a too-small queue or a too-slow manager shows up in metrics()
+  • close() drains what is queued, stops the thread and flushes the manager
+
+The manager must not be used by anyone else while the writer is open.
+
+Public surface
+──────────────
+  WRITER_QUEUE_SIZE
+  WriterMetrics                                            (NamedTuple)
+  MatchWriter(manager, maxsize)
+    start() / close()                                      (also a context manager)
+    submit(match)                                          enqueue, blocking while full
+    metrics()                                              → WriterMetrics
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, NamedTuple
+
+from scrape_kit import get_logger
+
+from .core.Match import Match
+
+logger = get_logger(__name__)
+
+# Matches buffered between the finder threads and the writer thread
+WRITER_QUEUE_SIZE = 1000
+
+_STOP = object()
+
+
+class WriterMetrics(NamedTuple):
+    submitted: int
+    written: int  # add_match calls that returned a row
+    failed: int  # add_match calls that returned None or raised
+    depth: int  # matches queued right now
+    max_depth: int
+    blocked_puts: int  # submits that found the queue full
+    blocked_seconds: float  # total time callers spent waiting for room
+
+
+class MatchWriter:
+    """Feed matches from any number of threads into one MatchesManager on a writer thread."""
+
+    def __init__(self, manager: Any, maxsize: int = WRITER_QUEUE_SIZE) -> None:
+        self._manager = manager
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._submitted = 0
+        self._written = 0
+        self._failed = 0
+        self._max_depth = 0
+        self._blocked_puts = 0
+        self._blocked_seconds = 0.0
+
+    def start(self) -> MatchWriter:
+        with self._stats_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._drain, name="match-writer", daemon=True)
+                self._thread.start()
+        return self
+
+    def __enter__(self) -> MatchWriter:
+        return self.start()
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def submit(self, match: Match) -> None:
+        """Queue *match* for the writer thread; blocks while the queue is full."""
+        if self._closed:
+            raise RuntimeError("MatchWriter is closed")
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait(match)
+            blocked = None
+        except queue.Full:
+            started = time.perf_counter()
+            self._queue.put(match)
+            blocked = time.perf_counter() - started
+        with self._stats_lock:
+            self._submitted += 1
+            self._max_depth = max(self._max_depth, self._queue.qsize())
+            if blocked is not None:
+                self._blocked_puts += 1
+                self._blocked_seconds += blocked
+
+    def _drain(self) -> None:
+        while True:
+            match = self._queue.get()
+            try:
+                if match is _STOP:
+                    return
+                try:
+                    ok = self._manager.add_match(match) is not None
+                except Exception as exc:  # keep draining: one bad match must not stall the finders
+                    logger.error(f"MatchWriter: add_match failed: {exc}")
+                    ok = False
+                with self._stats_lock:
+                    if ok:
+                        self._written += 1
+                    else:
+                        self._failed += 1
+            finally:
+                self._queue.task_done()
+
+    def close(self) -> None:
+        """Write everything still queued, stop the writer thread and flush the manager."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        self._manager.flush()
+        m = self.metrics()
+        logger.info(
+            f"MatchWriter: {m.written} matches written ({m.failed} failed) of {m.submitted} submitted; "
+            f"max queue depth {m.max_depth}/{self._queue.maxsize}, "
+            f"callers blocked {m.blocked_seconds:.2f}s over {m.blocked_puts} submits"
+        )
+
+    def metrics(self) -> WriterMetrics:
+        with self._stats_lock:
+            return WriterMetrics(
+                submitted=self._submitted,
+                written=self._written,
+                failed=self._failed,
+                depth=self._queue.qsize(),
+                max_depth=self._max_depth,
+                blocked_puts=self._blocked_puts,
+                blocked_seconds=self._blocked_seconds,
+            )
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import dataclasses
 import json
-from datetime import datetime
-from typing import NamedTuple
-
+import os
+import sqlite3
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import compress
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
 import pandas as pd
 from scrape_kit import (
     BufferedStorageManager,
@@ -14,7 +22,17 @@ from scrape_kit import (
 
 from bet_dashboard.backend.core.market_config import MARKET_DEFINITIONS
 
+from .core.matching import NearMissTracker, PairScoreCache, candidate_pairs, score_block
 from .core.Match import Match, Odds, Score, asdict
+from .core.storage import DEFAULT_STORAGE_PROFILE, StorageProfile, apply_storage_profile, resolve_storage_profile
+from .core.team_names import TeamNameTable
+from .core.utils import frame_memory_report
+from .TeamRegistry import TeamRegistry
+
+try:  # optional fast JSON decoder for fetch_matches
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
 
 logger = get_logger(__name__)
 
@@ -53,27 +71,40 @@ ODDS_MARKET_GROUPS: list[tuple[str, list[tuple[str, str]]]] = [
     ("O/U 5.5", [("over_5_5", "O5.5"), ("under_5_5", "U5.5")]),
     ("BTTS", [("btts_yes", "Yes"), ("btts_no", "No")]),
 ]
-# Reverse lookup: field_name -> (group_label, group_fields)
-_FIELD_TO_GROUP: dict[str, tuple[str, list[tuple[str, str]]]] = {}
-for _gl, _gf in ODDS_MARKET_GROUPS:
-    for _fn, _ in _gf:
-        _FIELD_TO_GROUP[_fn] = (_gl, _gf)
+# Flat field order of ODDS_MARKET_GROUPS: each group is a contiguous run of columns
+_GROUP_FIELDS = tuple(field for _, fields in ODDS_MARKET_GROUPS for field, _ in fields)
+_GROUP_STARTS = np.cumsum([0] + [len(fields) for _, fields in ODDS_MARKET_GROUPS[:-1]])
+# Reverse lookup: field_name -> group position in ODDS_MARKET_GROUPS
+_FIELD_TO_GROUP = {field: g for g, (_, fields) in enumerate(ODDS_MARKET_GROUPS) for field, _ in fields}
+
+
+def _group_price(value) -> float:
+    """A usable market price, or NaN (missing, non-numeric or not positive)."""
+    return float(value) if isinstance(value, (int, float)) and value > 0 else np.nan
 
 
-def _check_market_group(odds_dict: dict, fields: list[tuple[str, str]]) -> tuple[bool, float]:
-    """Check if a complete market group passes implied-probability sanity.
+def _price_matrix(odds_dicts: list) -> np.ndarray:
+    """(len(odds_dicts) × len(_GROUP_FIELDS)) price matrix; rows that are not dicts are all NaN."""
+    missing = [np.nan] * len(_GROUP_FIELDS)
+    rows = [[_group_price(d.get(f)) for f in _GROUP_FIELDS] if isinstance(d, dict) else missing for d in odds_dicts]
+    return np.array(rows, dtype=float).reshape(len(rows), len(_GROUP_FIELDS))
 
-    Returns (is_valid, implied_prob_pct).
-    If any selection is missing, returns (True, 0.0) — incomplete groups are allowed.
+
+def _market_group_implied(prices: np.ndarray) -> np.ndarray:
+    """Implied-probability % of every market group per row (rows × groups).
+
+    A group with any missing price is incomplete and comes out NaN — it
+    cannot be validated, so it always passes.
     """
-    values: list[float] = []
-    for field, _ in fields:
-        v = odds_dict.get(field)
-        if v is None or not isinstance(v, (int, float)) or v <= 0:
-            return True, 0.0  # incomplete group — can't validate
-        values.append(float(v))
-    implied = sum(1.0 / v for v in values) * 100.0
-    return ODDS_VALID_LOW <= implied <= ODDS_VALID_HIGH, implied
+    if not len(prices):
+        return np.empty((0, len(ODDS_MARKET_GROUPS)))
+    return np.add.reduceat(1.0 / prices, _GROUP_STARTS, axis=1) * 100.0
+
+
+def _invalid_groups(implied: np.ndarray) -> np.ndarray:
+    """Mask of complete groups whose implied probability falls outside the valid range."""
+    with np.errstate(invalid="ignore"):
+        return (implied < ODDS_VALID_LOW) | (implied > ODDS_VALID_HIGH)
 
 
 def _is_empty(value) -> bool:
@@ -93,27 +124,240 @@ def _is_empty(value) -> bool:
     return False
 
 
+def _date_key(value) -> date | None:
+    """Return the calendar date of an ISO datetime string, or None if unparseable."""
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+def _match_day(value) -> str | None:
+    """ISO date of a fully parseable ISO datetime string, else None (row would fail to merge)."""
+    try:
+        return datetime.fromisoformat(str(value)).date().isoformat()
+    except ValueError:
+        return None
+
+
+def _sql_value(value):
+    """Buffer cell → SQLite parameter: NaN/NA become NULL, numpy scalars plain Python."""
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return value.item() if hasattr(value, "item") else value
+
+
+def _parse_kickoff(value) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Marks a JSON cell whose decoder raised (the row is dropped as malformed)
+_MALFORMED = object()
+
+
+def _decode_json_values(values: list, fallback) -> list:
+    """Decode a column of JSON cells: orjson when installed, *fallback* for anything else it rejects.
+
+    Cells *fallback* raises on come back as _MALFORMED.
+    """
+    if orjson is not None:
+        loads = orjson.loads
+        try:  # fast path: one comprehension over a clean column
+            return [loads(v) if v.__class__ is str else fallback(v) for v in values]
+        except Exception:
+            pass
+    decoded = []
+    for value in values:
+        if orjson is not None and isinstance(value, str):
+            try:
+                decoded.append(orjson.loads(value))
+                continue
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN literals: let the regular decoder decide
+        try:
+            decoded.append(fallback(value))
+        except Exception:
+            decoded.append(_MALFORMED)
+    return decoded
+
+
+def _is_price(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value == value
+
+
+def _is_midnight(value) -> bool:
+    """True for an ISO datetime string at 00:00 (date-only placeholder kickoff)."""
+    try:
+        dt_value = datetime.fromisoformat(str(value))
+    except ValueError:
+        return False
+    return dt_value.hour == 0 and dt_value.minute == 0
+
+
+# Chunk merge: rows staged per ATTACH batch (SQLite allows 10 attached DBs by default)
+# and how often the buffer is flushed while rows go through add_match.
+ATTACH_BATCH_SIZE = 8
+MERGE_FLUSH_EVERY_ROWS = 5000
+# matches table columns besides id
+_MATCH_COLUMNS = (
+    "home_team_name",
+    "away_team_name",
+    "datetime",
+    "predictions_scores",
+    "odds",
+    "result_url",
+    "league",
+)
+
+# Columnar odds layout: one REAL column per Odds field next to the JSON blob
+ODDS_FIELDS = tuple(f.name for f in dataclasses.fields(Odds))
+ODDS_PRICE_COLUMNS = tuple(f"odds_{name}" for name in ODDS_FIELDS)
+
+# Odds history retention (days) when the caller does not tie it to the scraping window
+ODDS_HISTORY_RETENTION_DAYS = 7
+# Near misses kept per merge (best scores win); bounds memory on large merges
+NEAR_MISS_TOP_K = 500
+
+# Buffer columns held as categoricals by a compact_buffer manager: team names,
+# kickoff strings and leagues repeat across rows, the JSON cells do not.
+_COMPACT_COLUMNS = ("home_team_name", "away_team_name", "datetime", "league")
+
+# Partitioned merge: lookups scan ±1 day, and a row still on a midnight placeholder
+# can move one more day when its kickoff time arrives, so such rows join the
+# candidates of partitions two days away.
+PARTITION_OVERLAP_DAYS = 1
+
+_partition_engine: SimilarityEngine | None = None
+
+
+def _init_partition_worker(similarity_config: dict) -> None:
+    global _partition_engine
+    _partition_engine = SimilarityEngine(similarity_config)
+
+
+def _score_partition(task: tuple[list[tuple[str, str]], list[tuple[str, str]]]) -> dict:
+    """Process-pool task: every SimilarityEngine score one date partition can ask for."""
+    incoming, candidates = task
+    return candidate_pairs(_partition_engine.is_similar, incoming, candidates)
+
+
 class MatchesManager(BufferedStorageManager):
     """
     Buffered SQLite match store with fuzzy-dedup on insert.
 
     Every add_match() call lands directly in the in-memory DataFrame via
-    BufferedStorageManager.insert().  flush() writes the whole buffer back
-    with DELETE + append (preserving schema/indexes unlike parent's replace).
+    BufferedStorageManager.insert().  Inserted and updated buffer rows are
+    tracked, and flush() writes only those back with targeted INSERT /
+    UPDATE statements (keyed on ``id``) in one transaction.  A buffer that
+    was replaced wholesale is written with DELETE + INSERT (preserving
+    schema/indexes unlike parent's replace).
+
+    Lookups go through two in-memory indexes: an exact-key hash index
+    ((lower-cased home, lower-cased away, date) -> buffer positions) that
+    answers repeats without touching the SimilarityEngine, and a date blocking index (match date ->
+    buffer positions) so fuzzy search only visits the ±1 day window.  Both
+    are rebuilt whenever the buffer object is replaced and kept in step
+    incrementally by insert() and _update_datetime().
+
+    With ``columnar_odds`` the 18 Odds prices are also kept in REAL
+    ``odds_<field>`` columns (existing rows are migrated from the JSON on
+    first open).  Prices are then read from those columns; the ``odds``
+    JSON is still written for every row so the DB stays readable by the
+    JSON-only layout (GitHub release DB).  A DB that already has the
+    columns is always kept in columnar layout.
+
+    Odds history lives in the append-only ``odds_history`` table, one row per
+    (match_key, ts, market, value), keyed by history_key() (lower-cased names
+    and date, not alias-resolved) so it survives the matches table being
+    replaced on every pull and the alias registry changing.  History embedded in the odds
+    JSON by older versions is moved there on first open.
+
+    Near misses found by the fuzzy search are kept in a bounded top-K
+    tracker; with ``registry_path`` each merge also adds them to the
+    TeamRegistry's near_miss_candidates so recurring pairs can be proposed
+    as synonyms across runs; near misses are grouped by the names'
+    TeamNameTable form (similarity-config normalisation, memoised), so
+    spellings that normalise alike count once.  The registry's team aliases
+    are applied to the lower-cased names of the exact keys and the SQL
+    collapse, and each accepted fuzzy match teaches it the incoming names as
+    aliases of the buffer row's names, so later runs resolve them without
+    fuzzy scoring.  The SimilarityEngine always scores the raw names.
+
+    With ``compact_buffer`` (read-mostly consumers such as the dashboard) the
+    team name, kickoff and league columns of a freshly loaded buffer are
+    held as categoricals; they are widened back to object columns before
+    the first insert, and in-place updates add missing categories.
+
+    With ``ingest`` (chunk scraping) add_match only collapses exact-key
+    repeats and otherwise appends: no SimilarityEngine is built, so finder
+    callbacks never wait on fuzzy scoring.  The similarity config still
+    drives name normalisation; fuzzy reconciliation is left to
+    merge_databases, which scores every chunk row against the merged buffer.
+
+    ``storage_profile`` (a STORAGE_PROFILES name or a StorageProfile) sets
+    the SQLite PRAGMAs of every connection the manager opens.
     """
 
-    def __init__(self, db_path: str, similarity_config: dict | None = None) -> None:
-        if similarity_config:
+    def __init__(
+        self,
+        db_path: str,
+        similarity_config: dict | None = None,
+        columnar_odds: bool = False,
+        registry_path: str | None = None,
+        compact_buffer: bool = False,
+        ingest: bool = False,
+        storage_profile: str | StorageProfile = DEFAULT_STORAGE_PROFILE,
+    ) -> None:
+        self._storage_profile = resolve_storage_profile(storage_profile)
+        self._ingest = ingest
+        if similarity_config and not ingest:
             self.similarity_engine: SimilarityEngine | None = SimilarityEngine(similarity_config)
         else:
             self.similarity_engine = None
-        self._near_misses: list[NearMiss] = []
+        self._pair_scores = PairScoreCache(self._engine_score)
+        self._team_names = TeamNameTable(similarity_config)
+        self._near_misses = NearMissTracker(NEAR_MISS_TOP_K)
+        self._registry = TeamRegistry(registry_path) if registry_path else None
+        # Aliases learned in earlier runs; new ones are persisted and apply from the next run
+        self._aliases: dict[str, str] = self._registry.alias_map() if self._registry else {}
+        self._blocked_aliases: set[str] = self._registry.blocked_aliases() if self._registry else set()
+        self._canonical_names = set(self._aliases.values())
+        self._pending_aliases: dict[str, str] = {}
+        self._date_index: dict[date, list[int]] = {}
+        self._exact_index: dict[tuple[str, str, date], list[int]] = {}
+        self._exact_hits = 0
+        self._fuzzy_lookups = 0
+        self._indexed_buffer: pd.DataFrame | None = None
+        self._indexed_rows = 0
+        self._tracked_buffer: pd.DataFrame | None = None
+        self._inserted_rows: set[int] = set()
+        self._updated_rows: set[int] = set()
+        self._columnar_odds = columnar_odds
+        self._compact_buffer = compact_buffer
+        # Decoded JSON cells ((row label, column) -> object) of rows add_match touched;
+        # changed cells are re-serialised into the buffer lazily (_write_back_decoded)
+        self._decoded: dict[tuple[Any, str], Any] = {}
+        self._stale_cells: set[tuple[Any, str]] = set()
+        self._decoded_buffer: pd.DataFrame | None = None
+        self._json_decodes = 0
+        self._json_decode_hits = 0
+        self._json_stores = 0
+        self._json_encodes = 0
         super().__init__(db_path, "matches")
 
     # ── Schema ────────────────────────────────────────────────────────────────
 
     def _create_tables(self) -> None:
         with self.db_lock:
+            apply_storage_profile(self.conn, self._storage_profile)  # runs on every fresh connection
             self.conn.execute("""
                 CREATE TABLE IF NOT EXISTS matches (
                     id                 INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -136,74 +380,370 @@ class MatchesManager(BufferedStorageManager):
             if "league" not in columns:
                 self.conn.execute("ALTER TABLE matches ADD COLUMN league TEXT")
 
+            # Columnar odds: keep an already-migrated DB columnar, migrate on request
+            missing = [col for col in ODDS_PRICE_COLUMNS if col not in columns]
+            if len(missing) < len(ODDS_PRICE_COLUMNS):
+                self._columnar_odds = True
+            if self._columnar_odds and missing:
+                for col in missing:
+                    self.conn.execute(f"ALTER TABLE matches ADD COLUMN {col} REAL")
+                self._backfill_odds_columns(missing)
+
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS odds_history (
+                    match_key TEXT NOT NULL,
+                    ts        TEXT NOT NULL,
+                    market    TEXT NOT NULL,
+                    value     REAL NOT NULL
+                )
+            """)
+            # Covering index: history reads never touch the table itself
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_odds_history ON odds_history(match_key, ts, market, value)")
+            # Retention (prune_odds_history) deletes by ts across all keys
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_odds_history_ts ON odds_history(ts)")
+            self._migrate_embedded_history()
+
             self.conn.commit()
 
+    def _backfill_odds_columns(self, columns) -> None:
+        """Fill the REAL price *columns* of every row from its odds JSON (caller commits)."""
+        assignments = ", ".join(f"{col} = json_extract(odds, '$.{col[5:]}')" for col in columns)
+        self.conn.execute(f"UPDATE matches SET {assignments} WHERE json_valid(odds)")
+
+    def _migrate_embedded_history(self) -> None:
+        """Move odds history embedded in the odds JSON (older layout) into odds_history."""
+        legacy = self.conn.execute(
+            "SELECT id, home_team_name, away_team_name, datetime, odds FROM matches WHERE odds LIKE '%\"history\"%'"
+        ).fetchall()
+        for row_id, home, away, dt_value, raw in legacy:
+            odds_dict = self.deserialize_json(raw)
+            if not isinstance(odds_dict, dict):
+                continue
+            key = self.history_key(home, away, dt_value)
+            for snapshot in self._extract_history_from_odds(odds_dict):
+                if key is not None and isinstance(snapshot, dict) and snapshot.get("ts"):
+                    self._insert_snapshot(key, snapshot["ts"], snapshot)
+            self.conn.execute("UPDATE matches SET odds = json_remove(odds, '$.history') WHERE id = ?", (row_id,))
+        if legacy:
+            logger.info(f"Moved embedded odds history of {len(legacy)} matches into odds_history")
+
+    # ── Similarity config ─────────────────────────────────────────────────────
+
+    def set_similarity_config(self, similarity_config: dict | None) -> None:
+        """Swap the similarity config, invalidating the name and pair-score caches built on it."""
+        self.similarity_engine = SimilarityEngine(similarity_config) if similarity_config and not self._ingest else None
+        self._pair_scores.clear()
+        self._adopt_team_names(TeamNameTable(similarity_config))
+
+    def _adopt_team_names(self, table: TeamNameTable) -> None:
+        """Use *table* for the memoised normalised names (e.g. one shared with another manager)."""
+        self._team_names = table
+
+    def team_name_cache_info(self) -> dict[str, int]:
+        """Hit/miss counters of the normalised-name table and the pair-score memo."""
+        return {
+            "name_hits": self._team_names.hits,
+            "name_misses": self._team_names.misses,
+            "pair_hits": self._pair_scores.hits,
+            "pair_misses": self._pair_scores.misses,
+        }
+
+    def json_cache_info(self) -> dict[str, int]:
+        """Counters of the decoded JSON cell cache since the last reset.
+
+        ``decode_hits`` are decodes avoided; ``stores - encodes`` are
+        re-serialisations avoided by writing changed cells back lazily.
+        """
+        return {
+            "decodes": self._json_decodes,
+            "decode_hits": self._json_decode_hits,
+            "stores": self._json_stores,
+            "encodes": self._json_encodes,
+        }
+
+    # ── Blocking index ────────────────────────────────────────────────────────
+
+    def ensure_buffer(self) -> pd.DataFrame:
+        """The loaded buffer, with every cached JSON change written back into its cells."""
+        buf = self._load_buffer()
+        self._write_back_decoded()
+        return buf
+
+    def _load_buffer(self) -> pd.DataFrame:
+        """The loaded buffer as add_match works on it (cached JSON changes not yet written back)."""
+        loading = self._buffer is None
+        buf = super().ensure_buffer()
+        if loading:
+            if self._compact_buffer:
+                self._compact_columns(buf)
+            self._track_changes(buf)  # freshly read: buffer == table
+        self._sync_indexes(buf)
+        return buf
+
+    @staticmethod
+    def _compact_columns(buf: pd.DataFrame) -> None:
+        """Turn the _COMPACT_COLUMNS of *buf* into categoricals, in place."""
+        for col in _COMPACT_COLUMNS:
+            if col in buf.columns and not isinstance(buf[col].dtype, pd.CategoricalDtype):
+                buf[col] = buf[col].astype("category")
+
+    @staticmethod
+    def _expand_columns(buf: pd.DataFrame) -> None:
+        """Turn categorical columns of *buf* back into object columns, in place."""
+        for col in _COMPACT_COLUMNS:
+            if col in buf.columns and isinstance(buf[col].dtype, pd.CategoricalDtype):
+                buf[col] = buf[col].astype(object)
+
+    def _set_cell(self, idx, col: str, value) -> None:
+        """``self._buffer.at[idx, col] = value``, adding *value* to a categorical column's categories."""
+        column = self._buffer[col]
+        if isinstance(column.dtype, pd.CategoricalDtype) and not _is_empty(value) and value not in column.cat.categories:
+            self._buffer[col] = column.cat.add_categories([value])
+        self._buffer.at[idx, col] = value
+
+    def memory_report(self) -> dict:
+        """Deep memory footprint of the matches buffer (see frame_memory_report)."""
+        return frame_memory_report(self._buffer)
+
+    def insert(self, row: dict) -> None:
+        if self._buffer is not None:
+            self._expand_columns(self._buffer)
+        in_sync = self._buffer is not None and self._buffer is self._indexed_buffer
+        tracked = self._buffer is not None and self._buffer is self._tracked_buffer
+        decoded = self._buffer is not None and self._buffer is self._decoded_buffer
+        super().insert(row)
+        # Appending may hand back a new frame object; its existing rows are
+        # unchanged, so carry the index over and only index the new tail.
+        if in_sync:
+            self._indexed_buffer = self._buffer
+        if decoded:
+            self._decoded_buffer = self._buffer
+        if tracked:
+            self._tracked_buffer = self._buffer
+            self._inserted_rows.add(len(self._buffer) - 1)
+        self._sync_indexes(self._buffer)
+
+    def _sync_indexes(self, buf: pd.DataFrame | None) -> None:
+        """Bring the date index in line with *buf*.
+
+        A replaced (or shrunk) buffer is re-indexed from scratch; rows appended
+        since the last sync are indexed incrementally.
+        """
+        if buf is None:
+            self._date_index, self._exact_index = {}, {}
+            self._indexed_buffer, self._indexed_rows = None, 0
+            return
+        if buf is not self._indexed_buffer or len(buf) < self._indexed_rows:
+            self._date_index, self._exact_index, self._indexed_rows = {}, {}, 0
+            self._indexed_buffer = buf
+        if len(buf) == self._indexed_rows:
+            return
+        if {"home_team_name", "away_team_name", "datetime"}.issubset(buf.columns):
+            start = self._indexed_rows
+            tail = zip(
+                buf["home_team_name"].iloc[start:],
+                buf["away_team_name"].iloc[start:],
+                buf["datetime"].iloc[start:],
+                strict=True,
+            )
+            for pos, (home, away, value) in enumerate(tail, start=start):
+                self._index_add(pos, home, away, value)
+        self._indexed_rows = len(buf)
+
+    def _index_add(self, pos: int, home, away, dt_value) -> None:
+        day = _date_key(dt_value)
+        if day is None:
+            return
+        self._date_index.setdefault(day, []).append(pos)
+        key = self._exact_key(home, away, day)
+        if key is not None:
+            self._exact_index.setdefault(key, []).append(pos)
+
+    def _index_remove(self, pos: int, home, away, dt_value) -> None:
+        day = _date_key(dt_value)
+        for index, key in ((self._date_index, day), (self._exact_index, self._exact_key(home, away, day))):
+            bucket = index.get(key)
+            if bucket and pos in bucket:
+                bucket.remove(pos)
+                if not bucket:
+                    del index[key]
+
+    def _exact_key(self, home, away, day: date | None) -> tuple[str, str, date] | None:
+        """Key under which two rows count as the same fixture without fuzzy scoring."""
+        if day is None or not isinstance(home, str) or not isinstance(away, str):
+            return None
+        return self._team_key(home), self._team_key(away), day
+
+    def _team_key(self, raw: str) -> str:
+        """Lower-cased team name, resolved to its canonical name through the alias registry."""
+        name = raw.lower()
+        return self._aliases.get(name, name)
+
+    def _exact_position(self, home: str, away: str, dt: datetime) -> int | None:
+        """First buffer position holding *home* vs *away* (normalised names) within ±1 day of *dt*."""
+        day = dt.date()
+        hits = [
+            pos
+            for offset in (-1, 0, 1)
+            for pos in self._exact_index.get(self._exact_key(home, away, day + timedelta(days=offset)), ())
+        ]
+        return min(hits) if hits else None
+
+    def _candidate_positions(self, dt: datetime) -> list[int]:
+        """Buffer row positions whose match date lies within ±1 day of *dt*, in buffer order."""
+        day = dt.date()
+        positions: list[int] = []
+        for offset in (-1, 0, 1):
+            positions.extend(self._date_index.get(day + timedelta(days=offset), ()))
+        positions.sort()
+        return positions
+
     # ── Similarity search inside the buffer ───────────────────────────────────
 
+    def _engine_score(self, a: str, b: str) -> tuple[bool, float]:
+        return self.similarity_engine.is_similar(a, b)
+
     def _find(self, home: str, away: str, dt: datetime) -> tuple[dict | None, int | None]:
-        buf = self.ensure_buffer()
+        buf = self._load_buffer()
         if buf.empty:
             return None, None
 
-        target = pd.Timestamp(dt.date().isoformat())
-        dates = pd.to_datetime(buf["datetime"].str[:10], errors="coerce")
-        mask = (dates >= target - pd.Timedelta(days=1)) & (dates <= target + pd.Timedelta(days=1))
-
-        best, best_idx, max_score = None, None, -1.0
-        for idx, row in buf[mask].iterrows():
-            rh, ra = row["home_team_name"], row["away_team_name"]
-            # Exact match always wins
-            if rh.lower() == home.lower() and ra.lower() == away.lower():
-                return row.to_dict(), idx
-
-            # Fuzzy matching only if similarity_engine is available
-            if self.similarity_engine is not None:
-                ok_h, sc_h = self.similarity_engine.is_similar(rh, home)
-                if not ok_h:
-                    # Near-miss: check away too for score tracking
-                    if sc_h >= 30:
-                        _, sc_a = self.similarity_engine.is_similar(ra, away)
-                        combined = (sc_h + sc_a) / 2
-                        if 40 <= combined < 65:
-                            self._near_misses.append(NearMiss(home, away, rh, ra, combined, "", ""))
-                    continue
-                ok_a, sc_a = self.similarity_engine.is_similar(ra, away)
-                if not ok_a:
-                    combined = (sc_h + sc_a) / 2
-                    if 40 <= combined < 65:
-                        self._near_misses.append(NearMiss(home, away, rh, ra, combined, "", ""))
-                    continue
-                avg = (sc_h + sc_a) / 2
-                if avg > max_score:
-                    max_score, best, best_idx = avg, row.to_dict(), idx
-
-        return best, best_idx
+        # Exact match always wins — answered from the hash index, no similarity work
+        pos = self._exact_position(home, away, dt)
+        if pos is not None:
+            self._exact_hits += 1
+            return buf.iloc[pos].to_dict(), buf.index[pos]
+
+        # Fuzzy matching only if similarity_engine is available
+        if self.similarity_engine is None:
+            return None, None
+        self._fuzzy_lookups += 1
+
+        positions = self._candidate_positions(dt)
+        homes = buf["home_team_name"].to_numpy()
+        aways = buf["away_team_name"].to_numpy()
+        block_h = [homes[pos] for pos in positions]
+        block_a = [aways[pos] for pos in positions]
+        result = score_block(self._pair_scores.is_similar, home, away, block_h, block_a)
+        for i, combined in result.near_misses:
+            self._track_near_miss(NearMiss(home, away, block_h[i], block_a[i], combined, "", ""))
+
+        if result.best is None:
+            return None, None
+        pos = positions[result.best]
+        self._learn_aliases(home, away, block_h[result.best], block_a[result.best])
+        return buf.iloc[pos].to_dict(), buf.index[pos]
+
+    def _learn_aliases(self, home: str, away: str, known_home: str, known_away: str) -> None:
+        """Queue each incoming name of an accepted fuzzy match as an alias of the buffer row's name."""
+        if self._registry is None:
+            return
+        for raw, known in ((home, known_home), (away, known_away)):
+            alias, canonical = self._team_key(raw), self._team_key(known)
+            # A name other aliases already point at stays canonical (no alias chains)
+            if alias != canonical and alias not in self._blocked_aliases and alias not in self._canonical_names:
+                self._pending_aliases.setdefault(alias, canonical)
+
+    def _persist_aliases(self) -> None:
+        """Write the aliases learned by this run's fuzzy matches to the registry."""
+        if self._registry is None or not self._pending_aliases:
+            return
+        added = self._registry.add_aliases(self._pending_aliases.items(), datetime.now().isoformat())
+        logger.info(f"Alias registry: {added} team aliases learned ({len(self._aliases)} known before this run)")
+        self._pending_aliases.clear()
 
     # ── Public API ────────────────────────────────────────────────────────────
 
     def fetch_matches(self) -> pd.DataFrame:
+        """Return the buffer as the match DataFrame consumed by BetAssistant.load_matches.
+
+        Columns are converted whole: kickoffs parsed with fromisoformat, JSON
+        cells decoded in one pass (orjson when installed), and rows whose
+        kickoff or JSON does not decode are dropped with a mask.
+        """
         self.reopen_if_changed()
         buf = self.ensure_buffer()
-        if buf.empty:
+        if buf.empty or not set(_MATCH_COLUMNS).issubset(buf.columns):
             return pd.DataFrame()
 
-        data = []
-        for _, row in buf.iterrows():
-            try:
-                data.append(
-                    {
-                        "home_name": row["home_team_name"],
-                        "away_name": row["away_team_name"],
-                        "datetime": datetime.fromisoformat(row["datetime"]),
-                        "scores": self.deserialize_json(row["predictions_scores"]) or [],
-                        "odds": self.deserialize_json(row["odds"]),
-                        "result_url": row["result_url"],
-                        "league": row["league"],
-                    }
-                )
-            except Exception as exc:
-                logger.warning(f"skipping malformed row: {exc}")
-        return pd.DataFrame(data)
+        # Cells as a row-wise read sees them (one interleaved object array for the whole frame)
+        cells = buf.values
+        columns = {name: cells[:, buf.columns.get_loc(name)].tolist() for name in _MATCH_COLUMNS}
+        for name in _COMPACT_COLUMNS:
+            if isinstance(buf[name].dtype, pd.CategoricalDtype):  # missing categorical cells read back as NaN
+                columns[name] = [None if _is_empty(v) else v for v in columns[name]]
+
+        kickoffs = [_parse_kickoff(v) for v in columns["datetime"]]
+        scores = _decode_json_values(columns["predictions_scores"], self.deserialize_json)
+        odds = self._odds_values(buf, columns["odds"])
+        keep = [
+            dt is not None and sc is not _MALFORMED and od is not _MALFORMED
+            for dt, sc, od in zip(kickoffs, scores, odds, strict=True)
+        ]
+        dropped = len(keep) - sum(keep)
+        if dropped:
+            logger.warning(f"skipping {dropped} malformed rows")
+        if not any(keep):
+            return pd.DataFrame()
+
+        def kept(values) -> list:
+            return list(compress(values, keep))
+
+        return pd.DataFrame(
+            {
+                "home_name": kept(columns["home_team_name"]),
+                "away_name": kept(columns["away_team_name"]),
+                "datetime": kept(kickoffs),
+                "scores": [sc or [] for sc in kept(scores)],
+                "odds": kept(odds),
+                "result_url": kept(columns["result_url"]),
+                "league": kept(columns["league"]),
+            }
+        )
+
+    def _odds_values(self, buf: pd.DataFrame, raw: list) -> list:
+        """_row_odds() for every buffer row (*raw*: the odds cells), converted column-wise."""
+        if not self._columnar_odds:
+            return _decode_json_values(raw, self.deserialize_json)
+        try:
+            prices = buf.reindex(columns=list(ODDS_PRICE_COLUMNS)).astype(float).to_numpy()
+        except (TypeError, ValueError):  # non-numeric cell: fall back to the per-row path
+            return [self._row_odds(row) for _, row in buf.iterrows()]
+        price_lists = np.where(np.isnan(prices), None, prices).tolist()
+        return [
+            _decode_json_values([value], self.deserialize_json)[0]
+            if _is_empty(value)
+            else dict(zip(ODDS_FIELDS, row, strict=True))
+            for value, row in zip(raw, price_lists, strict=True)
+        ]
+
+    def _row_odds(self, row) -> dict | None:
+        """Odds dict of a buffer row: prices from the REAL columns in columnar layout, else the JSON."""
+        raw = row["odds"]
+        if not self._columnar_odds or _is_empty(raw):
+            return self.deserialize_json(raw)
+        odds = {name: _sql_value(row.get(col)) for name, col in zip(ODDS_FIELDS, ODDS_PRICE_COLUMNS, strict=True)}
+        return odds
+
+    @staticmethod
+    def _odds_columns(odds_dict: dict) -> dict:
+        """REAL column values for the prices in *odds_dict* (non-numeric → NULL)."""
+        prices = {}
+        for name, col in zip(ODDS_FIELDS, ODDS_PRICE_COLUMNS, strict=True):
+            value = odds_dict.get(name)
+            prices[col] = value if isinstance(value, (int, float)) else None
+        return prices
+
+    def _fill_odds_columns(self, buf: pd.DataFrame) -> None:
+        """Derive missing odds_<field> buffer columns from the odds JSON (buffer from a JSON-only DB)."""
+        if not self._columnar_odds or set(ODDS_PRICE_COLUMNS).issubset(buf.columns):
+            return
+        rows = []
+        for raw in buf["odds"] if "odds" in buf.columns else [None] * len(buf):
+            odds_dict = None if _is_empty(raw) else self.deserialize_json(raw)
+            rows.append(self._odds_columns(odds_dict if isinstance(odds_dict, dict) else {}))
+        for col in ODDS_PRICE_COLUMNS:
+            buf[col] = pd.Series([r[col] for r in rows], index=buf.index, dtype=float)
 
     @time_profiler
     def add_match(self, match: Match) -> int | None:
@@ -212,14 +752,13 @@ class MatchesManager(BufferedStorageManager):
         Returns the index of the match in the buffer, or None on error.
         """
         try:
-            self.ensure_buffer()
+            self._load_buffer()
             found, idx = self._find(match.home_team, match.away_team, match.datetime)
 
             # Source-collision guard
             if found is not None and match.predictions:
-                ex_src = {
-                    s.get("source") for s in (self.deserialize_json(found.get("predictions_scores")) or []) if s.get("source")
-                }
+                ex = self._decoded_cell(idx, "predictions_scores", found.get("predictions_scores")) or []
+                ex_src = {s.get("source") for s in ex if s.get("source")}
                 if not {s.source for s in match.predictions if s.source}.isdisjoint(ex_src):
                     logger.warning(f"Source collision — skip {match.home_team} vs {match.away_team}")
                     found = None
@@ -230,7 +769,7 @@ class MatchesManager(BufferedStorageManager):
             # Update existing match
             changed = self._update_existing_match(match, found, idx)
             if changed:
-                self._dirty = True
+                self._mark_updated(idx)
             return idx
 
         except Exception as exc:
@@ -239,20 +778,26 @@ class MatchesManager(BufferedStorageManager):
 
     def _insert_new_match(self, match: Match) -> int:
         """Insert a new match into the buffer."""
+        predictions = [dict(s.__dict__) for s in match.predictions] if match.predictions else None
+        odds = asdict(match.odds) if match.odds else None
+        odds_columns = self._odds_columns(odds or {}) if self._columnar_odds else {}
         self.insert(
             {
                 "home_team_name": match.home_team,
                 "away_team_name": match.away_team,
                 "datetime": match.datetime.isoformat(),
-                "predictions_scores": self.serialize_json([s.__dict__ for s in match.predictions])
-                if match.predictions
-                else None,
-                "odds": self.serialize_json(asdict(match.odds)) if match.odds else None,
+                "predictions_scores": self.serialize_json(predictions) if predictions else None,
+                "odds": self.serialize_json(odds) if odds else None,
                 "result_url": match.result_url,
                 "league": match.league,
+                **odds_columns,
             }
         )
-        return len(self._buffer) - 1
+        idx = len(self._buffer) - 1
+        # Later updates of this row start from the objects just serialised
+        self._seed_decoded(idx, "predictions_scores", predictions)
+        self._seed_decoded(idx, "odds", odds)
+        return idx
 
     def _update_existing_match(self, match: Match, found: dict, idx: int) -> bool:
         """Update an existing match in the buffer. Returns True if changes were made."""
@@ -289,25 +834,25 @@ class MatchesManager(BufferedStorageManager):
 
         if not _is_empty(match.league) and _is_empty(found.get("league")):
             logger.info(f"Updating league for {match.home_team} vs {match.away_team} to {match.league}")
-            self._buffer.at[idx, "league"] = match.league
+            self._set_cell(idx, "league", match.league)
             changed = True
 
         return changed
 
     def _update_predictions(self, match: Match, found: dict, idx: int) -> bool:
         """Merge predictions from the new match into existing ones. Returns True if changed."""
-        ex = self.deserialize_json(found.get("predictions_scores")) or []
+        ex = self._decoded_cell(idx, "predictions_scores", found.get("predictions_scores")) or []
         ex_src = {s.get("source") for s in ex if s.get("source")}
         changed = False
 
         for s in match.predictions:
             if s.source not in ex_src:
-                ex.append(s.__dict__)
+                ex.append(dict(s.__dict__))
                 ex_src.add(s.source)
                 changed = True
 
         if changed:
-            self._buffer.at[idx, "predictions_scores"] = json.dumps(ex)
+            self._store_decoded(idx, "predictions_scores", ex)
         return changed
 
     def _update_datetime(self, match: Match, found: dict, idx: int) -> bool:
@@ -315,57 +860,224 @@ class MatchesManager(BufferedStorageManager):
         try:
             ex_dt = datetime.fromisoformat(found["datetime"])
             if ex_dt.hour == 0 and ex_dt.minute == 0 and (match.datetime.hour != 0 or match.datetime.minute != 0):
-                self._buffer.at[idx, "datetime"] = match.datetime.isoformat()
+                self._set_cell(idx, "datetime", match.datetime.isoformat())
+                # Keep the blocking index and odds history in step when the match moves to another day
+                if ex_dt.date() != match.datetime.date():
+                    pos = self._buffer.index.get_loc(idx)
+                    home, away = found["home_team_name"], found["away_team_name"]
+                    self._index_remove(pos, home, away, found["datetime"])
+                    self._index_add(pos, home, away, match.datetime.isoformat())
+                    old_key, new_key = self.history_key(home, away, ex_dt), self.history_key(home, away, match.datetime)
+                    if old_key is not None and new_key is not None:
+                        with self.db_lock:
+                            self._rekey_history(old_key, new_key)
+                            self.conn.commit()
                 return True
         except Exception:
             pass
         return False
 
     def _update_odds(self, match: Match, found: dict, idx: int) -> bool:
-        cur = self.deserialize_json(found.get("odds")) or {}
+        cur = self._decoded_cell(idx, "odds", found.get("odds")) or {}
         raw_patch = {k: v for k, v in asdict(match.odds).items() if _is_empty(cur.get(k)) and not _is_empty(v)}
         if not raw_patch:
             return False
-        # Validate each market group that would become complete after patching
+        # Validate each market group the patch touches that is complete after patching
         merged = {**cur, **raw_patch}
+        implied = _market_group_implied(_price_matrix([merged]))[0]
+        bad = _invalid_groups(implied)
         rejected_fields: set[str] = set()
-        checked_groups: set[str] = set()
-        for field in raw_patch:
-            grp = _FIELD_TO_GROUP.get(field)
-            if grp is None or grp[0] in checked_groups:
+        for g in sorted({_FIELD_TO_GROUP[f] for f in raw_patch if f in _FIELD_TO_GROUP}):
+            if not bad[g]:
                 continue
-            group_label, group_fields = grp
-            checked_groups.add(group_label)
-            valid, implied = _check_market_group(merged, group_fields)
-            if not valid:
-                bad_keys = {f for f, _ in group_fields}
-                rejected_fields |= bad_keys & raw_patch.keys()
-                logger.warning(
-                    "Rejecting %s odds for %s vs %s (implied=%.1f%%)",
-                    group_label,
-                    match.home_team,
-                    match.away_team,
-                    implied,
-                )
+            group_label, group_fields = ODDS_MARKET_GROUPS[g]
+            rejected_fields |= {f for f, _ in group_fields} & raw_patch.keys()
+            logger.warning(
+                "Rejecting %s odds for %s vs %s (implied=%.1f%%)",
+                group_label,
+                match.home_team,
+                match.away_team,
+                implied[g],
+            )
         patch = {k: v for k, v in raw_patch.items() if k not in rejected_fields}
         if not patch:
             return False
-        self._buffer.at[idx, "odds"] = self.serialize_json({**cur, **patch})
+        self._store_decoded(idx, "odds", {**cur, **patch})
+        if self._columnar_odds:
+            for col, value in self._odds_columns(patch).items():
+                if col[5:] in patch and col in self._buffer.columns:
+                    self._buffer.at[idx, col] = value
         return True
 
+    # ── Decoded JSON cells ────────────────────────────────────────────────────
+
+    def _decoded_cell(self, idx, col: str, raw):
+        """Decoded value of the JSON cell (*idx*, *col*), whose buffer text is *raw*; decoded once per row."""
+        if self._buffer is not self._decoded_buffer:
+            self._drop_decoded()
+            self._decoded_buffer = self._buffer
+        key = (idx, col)
+        if key in self._decoded:
+            self._json_decode_hits += 1
+            return self._decoded[key]
+        self._json_decodes += 1
+        value = self._decoded[key] = self.deserialize_json(raw)
+        return value
+
+    def _seed_decoded(self, idx, col: str, value) -> None:
+        """Cache *value* as the decoded form of a cell just written to the buffer."""
+        if self._buffer is not self._decoded_buffer:
+            self._drop_decoded()
+            self._decoded_buffer = self._buffer
+        self._decoded[(idx, col)] = value
+
+    def _store_decoded(self, idx, col: str, value) -> None:
+        """Replace the decoded cell (*idx*, *col*); the buffer text is rewritten on the next write-back."""
+        self._seed_decoded(idx, col, value)
+        self._stale_cells.add((idx, col))
+        self._json_stores += 1
+
+    def _write_back_decoded(self) -> int:
+        """Serialise every changed cached cell into the buffer; returns the number written."""
+        if not self._stale_cells:
+            return 0
+        if self._buffer is not self._decoded_buffer:  # buffer replaced: its own cells are authoritative
+            self._drop_decoded()
+            return 0
+        for idx, col in self._stale_cells:
+            self._buffer.at[idx, col] = self.serialize_json(self._decoded[(idx, col)])
+        written = len(self._stale_cells)
+        self._json_encodes += written
+        self._stale_cells.clear()
+        return written
+
+    def _drop_decoded(self) -> None:
+        self._decoded.clear()
+        self._stale_cells.clear()
+        self._decoded_buffer = None
+
     def reset_matches_db(self) -> None:
         self.clear_database("matches")  # clears buffer + dirty flag (inherited)
+        self._track_changes(None)
+
+    def close(self) -> None:
+        super().close()
+        if self._registry is not None:
+            self._persist_aliases()
+            self._registry.close()
+
+    # ── Persistence ───────────────────────────────────────────────────────────
+
+    def _track_changes(self, buf: pd.DataFrame | None) -> None:
+        """Start tracking row changes against *buf*, which matches the table as of now."""
+        if buf is None:  # buffer dropped: so are its decoded cells
+            self._drop_decoded()
+        self._tracked_buffer = buf
+        self._inserted_rows.clear()
+        self._updated_rows.clear()
+
+    def _mark_updated(self, idx) -> None:
+        """Record that the buffer row labelled *idx* changed and needs writing back."""
+        self._dirty = True
+        if self._buffer is not None and self._buffer is self._tracked_buffer:
+            self._updated_rows.add(self._buffer.index.get_loc(idx))
+
+    def flush(self) -> None:
+        """Write pending buffer changes to SQLite in one transaction.
 
-    def merge_databases(self, chunks_dir: str) -> None:
+        Rows inserted or updated since the buffer was loaded (or last
+        flushed) are written with targeted INSERT / UPDATE statements; new
+        rows get their ``id`` back in the buffer.  A buffer that is not the
+        tracked one (replaced wholesale) is written in full.
+        """
+        self._write_back_decoded()
+        buf = self._buffer
+        if not self._dirty or buf is None:
+            return
+        if "id" not in buf.columns:
+            buf.insert(0, "id", float("nan"))
+        self._fill_odds_columns(buf)
+        with self.db_lock:
+            try:
+                if buf is self._tracked_buffer:
+                    inserted, updated = self._write_rows(buf, sorted(self._inserted_rows), sorted(self._updated_rows))
+                    logger.debug(f"flush: {inserted} inserted, {updated} updated")
+                else:
+                    self.conn.execute("DELETE FROM matches")
+                    inserted, _ = self._write_rows(buf, range(len(buf)), ())
+                    logger.debug(f"flush: rewrote all {inserted} rows")
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+        self._track_changes(buf)
+        self._dirty = False
+
+    def _write_rows(self, buf: pd.DataFrame, inserts, updates) -> tuple[int, int]:
+        """INSERT the rows at positions *inserts* and UPDATE those at *updates*; returns the counts."""
+        columns = [c for c in (*_MATCH_COLUMNS, *(ODDS_PRICE_COLUMNS if self._columnar_odds else ())) if c in buf.columns]
+        values = {c: buf[c].to_numpy() for c in ("id", *columns)}
+        id_col = buf.columns.get_loc("id")
+        inserts = set(inserts)
+        insert_sql = f"INSERT INTO matches (id, {', '.join(columns)}) VALUES ({', '.join('?' * (len(columns) + 1))})"
+        update_sql = f"UPDATE matches SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?"
+
+        updated = 0
+        for pos in updates:
+            row_id = _sql_value(values["id"][pos])
+            if pos in inserts or row_id is None:
+                inserts.add(pos)
+                continue
+            self.conn.execute(update_sql, [*(_sql_value(values[c][pos]) for c in columns), int(row_id)])
+            updated += 1
+
+        for pos in sorted(inserts):
+            row_id = _sql_value(values["id"][pos])
+            row_id = None if row_id is None else int(row_id)
+            cursor = self.conn.execute(insert_sql, [row_id, *(_sql_value(values[c][pos]) for c in columns)])
+            if row_id is None:
+                buf.iat[pos, id_col] = cursor.lastrowid
+        return len(inserts), updated
+
+    def merge_databases(self, chunks_dir: str, workers: int = 1) -> None:
+        """Merge every chunk DB in *chunks_dir* into this buffer.
+
+        Chunk rows are first staged in SQLite, where exact duplicates are
+        collapsed (see _collapse_exact_duplicates); only the remaining rows
+        go through add_match, in chunk order.
+
+        With ``workers > 1`` (and a similarity engine) the merge is partitioned:
+        rows are grouped by match date and each partition's fuzzy scores are
+        computed in a process pool, then the rows are reconciled in their
+        usual order against those precomputed scores.  Decisions therefore
+        come out identical to the sequential merge.
+        """
         self.ensure_buffer()
         logger.info(f"Merging chunks from {chunks_dir}")
 
+        stage = self._stage_chunks(chunks_dir)
+        try:
+            self._merge_staged(stage, workers)
+        finally:
+            stage.close()
+
+    def _merge_staged(self, stage: sqlite3.Connection, workers: int) -> None:
+        """add_match every row _collapse_exact_duplicates leaves in *stage*, streamed from its cursor."""
+        staged = stage.execute("SELECT COUNT(*) FROM staged").fetchone()[0]
+        logger.info(f"SQL pass: {staged} chunk rows staged")
+        rows = self._collapse_exact_duplicates(stage)
+        if workers > 1 and self.similarity_engine is not None:
+            rows = rows.fetchall()  # read twice: scored up front, then merged
+            self._prescore_partitions(rows, workers)
+
         processed = 0
         added = 0
         merged = 0
+        self._exact_hits = 0
+        self._fuzzy_lookups = 0
+        self._json_decodes = self._json_decode_hits = self._json_stores = self._json_encodes = 0
 
-        def _row(row) -> None:
-            nonlocal processed, added, merged
+        for row in rows:
             processed += 1
             initial_count = len(self._buffer) if self._buffer is not None else 0
             try:
@@ -395,38 +1107,246 @@ class MatchesManager(BufferedStorageManager):
             except Exception as exc:
                 logger.error(f"merge row error: {exc}")
 
-        self.merge_row_by_row(
-            chunks_dir,
-            "matches",
-            row_callback=_row,
-            flush_callback=self.flush,
-            read_batch_size=2000,
-            flush_every_rows=5000,
-        )
+            if processed % MERGE_FLUSH_EVERY_ROWS == 0:
+                self.flush()
+
         self.flush()
+        self._pair_scores.release()
         self._log_near_misses()
+        self._persist_near_misses()
+        self._persist_aliases()
         self._clear_near_misses()
         self._log_odds_validation_report()
         logger.info(f"Merge complete: {processed} rows processed ({added} new, {merged} merged into existing).")
+        logger.info(
+            f"Lookups: {self._exact_hits} exact-key hits, {self._fuzzy_lookups} fuzzy searches "
+            f"(SimilarityEngine skipped for {self._exact_hits}/{processed} rows)."
+        )
+        cache = self.team_name_cache_info()
+        logger.info(
+            f"Name cache: {cache['name_hits']} hits / {cache['name_misses']} misses; "
+            f"pair scores: {cache['pair_hits']} hits / {cache['pair_misses']} misses."
+        )
+        json_cache = self.json_cache_info()
+        logger.info(
+            f"JSON cells: {json_cache['decode_hits']} decodes avoided ({json_cache['decodes']} decoded); "
+            f"{json_cache['stores']} updates written back with {json_cache['encodes']} encodes."
+        )
+        self._drop_decoded()  # the merge is done with them; release the decoded objects
+
+    # ── SQL staging of chunk rows ─────────────────────────────────────────────
+
+    def _chunk_paths(self, chunks_dir: str) -> list[str]:
+        own = os.path.abspath(self.db_path)
+        paths = (os.path.join(chunks_dir, name) for name in sorted(os.listdir(chunks_dir)) if name.endswith(".db"))
+        return [path for path in paths if os.path.abspath(path) != own]
+
+    def _stage_chunks(self, chunks_dir: str) -> sqlite3.Connection:
+        """ATTACH the chunk DBs and copy their matches rows into an in-memory ``staged`` table.
+
+        ``seq`` preserves chunk order (file name, then rowid); ``nhome``/``naway``/
+        ``day`` carry the exact-match key used by the in-memory index.
+        """
+        stage = sqlite3.connect(":memory:")
+        stage.row_factory = sqlite3.Row
+        stage.create_function("norm_team", 1, lambda v: self._team_key(v) if isinstance(v, str) else None)
+        stage.create_function("match_day", 1, _match_day, deterministic=True)
+        stage.create_function("is_midnight", 1, _is_midnight, deterministic=True)
+        stage.execute(
+            f"CREATE TABLE staged (seq INTEGER PRIMARY KEY, {', '.join(_MATCH_COLUMNS)}, nhome TEXT, naway TEXT, day TEXT)"
+        )
+
+        paths = self._chunk_paths(chunks_dir)
+        for start in range(0, len(paths), ATTACH_BATCH_SIZE):
+            aliases = []
+            for i, path in enumerate(paths[start : start + ATTACH_BATCH_SIZE]):
+                alias = f"chunk{i}"
+                stage.execute(f"ATTACH DATABASE ? AS {alias}", (path,))
+                aliases.append((alias, path))
+            for alias, path in aliases:
+                try:
+                    present = {r[1] for r in stage.execute(f"PRAGMA {alias}.table_info(matches)")}
+                    if not present:
+                        continue
+                    cols = ", ".join(c if c in present else f"NULL AS {c}" for c in _MATCH_COLUMNS)
+                    stage.execute(
+                        f"""
+                        INSERT INTO staged ({", ".join(_MATCH_COLUMNS)}, nhome, naway, day)
+                        SELECT *, norm_team(home_team_name), norm_team(away_team_name), match_day(datetime)
+                        FROM (SELECT {cols} FROM {alias}.matches ORDER BY rowid)
+                        """
+                    )
+                except sqlite3.Error as exc:
+                    logger.warning(f"Skipping chunk {path}: {exc}")
+            stage.commit()
+            for alias, _ in aliases:
+                stage.execute(f"DETACH DATABASE {alias}")
+        stage.execute("CREATE INDEX staged_key ON staged(nhome, naway, day)")
+        stage.execute("CREATE INDEX staged_day ON staged(day)")  # neighbour check by date
+        return stage
+
+    def _collapse_exact_duplicates(self, stage: sqlite3.Connection) -> sqlite3.Cursor:
+        """Fold staged rows sharing an exact key into one row each; return a cursor over all rows in chunk order.
+
+        A group is only folded when add_match would merge its rows anyway:
+
+          • every prediction carries a source and no source repeats (no collision)
+          • only the group's first row carries odds (no validated odds patching)
+          • the key occurs on no other day (no ±1 day exact hits across groups)
+          • no other staged row lies within a day of it (a possible fuzzy
+            neighbour, which add_match could merge between the group's rows)
+          • the buffer is empty (nothing to collide with)
+
+        The folded row keeps the first row's names and odds, concatenates the
+        predictions in chunk order (json_group_array), takes the first
+        non-empty result_url / league, and the first row's datetime unless it
+        is a midnight placeholder, in which case the first specific kickoff.
+        """
+        stage.executescript(
+            """
+            CREATE TEMP TABLE grp AS
+                SELECT nhome, naway, day, MIN(seq) AS first_seq
+                FROM staged
+                WHERE nhome IS NOT NULL AND naway IS NOT NULL AND day IS NOT NULL
+                GROUP BY nhome, naway, day
+                HAVING COUNT(*) > 1;
+
+            DELETE FROM grp WHERE EXISTS (
+                SELECT 1 FROM staged s
+                WHERE s.nhome = grp.nhome AND s.naway = grp.naway
+                  AND (s.day IS NULL OR s.day <> grp.day
+                       OR (NULLIF(s.odds, '') IS NOT NULL AND s.seq <> grp.first_seq)
+                       OR (NULLIF(s.predictions_scores, '') IS NOT NULL
+                           AND (NOT json_valid(s.predictions_scores) OR json_type(s.predictions_scores) <> 'array')))
+            );
+
+            DELETE FROM grp WHERE EXISTS (
+                SELECT 1 FROM staged s
+                WHERE s.day BETWEEN date(grp.day, '-1 day') AND date(grp.day, '+1 day')
+                  AND NOT (s.nhome = grp.nhome AND s.naway = grp.naway)
+            );
+
+            DELETE FROM grp WHERE (
+                SELECT COUNT(*) <> COUNT(DISTINCT NULLIF(json_extract(p.value, '$.source'), ''))
+                FROM staged s, json_each(s.predictions_scores) p
+                WHERE s.nhome = grp.nhome AND s.naway = grp.naway AND s.day = grp.day
+                  AND NULLIF(s.predictions_scores, '') IS NOT NULL
+            );
+            """
+        )
+        if not self.ensure_buffer().empty:
+            stage.execute("DELETE FROM grp")
+
+        cols = ", ".join(_MATCH_COLUMNS)
+        query = f"""
+            SELECT seq, {cols} FROM staged s
+            WHERE NOT EXISTS (SELECT 1 FROM grp g WHERE g.nhome = s.nhome AND g.naway = s.naway AND g.day = s.day)
+            UNION ALL
+            SELECT g.first_seq, f.home_team_name, f.away_team_name,
+                CASE WHEN is_midnight(f.datetime) THEN COALESCE(
+                    (SELECT s.datetime FROM staged s
+                     WHERE s.nhome = g.nhome AND s.naway = g.naway AND s.day = g.day AND NOT is_midnight(s.datetime)
+                     ORDER BY s.seq LIMIT 1),
+                    f.datetime) ELSE f.datetime END,
+                (SELECT json_group_array(json(value)) FROM (
+                    SELECT p.value FROM staged s, json_each(s.predictions_scores) p
+                    WHERE s.nhome = g.nhome AND s.naway = g.naway AND s.day = g.day
+                      AND NULLIF(s.predictions_scores, '') IS NOT NULL
+                    ORDER BY s.seq, p.key)),
+                f.odds,
+                (SELECT s.result_url FROM staged s
+                 WHERE s.nhome = g.nhome AND s.naway = g.naway AND s.day = g.day AND TRIM(COALESCE(s.result_url, '')) <> ''
+                 ORDER BY s.seq LIMIT 1),
+                (SELECT s.league FROM staged s
+                 WHERE s.nhome = g.nhome AND s.naway = g.naway AND s.day = g.day AND TRIM(COALESCE(s.league, '')) <> ''
+                 ORDER BY s.seq LIMIT 1)
+            FROM grp g JOIN staged f ON f.seq = g.first_seq
+            ORDER BY 1
+        """
+        folded = stage.execute("SELECT COUNT(*) FROM grp").fetchone()[0]
+        if folded:
+            logger.info(f"SQL pass: folded {folded} exact-duplicate groups")
+        return stage.execute(query)
+
+    # ── Partitioned merge ─────────────────────────────────────────────────────
+
+    def _prescore_partitions(self, rows: list[sqlite3.Row], workers: int) -> None:
+        """Compute each date partition's similarity scores in a process pool and pin them."""
+        by_date: dict[date, set[tuple[str, str, bool]]] = {}
+        fixtures = [(r["home_team_name"], r["away_team_name"], r["datetime"]) for r in rows]
+        buf = self.ensure_buffer()
+        if not buf.empty:
+            # Rows already in the buffer are candidates too
+            fixtures += list(buf[["home_team_name", "away_team_name", "datetime"]].itertuples(index=False))
+        for home, away, dt_value in fixtures:
+            day = _date_key(dt_value)
+            if day is not None and isinstance(home, str) and isinstance(away, str):
+                by_date.setdefault(day, set()).add((home, away, _is_midnight(dt_value)))
+
+        tasks = []
+        for day in sorted(by_date):
+            candidates: set[tuple[str, str]] = set()
+            for offset in range(-PARTITION_OVERLAP_DAYS - 1, PARTITION_OVERLAP_DAYS + 2):
+                edge = abs(offset) > PARTITION_OVERLAP_DAYS
+                candidates.update(
+                    (home, away)
+                    for home, away, midnight in by_date.get(day + timedelta(days=offset), ())
+                    if midnight or not edge
+                )
+            incoming = {(home, away) for home, away, _ in by_date[day]}
+            tasks.append((sorted(incoming), sorted(candidates)))
+        if not tasks:
+            return
+
+        logger.info(f"Scoring {len(tasks)} date partitions with {workers} workers")
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_partition_worker,
+                initargs=(self.similarity_engine._config,),
+            ) as pool:
+                for scores in pool.map(_score_partition, tasks):
+                    self._pair_scores.preload(scores)
+        except Exception as exc:
+            # Scores are only a cache: the reconcile pass scores anything missing itself
+            logger.warning(f"Partition scoring failed, continuing sequentially: {exc}")
+            self._pair_scores.release()
+            return
+        logger.info(f"Precomputed {len(self._pair_scores)} similarity scores")
 
     # ── Near-miss logging ──────────────────────────────────────────────────────
 
+    def _track_near_miss(self, nm: NearMiss) -> None:
+        # Spellings that normalise identically are the same near miss
+        key = tuple(self._team_names.normalized(n) for n in (nm.home_a, nm.away_a, nm.home_b, nm.away_b))
+        self._near_misses.add(key, nm.score, nm)
+
     def _log_near_misses(self) -> None:
         """Log near-miss pairs for synonym discovery."""
         if not self._near_misses:
             return
-        seen: set[tuple[str, str, str, str]] = set()
-        unique: list[NearMiss] = []
-        for nm in sorted(self._near_misses, key=lambda x: x.score, reverse=True):
-            key = (nm.home_a, nm.away_a, nm.home_b, nm.away_b)
-            if key not in seen:
-                seen.add(key)
-                unique.append(nm)
-        logger.warning(f"=== NEAR-MISS REPORT: {len(unique)} pairs (score 40-65) ===")
+        names = self._team_names
+        unique = self._near_misses.items()
+        logger.warning(f"=== NEAR-MISS REPORT: {len(unique)} pairs (score 40-65, top {self._near_misses.limit}) ===")
         for nm in unique:
-            logger.warning(f"  [{nm.score:.0f}] {nm.home_a} vs {nm.away_a} <-> {nm.home_b} vs {nm.away_b}")
+            # "~" marks sides that sound alike (same phonetic key) — likely synonym candidates
+            sounds_alike = "~" if names.phonetic(nm.home_a) == names.phonetic(nm.home_b) else " "
+            sounds_alike += "~" if names.phonetic(nm.away_a) == names.phonetic(nm.away_b) else " "
+            logger.warning(f"  [{nm.score:.0f}]{sounds_alike} {nm.home_a} vs {nm.away_a} <-> {nm.home_b} vs {nm.away_b}")
         logger.warning("=== END NEAR-MISS REPORT ===")
 
+    def _persist_near_misses(self) -> None:
+        """Add this run's near misses to the registry's near_miss_candidates, one pair per differing side."""
+        if self._registry is None or not self._near_misses:
+            return
+        pairs = [
+            (self._team_names.normalized(a), self._team_names.normalized(b), nm.score)
+            for nm in self._near_misses.items()
+            for a, b in ((nm.home_a, nm.home_b), (nm.away_a, nm.away_b))
+        ]
+        stored = self._registry.record_near_misses(pairs, datetime.now().isoformat())
+        logger.info(f"Near-miss candidates: {stored} team-name pairs recorded in {self._registry.db_path}")
+
     def _clear_near_misses(self) -> None:
         """Clear tracked near-misses."""
         self._near_misses.clear()
@@ -434,27 +1354,29 @@ class MatchesManager(BufferedStorageManager):
     # ── Odds mathematical validation ──────────────────────────────────────────
 
     def _validate_all_odds(self) -> list[OddsValidationIssue]:
-        """Scan buffer for odds that don't add up mathematically."""
+        """Scan buffer for odds that don't add up mathematically.
+
+        The odds of every row go into one price matrix and the implied
+        probability of every market group is computed in one shot; issues
+        come back in row order, then ODDS_MARKET_GROUPS order.
+        """
         buf = self.ensure_buffer()
-        if buf.empty:
+        if buf.empty or "odds" not in buf.columns:
+            return []
+        odds_dicts = _decode_json_values([None if _is_empty(v) else v for v in buf["odds"].tolist()], self.deserialize_json)
+        prices = _price_matrix(odds_dicts)
+        implied = _market_group_implied(prices)
+        rows, groups = np.nonzero(_invalid_groups(implied))
+        if not len(rows):
             return []
+        homes = buf["home_team_name"].to_numpy() if "home_team_name" in buf.columns else np.full(len(buf), "?")
+        aways = buf["away_team_name"].to_numpy() if "away_team_name" in buf.columns else np.full(len(buf), "?")
         issues: list[OddsValidationIssue] = []
-        for _, row in buf.iterrows():
-            odds_json = row.get("odds")
-            if not odds_json or (isinstance(odds_json, float) and pd.isna(odds_json)):
-                continue
-            odds_dict = self.deserialize_json(odds_json)
-            if not odds_dict:
-                continue
-            home = row.get("home_team_name", "?")
-            away = row.get("away_team_name", "?")
-            for group_label, fields in ODDS_MARKET_GROUPS:
-                valid, implied = _check_market_group(odds_dict, fields)
-                if implied == 0.0:
-                    continue  # incomplete group
-                if not valid:
-                    vals = {lbl: float(odds_dict[fld]) for fld, lbl in fields}
-                    issues.append(OddsValidationIssue(home, away, group_label, round(implied, 2), vals))
+        for r, g in zip(rows.tolist(), groups.tolist(), strict=True):
+            group_label, fields = ODDS_MARKET_GROUPS[g]
+            start = int(_GROUP_STARTS[g])
+            vals = {lbl: float(prices[r, start + i]) for i, (_, lbl) in enumerate(fields)}
+            issues.append(OddsValidationIssue(homes[r], aways[r], group_label, round(float(implied[r, g]), 2), vals))
         return issues
 
     def _log_odds_validation_report(self) -> None:
@@ -476,7 +1398,76 @@ class MatchesManager(BufferedStorageManager):
             )
         logger.warning("=== END ODDS VALIDATION REPORT ===")
 
-    # ── Embedded Odds History ──────────────────────────────────────────────────
+    # ── Odds History ──────────────────────────────────────────────────────────
+
+    @staticmethod
+    def history_key(home, away, dt_value) -> str | None:
+        """Stable odds_history key of a fixture: lower-cased names as scraped and match date.
+
+        Independent of the alias registry and the similarity config, so
+        learning or unlinking an alias never cuts a fixture off its history;
+        a change of date is carried over by _rekey_history().
+        """
+        day = _date_key(dt_value)
+        if day is None or not isinstance(home, str) or not isinstance(away, str):
+            return None
+        return f"{home.lower()}|{away.lower()}|{day.isoformat()}"
+
+    def _insert_snapshot(self, key: str, ts: str, odds_dict: dict) -> int:
+        rows = [
+            (key, ts, market, float(v)) for market, v in self._get_current_odds_snapshot(odds_dict).items() if _is_price(v)
+        ]
+        self.conn.executemany("INSERT INTO odds_history (match_key, ts, market, value) VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def record_odds_snapshot(self, key: str, ts: str, odds_dict: dict) -> int:
+        """Append the prices of *odds_dict* as the snapshot of *key* at *ts*; returns rows written."""
+        with self.db_lock:
+            written = self._insert_snapshot(key, ts, odds_dict)
+            self.conn.commit()
+        return written
+
+    def odds_history(self, key: str | None) -> list[dict]:
+        """Snapshots of *key*, oldest first, as ``{"ts": ..., market: value, ...}`` dicts."""
+        if key is None:
+            return []
+        rows = self.fetch_rows("SELECT ts, market, value FROM odds_history WHERE match_key = ? ORDER BY ts", (key,))
+        history: list[dict] = []
+        for ts, market, value in rows:
+            if not history or history[-1]["ts"] != ts:
+                history.append({"ts": ts})
+            history[-1][market] = value
+        return history
+
+    def odds_history_lookup(self) -> Callable[[Any, Any, Any], list[dict]]:
+        """``lookup(home, away, kickoff)`` → odds_history() of that fixture, from one read of the whole table.
+
+        For bulk readers such as BetAssistant.load_matches, which would
+        otherwise query odds_history once per match.
+        """
+        histories: dict[str, list[dict]] = {}
+        rows = self.fetch_rows("SELECT match_key, ts, market, value FROM odds_history ORDER BY match_key, ts")
+        for key, ts, market, value in rows:
+            history = histories.setdefault(key, [])
+            if not history or history[-1]["ts"] != ts:
+                history.append({"ts": ts})
+            history[-1][market] = value
+
+        def lookup(home, away, dt_value) -> list[dict]:
+            return histories.get(self.history_key(home, away, dt_value), [])
+
+        return lookup
+
+    def prune_odds_history(self, cutoff_ts: str) -> int:
+        """Retention: drop history snapshots taken before *cutoff_ts*; returns rows deleted."""
+        with self.db_lock:
+            deleted = self.conn.execute("DELETE FROM odds_history WHERE ts < ?", (cutoff_ts,)).rowcount
+            self.conn.commit()
+        return deleted
+
+    def _rekey_history(self, old_key: str, new_key: str) -> None:
+        """Carry a fixture's history over to *new_key* when it is listed under other names or moves date (caller commits)."""
+        self.conn.execute("UPDATE odds_history SET match_key = ? WHERE match_key = ?", (new_key, old_key))
 
     @staticmethod
     def _extract_history_from_odds(odds_dict: dict | None) -> list[dict]:
@@ -492,52 +1483,36 @@ class MatchesManager(BufferedStorageManager):
             return {}
         return {k: v for k, v in odds_dict.items() if k != "history" and v is not None}
 
-    @staticmethod
-    def _append_to_history(current_odds: dict, new_snapshot: dict, max_entries: int) -> dict:
-        """Append a snapshot to history array, trim to max_entries, return updated odds dict.
-
-        Args:
-            current_odds: The current odds dict (may contain history)
-            new_snapshot: Dict with timestamp 'ts' and market values
-            max_entries: Maximum number of history entries to keep
-        """
-        if not new_snapshot or not any(v for k, v in new_snapshot.items() if k != "ts"):
-            return current_odds
-
-        history = list(current_odds.get("history", []))
-        history.append(new_snapshot)
-
-        # Trim to max_entries (keep most recent)
-        if len(history) > max_entries:
-            history = history[-max_entries:]
-
-        result = {k: v for k, v in current_odds.items() if k != "history"}
-        result["history"] = history
-        return result
-
-    def get_odds_history_from_row(self, row_idx: int) -> list[dict]:
-        """Get odds history from a match row's embedded odds JSON."""
+    def _row_history(self, row_idx: int) -> tuple[dict, list[dict]] | None:
+        """(odds dict, history) of buffer row *row_idx*, or None if out of range."""
         buf = self.ensure_buffer()
         if buf.empty or row_idx < 0 or row_idx >= len(buf):
-            return []
-
-        odds_json = buf.iloc[row_idx].get("odds")
-        odds_dict = self.deserialize_json(odds_json) if odds_json else {}
-        history = self._extract_history_from_odds(odds_dict)
+            return None
+        row = buf.iloc[row_idx]
+        key = self.history_key(row.get("home_team_name"), row.get("away_team_name"), row.get("datetime"))
+        return self._row_odds(row) or {}, self.odds_history(key)
 
-        # Convert embedded format to API format
-        return [{"timestamp": h.get("ts", ""), "odds": {k: v for k, v in h.items() if k != "ts"}} for h in history]
+    def get_odds_history_from_row(self, row_idx: int) -> list[dict]:
+        """Get the odds history of a buffer row from the odds_history table."""
+        found = self._row_history(row_idx)
+        if found is None:
+            return []
+        # Convert stored format to API format
+        return [{"timestamp": h.get("ts", ""), "odds": {k: v for k, v in h.items() if k != "ts"}} for h in found[1]]
 
-    def calculate_movement_from_odds(self, odds_dict: dict | None) -> dict:
-        """Calculate movement from embedded history in odds dict.
+    def calculate_movement_from_odds(self, odds_dict: dict | None, history: list[dict] | None = None) -> dict:
+        """Calculate movement of the current odds against the first history snapshot.
 
+        *history* normally comes from odds_history(); without it, history
+        embedded in *odds_dict* (older layout) is used.
         Returns dict with keys like 'home', 'draw', 'away', etc.
         Values are 'up', 'down', 'stable', or None if no data.
         """
         if not odds_dict:
             return {}
 
-        history = self._extract_history_from_odds(odds_dict)
+        if history is None:
+            history = self._extract_history_from_odds(odds_dict)
         current = self._get_current_odds_snapshot(odds_dict)
 
         if not history or not current:
@@ -564,17 +1539,18 @@ class MatchesManager(BufferedStorageManager):
 
         return movement
 
-    def calculate_movement_with_strength(self, odds_dict: dict | None) -> dict:
+    def calculate_movement_with_strength(self, odds_dict: dict | None, history: list[dict] | None = None) -> dict:
         """Calculate movement with strength metrics for significance filtering.
 
         Returns dict mapping market -> {direction, change_pct, significant}.
         A movement is significant if |change_pct| >= 5% relative change
         OR |absolute_change| >= 0.10 for low odds (< 2.0).
         Requires at least 2 history snapshots to be considered significant.
+        *history* as for calculate_movement_from_odds().
         """
         if not odds_dict:
             return {}
-        history = self._extract_history_from_odds(odds_dict)
+        history = self._extract_history_from_odds(odds_dict) if history is None else history
         current = self._get_current_odds_snapshot(odds_dict)
         if not history or not current:
             return {}
@@ -608,23 +1584,193 @@ class MatchesManager(BufferedStorageManager):
 
     def get_movement_for_row(self, row_idx: int) -> dict:
         """Get odds movement for a specific row index."""
-        buf = self.ensure_buffer()
-        if buf.empty or row_idx < 0 or row_idx >= len(buf):
+        found = self._row_history(row_idx)
+        if found is None:
             return {}
+        return self.calculate_movement_from_odds(*found)
+
+    def _fresh_join_keys(self, fresh_buf: pd.DataFrame) -> tuple[list, dict, dict]:
+        """(history key per row, result_url → position, history key → position) of a fresh buffer."""
+        fresh_keys = [
+            self.history_key(home, away, value)
+            for home, away, value in zip(
+                fresh_buf["home_team_name"], fresh_buf["away_team_name"], fresh_buf["datetime"], strict=True
+            )
+        ]
+        by_key: dict[str, int] = {}
+        for pos, key in enumerate(fresh_keys):
+            if key is not None:
+                by_key.setdefault(key, pos)
+        by_url: dict[str, int | None] = {}
+        if "result_url" in fresh_buf.columns:
+            for pos, url in enumerate(fresh_buf["result_url"]):
+                if not _is_empty(url):
+                    by_url[url] = None if url in by_url else pos  # shared URLs are no key
+        return fresh_keys, by_url, by_key
+
+    @staticmethod
+    def _read_fresh_matches(path: str) -> pd.DataFrame:
+        """The matches table of *path* (empty if it has none), read over a read-only connection."""
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        conn = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'matches'").fetchone() is None:
+                return pd.DataFrame()
+            return pd.read_sql("SELECT * FROM matches", conn)
+        finally:
+            conn.close()
+
+    def _fresh_finder(self, fresh_buf: pd.DataFrame) -> MatchesManager:
+        """An in-memory manager over *fresh_buf* for fuzzy _find() lookups, sharing this one's names."""
+        finder = MatchesManager(":memory:", self.similarity_engine._config if self.similarity_engine else None)
+        finder._adopt_team_names(self._team_names)  # same config → share the memoised names
+        finder._buffer = fresh_buf
+        return finder
 
-        odds_json = buf.iloc[row_idx].get("odds")
-        odds_dict = self.deserialize_json(odds_json) if odds_json else {}
-        return self.calculate_movement_from_odds(odds_dict)
+    @staticmethod
+    def _joined_position(match_data: dict, by_url: dict, by_key: dict) -> int | None:
+        """Fresh-buffer position of *match_data* joined on result_url, then history key."""
+        url = match_data.get("url")
+        pos = None if _is_empty(url) else by_url.get(url)
+        return by_key.get(match_data["key"]) if pos is None else pos
+
+    def _found_position(self, home: str, away: str, dt: datetime) -> int | None:
+        """Buffer position of the row _find() matches, or None."""
+        found, idx = self._find(home, away, dt)
+        return None if found is None or idx is None else self._buffer.index.get_loc(idx)
+
+    def _record_history_for_fresh_rows(self, fresh_buf: pd.DataFrame, future_matches: list[dict], timestamp: str) -> int:
+        """Record each future current match's odds under its fresh-DB row; returns matches recorded.
+
+        Rows are joined on ``result_url`` (when unique in the fresh DB), then
+        on history_key(); only matches left unmatched go through a fuzzy
+        _find() over *fresh_buf* (see _fresh_finder).
+        """
+        fresh_keys, by_url, by_key = self._fresh_join_keys(fresh_buf)
+
+        finder = None
+        transferred = joined = fuzzy = 0
+        with self.db_lock:
+            for match_data in future_matches:
+                try:
+                    fresh_idx = self._joined_position(match_data, by_url, by_key)
+                    if fresh_idx is not None:
+                        joined += 1
+                    else:
+                        if finder is None:
+                            finder = self._fresh_finder(fresh_buf)
+                        fresh_idx = finder._found_position(match_data["home"], match_data["away"], match_data["datetime"])
+                        if fresh_idx is None:
+                            continue
+                        fuzzy += 1
+                    fresh_key = fresh_keys[fresh_idx]
+                    if fresh_key is None:
+                        continue
+                    if match_data["key"] not in (None, fresh_key):
+                        self._rekey_history(match_data["key"], fresh_key)
+                    if self._insert_snapshot(fresh_key, timestamp, match_data["odds"]):
+                        transferred += 1
+                except Exception as exc:
+                    logger.error(f"History transfer error for {match_data.get('home')} vs {match_data.get('away')}: {exc}")
+            self.conn.commit()
+        if finder is not None:
+            finder.close()
+        logger.info(f"History join: {joined} matched on URL / key, {fuzzy} by fuzzy fallback")
+        return transferred
+
+    def _swap_in_matches(self, source_path: str) -> int:
+        """Replace the DB file with *source_path*'s matches plus this DB's odds_history.
+
+        The new file is built next to db_path by streaming both tables through
+        SQLite (nothing is loaded into pandas) and then atomically renamed over
+        db_path, so readers see either the old or the new DB, never an empty
+        one.  Returns the number of matches rows written.
+
+        Before the rename the connection checkpoints its WAL and switches to
+        journal_mode=DELETE, so no -wal / -shm file of the old DB is left to
+        be paired with the new one; this needs it to be the only connection
+        to db_path, and the swap is refused (RuntimeError, DB untouched)
+        while others are open.  Connections opened elsewhere before the swap
+        keep reading the replaced file until they reopen db_path.
+        """
+        tmp_path = f"{self.db_path}.merge-tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        staged = MatchesManager(tmp_path, columnar_odds=self._columnar_odds)
+        try:
+            with staged.db_lock:
+                staged.conn.execute("ATTACH DATABASE ? AS fresh", (source_path,))
+                staged.conn.execute("ATTACH DATABASE ? AS cur", (self.db_path,))
+                present = {r[1] for r in staged.conn.execute("PRAGMA fresh.table_info(matches)")}
+                columns = ", ".join(c for c in ("id", *_MATCH_COLUMNS) if c in present)
+                rows = staged.conn.execute(
+                    f"INSERT INTO main.matches ({columns}) SELECT {columns} FROM fresh.matches ORDER BY id"
+                ).rowcount
+                if staged._columnar_odds:
+                    staged._backfill_odds_columns(ODDS_PRICE_COLUMNS)
+                staged.conn.execute(
+                    "INSERT INTO main.odds_history (match_key, ts, market, value)"
+                    " SELECT match_key, ts, market, value FROM cur.odds_history"
+                )
+                staged.conn.commit()
+                staged.conn.execute("DETACH DATABASE fresh")
+                staged.conn.execute("DETACH DATABASE cur")
+        except Exception:
+            staged.close()
+            os.remove(tmp_path)
+            raise
+        staged.close()
 
-    def merge_with_history_preservation(self, fresh_db_path: str, max_history: int = 3, local_tz: str = "UTC") -> None:
+        # The connection must be closed before the rename (Windows keeps the file locked)
+        with self.db_lock:
+            try:
+                self._leave_wal()
+            except Exception:
+                os.remove(tmp_path)
+                raise
+            self.conn.close()
+            os.replace(tmp_path, self.db_path)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            apply_storage_profile(self.conn, self._storage_profile)
+        self._buffer = None
+        self._dirty = False
+        self._track_changes(None)
+        return rows
+
+    def _leave_wal(self) -> None:
+        """Fold the WAL into the DB file and switch to a rollback journal, removing -wal / -shm."""
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        try:
+            mode = self.conn.execute("PRAGMA journal_mode=DELETE").fetchone()[0]
+        except sqlite3.OperationalError as exc:
+            mode = str(exc)
+        if str(mode).lower() != "delete":
+            raise RuntimeError(f"Cannot swap {self.db_path} while other connections use its WAL ({mode})")
+
+    def merge_with_history_preservation(
+        self,
+        fresh_db_path: str,
+        history_days: float = ODDS_HISTORY_RETENTION_DAYS,
+        local_tz: str = "UTC",
+    ) -> None:
         """Merge fresh database while preserving odds history from current data.
 
         Flow:
         1. Load current matches and prune those with datetime < today (local_tz)
-        2. Load fresh database
-        3. For each remaining current match, fuzzy-match to fresh DB
-        4. On match: append current odds as history entry to fresh row
-        5. Replace current buffer with merged fresh data
+        2. Release the current buffer and read the fresh database over a
+           read-only connection (the downloaded file is left as it is)
+        3. Join each remaining current match to the fresh DB on result_url or
+           history_key(), fuzzy-matching only the ones left unmatched
+        4. On match: append current odds to odds_history under the fresh row's
+           key (re-keying earlier snapshots if the fresh row's names/date differ)
+        5. Drop history snapshots older than *history_days*
+        6. Atomically swap in a new DB file holding the fresh matches and the
+           history (see _swap_in_matches); the buffer reloads lazily, other
+           connections to the DB must be reopened to see the new file
+
+        At most one matches buffer is held in memory at a time.
         """
         from zoneinfo import ZoneInfo
 
@@ -649,14 +1795,16 @@ class MatchesManager(BufferedStorageManager):
                     # Make timezone-aware for comparison
                     if match_dt.tzinfo is None:
                         match_dt = match_dt.replace(tzinfo=tz)
-                    if match_dt >= today_start:
-                        odds_dict = self.deserialize_json(row.get("odds")) if row.get("odds") else {}
+                    if match_dt >= today_start and row.get("odds"):  # without odds there is no snapshot to record
+                        odds_dict = self.deserialize_json(row.get("odds"))
                         future_matches.append(
                             {
                                 "home": row["home_team_name"],
                                 "away": row["away_team_name"],
                                 "datetime": match_dt,
                                 "odds": odds_dict,
+                                "url": row.get("result_url"),
+                                "key": self.history_key(row["home_team_name"], row["away_team_name"], match_dt_str),
                             }
                         )
                 except Exception as exc:
@@ -664,13 +1812,17 @@ class MatchesManager(BufferedStorageManager):
 
         logger.info(f"Found {len(future_matches)} future matches with potential history to preserve")
 
-        # Load fresh database into a temporary manager
-        import os
+        # Only the fresh buffer is needed from here on
+        self.flush()
+        self._buffer = None
+        self._track_changes(None)
+        self._sync_indexes(None)
+        del current_buf
 
+        # Read the fresh database without opening it as a store (no tables or indexes added to it)
         fresh_file_size = os.path.getsize(fresh_db_path) if os.path.exists(fresh_db_path) else -1
         logger.info(f"Loading fresh DB from {fresh_db_path} (size: {fresh_file_size} bytes)")
-        fresh_manager = MatchesManager(fresh_db_path, self.similarity_engine._config if self.similarity_engine else None)
-        fresh_buf = fresh_manager.ensure_buffer()
+        fresh_buf = self._read_fresh_matches(fresh_db_path)
         logger.info(
             f"Fresh buffer: {len(fresh_buf)} rows, columns: {list(fresh_buf.columns) if not fresh_buf.empty else 'N/A'}"
         )
@@ -679,63 +1831,11 @@ class MatchesManager(BufferedStorageManager):
             logger.warning("Fresh database is empty, nothing to merge")
             return
 
-        # For each future match from current DB, try to find it in fresh DB and transfer history
-        transferred = 0
-        for match_data in future_matches:
-            try:
-                if not match_data["odds"]:
-                    continue
-
-                # Use fuzzy matching to find corresponding row in fresh DB
-                found, fresh_idx = fresh_manager._find(match_data["home"], match_data["away"], match_data["datetime"])
-
-                if found is not None and fresh_idx is not None:
-                    # Create snapshot from current odds
-                    snapshot = {"ts": timestamp}
-                    current_odds = self._get_current_odds_snapshot(match_data["odds"])
-                    snapshot.update(current_odds)
-
-                    # Get fresh row's odds and append history
-                    fresh_odds_json = fresh_buf.at[fresh_idx, "odds"]
-                    fresh_odds = (
-                        fresh_manager.deserialize_json(fresh_odds_json)
-                        if (fresh_odds_json and not pd.isna(fresh_odds_json))
-                        else {}
-                    )
-                    fresh_odds = fresh_odds or {}
-
-                    # Preserve existing history from current match
-                    existing_history = self._extract_history_from_odds(match_data["odds"])
+        transferred = self._record_history_for_fresh_rows(fresh_buf, future_matches, timestamp)
+        pruned = self.prune_odds_history((now_local - timedelta(days=history_days)).isoformat())
+        logger.info(f"Recorded odds history for {transferred} matches ({pruned} expired snapshot rows pruned)")
 
-                    # Merge histories: existing + new snapshot
-                    combined_odds = dict(fresh_odds)
-                    combined_odds["history"] = existing_history
-
-                    # Append current snapshot
-                    combined_odds = self._append_to_history(combined_odds, snapshot, max_history)
-
-                    # Update fresh buffer
-                    fresh_buf.at[fresh_idx, "odds"] = fresh_manager.serialize_json(combined_odds)
-                    fresh_manager._dirty = True
-                    transferred += 1
-            except Exception as exc:
-                logger.error(f"History transfer error for {match_data.get('home')} vs {match_data.get('away')}: {exc}")
-
-        logger.info(f"Transferred odds history to {transferred} matches in fresh database")
-
-        # Transfer data via buffer to avoid file locking issues (WinError 32)
-        # Capture the merged fresh buffer before closing anything
-        merged_buffer = fresh_buf.copy()
-        logger.info(f"Captured {len(merged_buffer)} rows from fresh database into memory")
-
-        # Close fresh manager to release file lock
-        fresh_manager.close()
-        del fresh_manager
-
-        # Clear our database and replace with merged data
-        self.reset_matches_db()
-        self._buffer = merged_buffer.reset_index(drop=True)
-        self._dirty = True
-        self.flush()
+        del fresh_buf
 
-        logger.info(f"Database merge complete: {len(self._buffer)} rows written to {self.db_path}")
+        rows = self._swap_in_matches(fresh_db_path)
+        logger.info(f"Database merge complete: {rows} rows written to {self.db_path}")
@@ -0,0 +1,230 @@
+"""
+TeamRegistry — cross-run team-name knowledge for the matches merge.
+═══════════════════════════════════════════════════════════════════
+
+The matches DB is rebuilt on every run; what the merge learns about team
+names is kept here instead, in a small SQLite file of its own:
+
+  teams / team_aliases — the alias registry: lower-cased team name → canonical
+                         team.  Filled whenever a fuzzy match is accepted, so
+                         later runs resolve known spellings without scoring.
+                         Wrong aliases are corrected with set_alias() /
+                         unlink_alias() (``--mode team-aliases``); an unlinked
+                         alias is kept as a blocked row and never re-learned.
+  near_miss_candidates — normalised team-name pairs that scored just below
+                         the similarity threshold, counted per run.  Pairs
+                         that keep recurring are proposed as ``synonyms``
+                         entries for similarity_config.yaml
+                         (``--mode suggest-synonyms``).
+
+Aliases are stored lower-cased, the form of MatchesManager's exact keys;
+near-miss names are stored normalised (TeamNameTable), so spellings that
+normalise identically share one entry.
+
+Public surface
+──────────────
+  TeamAlias, SynonymSuggestion                               (NamedTuple)
+  TeamRegistry(db_path)
+    alias_map()                                              → {alias: canonical}
+    blocked_aliases()                                        → set of aliases
+    add_aliases(pairs, seen_at, source)                      → aliases stored
+    set_alias(alias, canonical, seen_at)                     manual correction
+    unlink_alias(alias, seen_at)                             → whether it was linked
+    aliases(canonical)                                       → list[TeamAlias]
+    record_near_misses(pairs, seen_at)                       → pairs stored
+    synonym_suggestions(min_runs, min_score, known)          → list[SynonymSuggestion]
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from scrape_kit import BaseStorageManager, get_logger
+
+logger = get_logger(__name__)
+
+
+class TeamAlias(NamedTuple):
+    alias: str
+    canonical: str | None  # None: blocked
+    source: str  # "fuzzy", "manual" or "blocked"
+    created_at: str | None
+
+
+class SynonymSuggestion(NamedTuple):
+    name: str  # proposed synonyms key
+    canonical: str  # proposed synonyms value
+    runs: int
+    hits: int
+    best_score: float
+
+
+class TeamRegistry(BaseStorageManager):
+    """SQLite store of team-name knowledge that persists across merge runs."""
+
+    def _create_tables(self) -> None:
+        with self.db_lock:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS teams (
+                    team_id   INTEGER PRIMARY KEY AUTOINCREMENT,
+                    canonical TEXT NOT NULL UNIQUE
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS team_aliases (
+                    alias      TEXT PRIMARY KEY,
+                    team_id    INTEGER REFERENCES teams(team_id),
+                    source     TEXT NOT NULL,
+                    created_at TEXT
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS near_miss_candidates (
+                    name_a     TEXT NOT NULL,
+                    name_b     TEXT NOT NULL,
+                    runs       INTEGER NOT NULL,
+                    hits       INTEGER NOT NULL,
+                    best_score REAL NOT NULL,
+                    first_seen TEXT,
+                    last_seen  TEXT,
+                    PRIMARY KEY (name_a, name_b)
+                )
+            """)
+            self.conn.commit()
+
+    # ── Alias registry ────────────────────────────────────────────────────────
+
+    def alias_map(self) -> dict[str, str]:
+        """Every linked alias with the canonical name of its team."""
+        rows = self.fetch_rows("SELECT a.alias, t.canonical FROM team_aliases a JOIN teams t ON t.team_id = a.team_id")
+        return dict(rows)
+
+    def blocked_aliases(self) -> set[str]:
+        """Aliases unlinked by hand; the merge never links them again."""
+        return {r[0] for r in self.fetch_rows("SELECT alias FROM team_aliases WHERE team_id IS NULL")}
+
+    def _team_id(self, canonical: str) -> int:
+        """Id of the team named *canonical* (resolved through its alias, if it is one), created if new."""
+        row = self.conn.execute("SELECT team_id FROM team_aliases WHERE alias = ? AND team_id IS NOT NULL", (canonical,))
+        found = row.fetchone() or self.conn.execute("SELECT team_id FROM teams WHERE canonical = ?", (canonical,)).fetchone()
+        if found:
+            return found[0]
+        return self.conn.execute("INSERT INTO teams (canonical) VALUES (?)", (canonical,)).lastrowid
+
+    def add_aliases(self, pairs: Iterable[tuple[str, str]], seen_at: str, source: str = "fuzzy") -> int:
+        """Link each (alias, canonical) pair; aliases already present (linked or blocked) are kept.
+
+        Returns the number of aliases added.
+        """
+        added = 0
+        with self.db_lock:
+            for alias, canonical in pairs:
+                if alias == canonical:
+                    continue
+                added += self.conn.execute(
+                    "INSERT OR IGNORE INTO team_aliases (alias, team_id, source, created_at) VALUES (?, ?, ?, ?)",
+                    (alias, self._team_id(canonical), source, seen_at),
+                ).rowcount
+            self.conn.commit()
+        return added
+
+    def set_alias(self, alias: str, canonical: str, seen_at: str) -> None:
+        """Link *alias* to *canonical*'s team, replacing a wrong or blocked link.
+
+        Setting a name as its own canonical just removes its entry.
+        """
+        with self.db_lock:
+            if alias == canonical:
+                self.conn.execute("DELETE FROM team_aliases WHERE alias = ?", (alias,))
+            else:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO team_aliases (alias, team_id, source, created_at) VALUES (?, ?, 'manual', ?)",
+                    (alias, self._team_id(canonical), seen_at),
+                )
+            self.conn.commit()
+
+    def unlink_alias(self, alias: str, seen_at: str) -> bool:
+        """Drop a wrong link and block *alias* from being learned again; returns whether it was linked."""
+        with self.db_lock:
+            linked = self.conn.execute(
+                "SELECT 1 FROM team_aliases WHERE alias = ? AND team_id IS NOT NULL", (alias,)
+            ).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO team_aliases (alias, team_id, source, created_at) VALUES (?, NULL, 'blocked', ?)",
+                (alias, seen_at),
+            )
+            self.conn.commit()
+        return linked is not None
+
+    def aliases(self, canonical: str | None = None) -> list[TeamAlias]:
+        """Registry entries ordered by canonical name, optionally only those of one team."""
+        query = (
+            "SELECT a.alias, t.canonical, a.source, a.created_at FROM team_aliases a"
+            " LEFT JOIN teams t ON t.team_id = a.team_id"
+        )
+        params: tuple = ()
+        if canonical is not None:
+            query += " WHERE t.canonical = ?"
+            params = (canonical,)
+        rows = self.fetch_rows(query + " ORDER BY t.canonical, a.alias", params)
+        return [TeamAlias(*row) for row in rows]
+
+    # ── Near-miss candidates ──────────────────────────────────────────────────
+
+    def record_near_misses(self, pairs: Iterable[tuple[str, str, float]], seen_at: str) -> int:
+        """Fold one run's near-miss (name, name, score) pairs into the table.
+
+        Names are stored as an ordered pair so "a"/"b" and "b"/"a" count
+        together; ``runs`` goes up once per call, ``hits`` per occurrence.
+        Returns the number of distinct pairs recorded.
+        """
+        run: dict[tuple[str, str], list] = {}
+        for a, b, score in pairs:
+            if a == b:
+                continue
+            key = (a, b) if a < b else (b, a)
+            agg = run.setdefault(key, [0, score])
+            agg[0] += 1
+            agg[1] = max(agg[1], score)
+        with self.db_lock:
+            self.conn.executemany(
+                """
+                INSERT INTO near_miss_candidates (name_a, name_b, runs, hits, best_score, first_seen, last_seen)
+                VALUES (?, ?, 1, ?, ?, ?, ?)
+                ON CONFLICT (name_a, name_b) DO UPDATE SET
+                    runs       = runs + 1,
+                    hits       = hits + excluded.hits,
+                    best_score = max(best_score, excluded.best_score),
+                    last_seen  = excluded.last_seen
+                """,
+                [(a, b, hits, best, seen_at, seen_at) for (a, b), (hits, best) in run.items()],
+            )
+            self.conn.commit()
+        return len(run)
+
+    def synonym_suggestions(
+        self,
+        min_runs: int = 3,
+        min_score: float = 50.0,
+        known: dict[str, str] | None = None,
+    ) -> list[SynonymSuggestion]:
+        """Recurring near-miss pairs as proposed ``synonyms`` entries, most frequent first.
+
+        The longer name of a pair is taken as the canonical one ("man utd" →
+        "manchester united").  Pairs already covered by *known* synonyms are
+        skipped.
+        """
+        known = known or {}
+        rows = self.fetch_rows(
+            "SELECT name_a, name_b, runs, hits, best_score FROM near_miss_candidates"
+            " WHERE runs >= ? AND best_score >= ? ORDER BY runs DESC, best_score DESC, name_a, name_b",
+            (min_runs, min_score),
+        )
+        suggestions = []
+        for name_a, name_b, runs, hits, best_score in rows:
+            name, canonical = (name_a, name_b) if len(name_b) > len(name_a) else (name_b, name_a)
+            if name in known or known.get(canonical) == name:
+                continue
+            suggestions.append(SynonymSuggestion(name, canonical, runs, hits, best_score))
+        return suggestions
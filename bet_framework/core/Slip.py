@@ -207,6 +207,11 @@ class BetSlipConfig:
     │ balance_decay         ["linear", "gaussian"] Decay function for balance. │
     │ min_pick_quality      [0.0–1.00] Minimum quality score to accept a pick. │
     │                              None = auto (0.20).                         │
+    ├─ LEG SELECTION ──────────────────────────────────────────────────────────┤
+    │ optimizer          ["greedy", "dp"] greedy = best leg per round;         │
+    │                              dp = best slip over log-odds buckets.       │
+    │ optimizer_budget_ms[5–1000]  Time budget of the dp search.               │
+    │                              None = auto (25).                           │
     └──────────────────────────────────────────────────────────────────────────┘
     """
 
@@ -250,6 +255,10 @@ class BetSlipConfig:
     odds_movement_weight: float | None = None  # 0.0–0.30, None = auto (0.05)
     odds_movement_strength_min: float | None = None  # 0.05–0.20, None = auto (0.05)
 
+    # Leg selection
+    optimizer: str = "greedy"  # "greedy" | "dp", anything else = greedy
+    optimizer_budget_ms: float | None = None  # 5–1000, None = auto (25)
+
     def __post_init__(self) -> None:
         self.target_odds = max(1.10, min(1000.0, self.target_odds))
         self.target_legs = max(1, min(100, self.target_legs))
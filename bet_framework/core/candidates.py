@@ -0,0 +1,179 @@
+"""
+bet_framework.core.candidates
+─────────────────────────────
+Long-format (match × market) view of a loaded match frame.
+
+CandidateTable flattens the cons_* / odds_* columns of every match into one
+row per (match, market) cell, in frame order then market order.  It is
+built once per loaded frame; each BetSlipConfig filter (dates, leagues,
+markets, consensus floor, min / max odds, source edge, exclusions) is then a
+boolean mask over those arrays, and only the surviving cells are turned
+into CandidateLeg objects by the caller.  Odds movement per cell is worked
+out at build time too, so the arrays can go straight into
+score_pick_arrays.
+
+Public surface
+──────────────
+  CandidateTable
+    from_frame(df, market_map, raw_odds, movement, histories)   (df with float64 cons / odds)
+    select(cfg, excluded, history)                      → (cell indices, adjusted consensus)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Container
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from bet_framework.core.scoring import (
+    adjusted_consensus,
+    movement_factor,
+    resolve_max_single_leg_odds,
+    resolve_min_source_edge,
+    resolve_shrinkage_k,
+)
+from bet_framework.core.utils import is_valid_url
+
+if TYPE_CHECKING:
+    from bet_framework.core.Slip import BetSlipConfig
+
+
+@dataclass(frozen=True)
+class CandidateTable:
+    """Every (match, market) cell of a match frame as flat arrays."""
+
+    # Per cell
+    match_pos: np.ndarray  # row position of the match in the frame
+    market: np.ndarray  # index into markets
+    consensus: np.ndarray
+    odds: np.ndarray
+    sources: np.ndarray
+    movement_factors: np.ndarray  # movement_factor(direction); NaN = no adjustment
+    movement_strength: np.ndarray
+    directions: dict[int, str]  # cell → odds movement direction, when there is one
+    # Per market: (market_type, odds_col, label)
+    markets: list[tuple[Any, str, Any]]
+    # Per match
+    datetimes: pd.Series  # for the date masks
+    kickoffs: list  # the same values as Python objects, for the legs
+    urls: list
+    valid_url: np.ndarray
+    leagues: list[str | None]  # NaN → None
+    match_names: list[str]
+    match_keys: np.ndarray  # one code per distinct match_name (one leg per match in a slip)
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        market_map: dict[Any, list[tuple[str, str, Any]]],
+        raw_odds: list[dict | None] | None = None,
+        movement: Callable[[dict | None, list[dict], str], tuple[str | None, float]] | None = None,
+        histories: list[list[dict]] | None = None,
+    ) -> CandidateTable:
+        """
+        *raw_odds* are the odds dicts per frame row and *histories* their odds
+        history snapshots (oldest first); *movement(odds, history, key)* gives
+        (direction, strength) for one market key of one row.
+        """
+        cells = [
+            (m_type, cons_col, odds_col, label) for m_type, cols in market_map.items() for cons_col, odds_col, label in cols
+        ]
+        n, width = len(df), len(cells)
+
+        def grid(col_index: int) -> np.ndarray:
+            # n × width, flattened row-major: match by match, markets in map order
+            columns = [
+                df[cell[col_index]].to_numpy(dtype=np.float64) if cell[col_index] in df.columns else np.zeros(n)
+                for cell in cells
+            ]
+            return np.column_stack(columns).reshape(n * width)
+
+        factors = np.full(n * width, np.nan)
+        strength = np.zeros(n * width)
+        directions: dict[int, str] = {}
+        if movement is not None:
+            for pos, (odds, history) in enumerate(zip(raw_odds or [], histories or [], strict=False)):
+                if not (isinstance(odds, dict) and history):
+                    continue  # nothing moved without an odds history
+                for m, (_, _, odds_col, _) in enumerate(cells):
+                    direction, change = movement(odds, history, odds_col.replace("odds_", ""))
+                    if direction is not None:
+                        cell = pos * width + m
+                        directions[cell] = direction
+                        factors[cell] = movement_factor(direction)
+                        strength[cell] = change
+
+        urls = df["result_url"].tolist() if "result_url" in df.columns else [None] * n
+        leagues = df["league"].tolist() if "league" in df.columns else [None] * n
+        match_names = [f"{h} vs {a}" for h, a in zip(df["home"].tolist(), df["away"].tolist(), strict=True)]
+        return cls(
+            match_pos=np.repeat(np.arange(n), width),
+            market=np.tile(np.arange(width), n),
+            consensus=grid(1),
+            odds=grid(2),
+            sources=np.repeat(df["sources"].to_numpy(dtype=np.int64), width),
+            movement_factors=factors,
+            movement_strength=strength,
+            directions=directions,
+            markets=[(m_type, odds_col, label) for m_type, _, odds_col, label in cells],
+            datetimes=df["datetime"].reset_index(drop=True),
+            kickoffs=df["datetime"].tolist(),
+            urls=urls,
+            valid_url=np.fromiter((is_valid_url(u) for u in urls), dtype=bool, count=n),
+            leagues=[None if pd.isna(lg) else lg for lg in leagues],
+            match_names=match_names,
+            match_keys=pd.factorize(pd.Series(match_names, dtype=object))[0],
+        )
+
+    def __len__(self) -> int:
+        return len(self.match_pos)
+
+    def _match_mask(self, cfg: BetSlipConfig, excluded: Container, history: Container | None) -> np.ndarray:
+        keep = self.valid_url.copy()
+        if cfg.date_from:
+            keep &= ~(self.datetimes < pd.to_datetime(cfg.date_from)).to_numpy(dtype=bool)
+        if cfg.date_to:
+            keep &= ~(self.datetimes >= pd.to_datetime(cfg.date_to) + pd.Timedelta(days=1)).to_numpy(dtype=bool)
+        if cfg.included_leagues:
+            included = cfg.included_leagues
+            keep &= np.fromiter((lg is not None and lg in included for lg in self.leagues), dtype=bool, count=len(keep))
+        if excluded or history is not None:
+            blocked = (
+                i
+                for i, url in enumerate(self.urls)
+                if keep[i] and (url in excluded or (history is not None and url in history))
+            )
+            keep[list(blocked)] = False
+        return keep
+
+    def select(
+        self,
+        cfg: BetSlipConfig,
+        excluded: Container = frozenset(),
+        history: Container | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Cells passing *cfg*'s filters, in frame / market order, with their
+        source-adjusted consensus.
+
+        *excluded* and *history* are result_url containers (cfg.excluded_urls
+        as a set, the slip history's ExclusionSet); a match whose URL is in
+        either is dropped.
+        """
+        keep = self._match_mask(cfg, excluded, history)[self.match_pos]
+        if cfg.included_markets:
+            markets = cfg.included_markets
+            keep &= np.array([label in markets for _, _, label in self.markets], dtype=bool)[self.market]
+        keep &= (self.consensus >= cfg.consensus_floor) & (self.odds >= cfg.min_odds)
+        keep &= ~(self.odds > resolve_max_single_leg_odds(cfg))
+
+        idx = np.flatnonzero(keep)
+        # Shrinkage BEFORE the edge check
+        adj_cons = adjusted_consensus(self.consensus[idx], self.sources[idx], resolve_shrinkage_k(cfg))
+        source_edge = (adj_cons / 100.0) - 1.0 / self.odds[idx]
+        passed = ~(source_edge < resolve_min_source_edge(cfg))
+        return idx[passed], adj_cons[passed]
@@ -6,14 +6,43 @@ percentages across result, over/under, and BTTS markets.
 
 No state, no database, no configuration.
 
+batch_consensus computes the same percentages for many matches at once from
+flat score arrays (one entry per predicted score, grouped by match).
+
 Public surface
 ──────────────
-  to_pct(n, total)       → float
-  calc_consensus(scores) → dict
+  CONSENSUS_KEYS
+  to_pct(n, total)                     → float
+  calc_consensus(scores)               → dict
+  batch_consensus(home, away, counts)  → {(market, side): ndarray}
 """
 
 from __future__ import annotations
 
+import numpy as np
+
+# (market, side) of every percentage calc_consensus returns, in its order
+CONSENSUS_KEYS: tuple[tuple[str, str], ...] = (
+    ("result", "home"),
+    ("result", "draw"),
+    ("result", "away"),
+    ("over_under_25", "over"),
+    ("over_under_25", "under"),
+    ("over_under_15", "over"),
+    ("over_under_15", "under"),
+    ("over_under_05", "over"),
+    ("over_under_05", "under"),
+    ("over_under_35", "over"),
+    ("over_under_35", "under"),
+    ("over_under_45", "over"),
+    ("over_under_45", "under"),
+    ("btts", "yes"),
+    ("btts", "no"),
+    ("double_chance", "1x"),
+    ("double_chance", "12"),
+    ("double_chance", "x2"),
+)
+
 
 def to_pct(n: int, total: int) -> float:
     """Convert a count *n* to a percentage of *total*, rounded to 1 d.p.
@@ -161,3 +190,50 @@ def calc_consensus(scores: list) -> dict[str, dict[str, float]]:
             "x2": to_pct(dc_x2, total),
         },
     }
+
+
+def batch_consensus(home: np.ndarray, away: np.ndarray, counts: np.ndarray) -> dict[tuple[str, str], np.ndarray]:
+    """
+    calc_consensus for many matches in one pass.
+
+    *home* / *away* hold every predicted score of every match back to back
+    (None already mapped to 0); *counts* holds how many belong to each match.
+    Each market is a boolean mask over the flat scores, summed per match;
+    percentages go through to_pct so they round exactly as calc_consensus
+    does.  NaN goals compare like they do in the scalar loop (a draw that is
+    under every line and not BTTS, but counted in 12).
+
+    >>> out = batch_consensus(np.array([2.0, 0.0, 1.0]), np.array([1.0, 0.0, 1.0]), np.array([2, 1, 0]))
+    >>> out[("result", "home")].tolist(), out[("result", "draw")].tolist()
+    ([50.0, 0.0, 0.0], [50.0, 100.0, 0.0])
+    """
+    home = np.asarray(home, dtype=np.float64)
+    away = np.asarray(away, dtype=np.float64)
+    counts = np.asarray(counts, dtype=np.int64)
+    n_matches = len(counts)
+    segment = np.repeat(np.arange(n_matches), counts)
+    goals = home + away
+    btts = (home > 0) & (away > 0)
+    masks = {
+        ("result", "home"): home > away,
+        ("result", "draw"): ~(home > away) & ~(home < away),
+        ("result", "away"): home < away,
+        ("btts", "yes"): btts,
+        ("btts", "no"): ~btts,
+        ("double_chance", "1x"): home >= away,
+        ("double_chance", "12"): home != away,
+        ("double_chance", "x2"): away >= home,
+    }
+    for line in ("05", "15", "25", "35", "45"):
+        over = goals > int(line) / 10
+        masks[(f"over_under_{line}", "over")] = over
+        masks[(f"over_under_{line}", "under")] = ~over
+
+    # Hit counts are small integers; a table of to_pct over the distinct
+    # (hits, total) pairs keeps the rounding identical to the scalar path.
+    width = int(counts.max(initial=0)) + 1
+    hits = {key: np.bincount(segment, weights=masks[key], minlength=n_matches).astype(np.int64) for key in CONSENSUS_KEYS}
+    pairs, inverse = np.unique(np.stack(list(hits.values())) * width + counts, return_inverse=True)
+    table = np.array([to_pct(int(p) // width, int(p) % width) for p in pairs], dtype=np.float64)
+    pct = table[inverse.reshape(len(CONSENSUS_KEYS), n_matches)]
+    return {key: pct[i] for i, key in enumerate(CONSENSUS_KEYS)}
@@ -0,0 +1,120 @@
+"""
+bet_framework.core.exclusions
+─────────────────────────────
+In-memory view of the result_urls that new slips must not reuse.
+
+The rule is the one BetAssistant.get_excluded_urls always applied:
+
+  • a Won / Lost / Live leg excludes its URL forever
+  • a Pending leg excludes its URL while its slip has no Lost leg
+
+ExclusionSet keeps, per URL, the number of legs that currently exclude it,
+so a membership test is a dict lookup.  Leg changes are applied one at a
+time; only the legs of the affected slip are re-counted (a slip flipping to
+lost releases its pending URLs).
+
+Public surface
+──────────────
+  EXCLUDING_STATUSES
+  ExclusionSet
+    from_rows(rows)                               ← (leg_id, slip_id, result_url, status) rows
+    add_leg(leg_id, slip_id, url, status)
+    set_status(leg_id, status)
+    remove_slip(slip_id)
+    url in exclusions / urls() / len(exclusions)
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any
+
+# Leg statuses that exclude their URL regardless of the rest of the slip
+EXCLUDING_STATUSES = frozenset({"Won", "Lost", "Live"})
+_PENDING = "Pending"
+_LOST = "Lost"
+
+
+def _status_str(status: Any) -> str | None:
+    # Outcome is a str Enum whose hash differs from its value's
+    return getattr(status, "value", status)
+
+
+class ExclusionSet:
+    """Reference-counted set of excluded result_urls, maintained per leg."""
+
+    def __init__(self) -> None:
+        self._legs: dict[int, tuple[int, str | None, str | None]] = {}  # leg_id → (slip_id, url, status)
+        self._slip_legs: dict[int, set[int]] = {}
+        self._lost: Counter[int] = Counter()  # slip_id → Lost legs
+        self._refs: Counter[str] = Counter()  # url → legs excluding it
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any]) -> ExclusionSet:
+        """Build from ``(leg_id, slip_id, result_url, status)`` rows of the legs table."""
+        exclusions = cls()
+        for leg_id, slip_id, url, status in rows:
+            exclusions.add_leg(leg_id, slip_id, url, status)
+        return exclusions
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._refs
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def urls(self) -> list[str]:
+        return list(self._refs)
+
+    # ── Updates ───────────────────────────────────────────────────────────────
+
+    def add_leg(self, leg_id: int, slip_id: int, url: str | None, status: Any = _PENDING) -> None:
+        status = _status_str(status)
+        self._retract_slip(slip_id)
+        self._legs[leg_id] = (slip_id, url, status)
+        self._slip_legs.setdefault(slip_id, set()).add(leg_id)
+        if status == _LOST:
+            self._lost[slip_id] += 1
+        self._apply_slip(slip_id)
+
+    def set_status(self, leg_id: int, status: Any) -> None:
+        """Record a new status for *leg_id*; unknown legs are ignored."""
+        if leg_id not in self._legs:
+            return
+        status = _status_str(status)
+        slip_id, url, old = self._legs[leg_id]
+        if old == status:
+            return
+        self._retract_slip(slip_id)
+        self._legs[leg_id] = (slip_id, url, status)
+        self._lost[slip_id] += (status == _LOST) - (old == _LOST)
+        self._apply_slip(slip_id)
+
+    def remove_slip(self, slip_id: int) -> None:
+        self._retract_slip(slip_id)
+        for leg_id in self._slip_legs.pop(slip_id, ()):
+            del self._legs[leg_id]
+        self._lost.pop(slip_id, None)
+
+    # ── Counting ──────────────────────────────────────────────────────────────
+
+    def _excluding_urls(self, slip_id: int) -> list[str]:
+        slip_alive = not self._lost[slip_id]
+        urls = []
+        for leg_id in self._slip_legs.get(slip_id, ()):
+            _, url, status = self._legs[leg_id]
+            if url is not None and (status in EXCLUDING_STATUSES or (status == _PENDING and slip_alive)):
+                urls.append(url)
+        return urls
+
+    def _retract_slip(self, slip_id: int) -> None:
+        for url in self._excluding_urls(slip_id):
+            self._refs[url] -= 1
+            if not self._refs[url]:
+                del self._refs[url]
+
+    def _apply_slip(self, slip_id: int) -> None:
+        self._refs.update(self._excluding_urls(slip_id))
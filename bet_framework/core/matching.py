@@ -0,0 +1,223 @@
+"""
+bet_framework.core.matching
+────────────────────────────
+Batched fuzzy scoring of one incoming fixture against a block of candidate
+fixtures (typically the ±1 day window of the matches buffer).
+
+The pair scorer itself (SimilarityEngine.is_similar) stays opaque; this
+module only decides *which* pairs need scoring, scores each distinct name
+pair once, and turns the scores into accept / near-miss decisions with
+array operations.  Decisions are identical to scoring candidate rows one by
+one:
+
+  • a candidate is accepted when both home and away pass the engine
+    threshold; the best accepted candidate has the highest average score
+    (first one wins ties)
+  • away names are only scored where the home passed or scored ≥ 30
+  • a rejected candidate whose average lies in [40, 65) is a near miss
+
+No database, no configuration.
+
+Public surface
+──────────────
+  HOME_PREFILTER, NEAR_MISS_LOW, NEAR_MISS_HIGH
+  BlockScore                                               (NamedTuple)
+  score_block(is_similar, home, away, homes, aways)        → BlockScore
+  PairScoreCache(is_similar, maxsize)                      memoised pair scorer
+  candidate_pairs(is_similar, incoming, candidates)        → dict of pair scores
+  NearMissTracker(limit)                                   bounded top-K of near misses
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any, NamedTuple
+
+import numpy as np
+
+# Home score from which a rejected candidate is still scored on away names
+HOME_PREFILTER = 30
+# Average-score band reported as a near miss (synonym discovery)
+NEAR_MISS_LOW = 40
+NEAR_MISS_HIGH = 65
+
+PairScorer = Callable[[str, str], tuple[bool, float]]
+
+
+class BlockScore(NamedTuple):
+    best: int | None  # block position of the best accepted candidate
+    best_score: float
+    near_misses: list[tuple[int, float]]  # (block position, average score), block order
+
+
+def _score_names(is_similar: PairScorer, names: Sequence[str], target: str) -> tuple[np.ndarray, np.ndarray]:
+    """Score every name against *target*, calling the scorer once per distinct name."""
+    seen: dict[str, tuple[bool, float]] = {}
+    ok = np.zeros(len(names), dtype=bool)
+    scores = np.zeros(len(names), dtype=float)
+    for i, name in enumerate(names):
+        res = seen.get(name)
+        if res is None:
+            res = seen[name] = is_similar(name, target)
+        ok[i], scores[i] = res
+    return ok, scores
+
+
+def score_block(
+    is_similar: PairScorer,
+    home: str,
+    away: str,
+    homes: Sequence[str],
+    aways: Sequence[str],
+) -> BlockScore:
+    """Score *home* vs *away* against each (homes[i], aways[i]) candidate of a block."""
+    if not homes:
+        return BlockScore(None, -1.0, [])
+
+    ok_h, sc_h = _score_names(is_similar, homes, home)
+    need_away = ok_h | (sc_h >= HOME_PREFILTER)
+
+    ok_a = np.zeros(len(aways), dtype=bool)
+    sc_a = np.zeros(len(aways), dtype=float)
+    idx = np.flatnonzero(need_away)
+    if idx.size:
+        ok_a[idx], sc_a[idx] = _score_names(is_similar, [aways[i] for i in idx], away)
+
+    combined = (sc_h + sc_a) / 2
+    accepted = ok_h & ok_a
+    near = need_away & ~accepted & (combined >= NEAR_MISS_LOW) & (combined < NEAR_MISS_HIGH)
+    near_misses = [(int(i), float(combined[i])) for i in np.flatnonzero(near)]
+
+    if not accepted.any():
+        return BlockScore(None, -1.0, near_misses)
+    best = int(np.argmax(np.where(accepted, combined, -np.inf)))
+    return BlockScore(best, float(combined[best]), near_misses)
+
+
+class PairScoreCache:
+    """Bounded LRU memo in front of a pair scorer such as SimilarityEngine.is_similar.
+
+    The same (candidate, incoming) name pairs recur across the rows of a
+    merge — every source spelling of a fixture is scored against the same
+    date block — so remembering scores saves most repeat engine calls.
+    """
+
+    def __init__(self, is_similar: PairScorer, maxsize: int = 200_000) -> None:
+        self._score = is_similar
+        self._maxsize = maxsize
+        self._memo: OrderedDict[tuple[str, str], tuple[bool, float]] = OrderedDict()
+        self._pinned: dict[tuple[str, str], tuple[bool, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def preload(self, scores: dict[tuple[str, str], tuple[bool, float]]) -> None:
+        """Pin precomputed scores (outside the LRU bound) until release() is called."""
+        self._pinned.update(scores)
+
+    def release(self) -> None:
+        """Drop pinned scores, keeping the bounded LRU memo."""
+        self._pinned.clear()
+
+    def is_similar(self, a: str, b: str) -> tuple[bool, float]:
+        key = (a, b)
+        res = self._pinned.get(key)
+        if res is not None:
+            self.hits += 1
+            return res
+        res = self._memo.get(key)
+        if res is not None:
+            self.hits += 1
+            self._memo.move_to_end(key)
+            return res
+        self.misses += 1
+        res = self._memo[key] = self._score(a, b)
+        if len(self._memo) > self._maxsize:
+            self._memo.popitem(last=False)
+        return res
+
+    def clear(self) -> None:
+        self._memo.clear()
+        self._pinned.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._memo) + len(self._pinned)
+
+
+def candidate_pairs(
+    is_similar: PairScorer,
+    incoming: Sequence[tuple[str, str]],
+    candidates: Sequence[tuple[str, str]],
+) -> dict[tuple[str, str], tuple[bool, float]]:
+    """Scores score_block would request when each incoming fixture meets each candidate.
+
+    Keys are (candidate name, incoming name), as passed to *is_similar*.  Away
+    pairs are only scored where the home pair passes or reaches HOME_PREFILTER.
+    """
+    scores: dict[tuple[str, str], tuple[bool, float]] = {}
+    for home, away in incoming:
+        for cand_home, cand_away in candidates:
+            res = scores.get((cand_home, home))
+            if res is None:
+                res = scores[(cand_home, home)] = is_similar(cand_home, home)
+            ok_h, sc_h = res
+            if (ok_h or sc_h >= HOME_PREFILTER) and (cand_away, away) not in scores:
+                scores[(cand_away, away)] = is_similar(cand_away, away)
+    return scores
+
+
+class NearMissTracker:
+    """The *limit* best-scoring near misses seen so far, deduplicated on insert.
+
+    Items are keyed by a caller-chosen dedup key; a repeat key keeps the
+    higher score.  A min-heap of (score, seq, key) finds the entry to evict,
+    so memory stays bounded however many comparisons a merge rejects.
+    Replaced heap entries are skipped lazily and compacted away.
+    """
+
+    def __init__(self, limit: int = 500) -> None:
+        self.limit = limit
+        self._best: dict[Hashable, tuple[float, int, Any]] = {}
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._seq = itertools.count()
+
+    def add(self, key: Hashable, score: float, item: Any) -> bool:
+        """Offer *item* under *key*; returns whether it is (still) tracked."""
+        current = self._best.get(key)
+        if current is not None and current[0] >= score:
+            return True
+        if current is None and len(self._best) >= self.limit:
+            self._drop_stale()
+            if not self._heap or score <= self._heap[0][0]:
+                return False
+            _, _, evicted = heapq.heappop(self._heap)
+            del self._best[evicted]
+        entry = (score, next(self._seq), item)
+        self._best[key] = entry
+        heapq.heappush(self._heap, (score, entry[1], key))
+        if len(self._heap) > 2 * max(self.limit, 1):
+            self._heap = [(score, seq, key) for key, (score, seq, _) in self._best.items()]
+            heapq.heapify(self._heap)
+        return True
+
+    def _drop_stale(self) -> None:
+        while self._heap:
+            _, seq, key = self._heap[0]
+            current = self._best.get(key)
+            if current is not None and current[1] == seq:
+                return
+            heapq.heappop(self._heap)
+
+    def items(self) -> list:
+        """Tracked items, best score first (first seen wins ties)."""
+        return [item for _, _, item in sorted(self._best.values(), key=lambda e: (-e[0], e[1]))]
+
+    def clear(self) -> None:
+        self._best.clear()
+        self._heap.clear()
+
+    def __len__(self) -> int:
+        return len(self._best)
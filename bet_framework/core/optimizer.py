@@ -0,0 +1,161 @@
+"""
+bet_framework.core.optimizer
+────────────────────────────
+Search-based leg selection, the BetSlipConfig.optimizer = "dp" alternative
+to the greedy loop in BetAssistant._pick_legs.
+
+Every candidate is scored once against the even split of the target
+(target_odds ** (1 / target_legs) per leg) and put in a log-odds bucket.
+A knapsack over matches then keeps, for each (legs, bucket) state, the best
+total score reachable with at most one leg per match.  The slip returned is
+the state with min_legs..max_legs legs and total odds within
+[target × stop_threshold, target / stop_threshold] that has the best
+average leg score, so an extra weak leg never wins on count alone.  It is
+exact up to the bucket resolution: two slips whose odds share buckets are
+told apart by score only, and the exact total odds are checked afterwards.
+
+Only the best max_legs candidates of distinct matches in a bucket can be
+part of the best slip, so the search covers at most BUCKETS × max_legs
+candidates whatever the pool size.  Matches are visited best first, and
+once the time budget is spent the search returns the best slip among the
+matches seen so far.
+
+Public surface
+──────────────
+  BUCKETS
+  optimize_legs(odds, consensus, sources, movement_factors, movement_strength,
+                match_keys, cfg)            → [(index, tier, score, quality)]  ([] = no slip in the band)
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from bet_framework.core.scoring import (
+    resolve_max_legs,
+    resolve_min_pick_quality,
+    resolve_optimizer_budget_ms,
+    resolve_stop_threshold,
+    score_pick_arrays,
+)
+
+if TYPE_CHECKING:
+    from bet_framework.core.Slip import BetSlipConfig
+
+# Log-odds buckets between even odds and the top of the target band
+BUCKETS = 256
+# Best (legs, bucket) states re-checked against the exact total odds
+_MAX_ATTEMPTS = 32
+
+
+def _prune(bucket: np.ndarray, score: np.ndarray, match_keys: np.ndarray, per_bucket: int) -> np.ndarray:
+    """Positions of the best *per_bucket* candidates of distinct matches in each bucket."""
+    order = np.argsort(-score)
+    pair = bucket[order] * (int(match_keys.max()) + 1) + match_keys[order]
+    order = order[~pd.Series(pair).duplicated().to_numpy()]  # best candidate of each (bucket, match)
+    order = order[np.argsort(bucket[order].astype(np.int16), kind="stable")]  # radix sort, keeps score order
+    starts = np.flatnonzero(np.r_[True, bucket[order][1:] != bucket[order][:-1]])
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    return np.sort(order[rank < per_bucket])
+
+
+def _backtrack(choices: list[np.ndarray], legs: int, b: int, bucket: np.ndarray) -> list[int]:
+    picked = []
+    for choice in reversed(choices):
+        c = int(choice[legs, b])
+        if c >= 0:
+            picked.append(c)
+            legs -= 1
+            b -= int(bucket[c])
+            if not legs:
+                break
+    return picked
+
+
+def optimize_legs(
+    odds: np.ndarray,
+    consensus: np.ndarray,
+    sources: np.ndarray,
+    movement_factors: np.ndarray,
+    movement_strength: np.ndarray,
+    match_keys: np.ndarray,
+    cfg: BetSlipConfig,
+) -> list[tuple[int, int, float, float]]:
+    """
+    Best-scoring slip over candidate arrays → [(index, tier, score, quality)].
+
+    Takes the same arrays as BetAssistant._pick_legs; legs come back best
+    score first.  Returns [] when no slip reaches the target band within
+    the time budget.
+    """
+    deadline = time.perf_counter() + resolve_optimizer_budget_ms(cfg) / 1000.0
+    if not len(odds):
+        return []
+    max_legs = resolve_max_legs(cfg)
+    min_legs = max(1, int(cfg.target_legs * cfg.min_legs_fill_ratio))
+    stop_threshold = resolve_stop_threshold(cfg)
+    low, high = math.log(cfg.target_odds * stop_threshold), math.log(cfg.target_odds / stop_threshold)
+
+    ideal = cfg.target_odds ** (1.0 / cfg.target_legs)
+    tier, score, quality = score_pick_arrays(
+        odds, consensus, sources, ideal, int(sources.max()), cfg, movement_factors, movement_strength
+    )
+    log_odds = np.log(odds)
+    width = high / BUCKETS
+    usable = (log_odds > 0.0) & (log_odds <= high)
+    min_quality = resolve_min_pick_quality(cfg)
+    if min_quality > 0.0:
+        usable &= ~(quality < min_quality)
+    cells = np.flatnonzero(usable)
+    if not len(cells):
+        return []
+    buckets = np.minimum(np.rint(log_odds[cells] / width).astype(np.int64), BUCKETS - 1)
+    kept = _prune(buckets, score[cells], match_keys[cells], max_legs)
+    cells, buckets, values = cells[kept], buckets[kept], score[cells[kept]]
+
+    # One group per match, best match first
+    keys = match_keys[cells]
+    by_match = np.lexsort((-values, keys))
+    starts = np.flatnonzero(np.r_[True, keys[by_match][1:] != keys[by_match][:-1]])
+    groups = np.split(by_match, starts[1:])
+    groups.sort(key=lambda g: -values[g[0]])
+
+    # best[k, b]: best total score of k legs whose buckets sum to b
+    best = np.full((max_legs + 1, BUCKETS), -np.inf)
+    best[0, 0] = 0.0
+    choices: list[np.ndarray] = []  # per group: candidate taken at each state, -1 = none
+    for group in groups:
+        if choices and time.perf_counter() > deadline:
+            break
+        nxt = best.copy()
+        choice = np.full(best.shape, -1, dtype=np.int32)
+        for c in group.tolist():
+            b = int(buckets[c])
+            reach = best[:-1, : BUCKETS - b] + values[c]
+            better = reach > nxt[1:, b:]
+            np.copyto(nxt[1:, b:], reach, where=better)
+            np.copyto(choice[1:, b:], c, where=better)
+        best = nxt
+        choices.append(choice)
+
+    # Bucket sums are within half a bucket per leg of the exact total, so
+    # keep every state that may be in the band and check the exact odds
+    legs = np.arange(max_legs + 1)[:, None]
+    slack = legs * width / 2
+    start = np.arange(BUCKETS) * width
+    feasible = np.isfinite(best) & (legs >= min_legs) & (start + slack >= low) & (start - slack <= high)
+    mean = np.where(feasible, best / np.maximum(legs, 1), -np.inf)
+    for attempt, flat in enumerate(np.argsort(-mean, axis=None, kind="stable")[:_MAX_ATTEMPTS].tolist()):
+        if not np.isfinite(mean.flat[flat]) or (attempt and time.perf_counter() > deadline):
+            break
+        k, b = divmod(flat, BUCKETS)
+        picked = _backtrack(choices, k, b, buckets)
+        if low <= float(log_odds[cells[picked]].sum()) <= high:
+            picked.sort(key=lambda c: (-values[c], cells[c]))
+            return [(int(cells[c]), int(tier[cells[c]]), float(score[cells[c]]), float(quality[cells[c]])) for c in picked]
+    return []
@@ -14,10 +14,17 @@ Public surface
   resolve_max_single_leg_odds(cfg)               → float
   resolve_min_pick_quality(cfg)                  → float
   resolve_min_source_edge(cfg)                   → float
+  resolve_optimizer(cfg)                         → str
+  resolve_optimizer_budget_ms(cfg)               → float
   score_consensus(consensus, cfg)                → float
   score_sources(sources, max_sources)            → float
   score_balance(odds, ideal, tolerance, cfg)     → float
   score_pick(opt, ideal_odds, max_sources, cfg)  → (int, float, float)
+  movement_factor(direction)                     → float (NaN = no adjustment)
+  round_like_python(values, decimals)            → ndarray
+  score_pick_arrays(odds, consensus, sources, ideal_odds, max_sources, cfg,
+                    movement_factors, movement_strength)
+                                                 → (tier, score, quality) arrays
 """
 
 from __future__ import annotations
@@ -25,6 +32,8 @@ from __future__ import annotations
 import math
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 if TYPE_CHECKING:
     from bet_framework.core.Slip import BetSlipConfig, CandidateLeg
 
@@ -100,6 +109,19 @@ def resolve_odds_movement_strength_min(cfg: BetSlipConfig) -> float:
     return cfg.odds_movement_strength_min if cfg.odds_movement_strength_min is not None else 0.05
 
 
+def resolve_optimizer(cfg: BetSlipConfig) -> str:
+    """Return the leg selection mode, "greedy" or "dp". Unknown values = greedy."""
+    return cfg.optimizer if cfg.optimizer in ("greedy", "dp") else "greedy"
+
+
+def resolve_optimizer_budget_ms(cfg: BetSlipConfig) -> float:
+    """Return the time budget of the dp leg optimizer in ms. Auto = 25, clamped to 5–1000."""
+    v = cfg.optimizer_budget_ms
+    if v is None:
+        return 25.0
+    return max(5.0, min(1000.0, v))
+
+
 def classify_odds_movement(direction: str | None) -> str:
     """Classify movement direction into confirm/stable/infirm.
 
@@ -203,18 +225,40 @@ def score_pick(
     final_score: continuous score with penalty for out-of-tolerance picks.
     quality_score: raw quality component before balance blending.
     """
-    tolerance = resolve_tolerance(cfg)
-    shrinkage_k = resolve_shrinkage_k(cfg)
-    max_leg_odds = resolve_max_single_leg_odds(cfg)
     # Consensus: use pre-adjusted if available, else compute
     if use_preadjusted and opt._adjusted_consensus > 0:
         consensus = opt._adjusted_consensus
     else:
-        consensus = adjusted_consensus(opt.consensus, opt.sources, shrinkage_k)
+        consensus = adjusted_consensus(opt.consensus, opt.sources, resolve_shrinkage_k(cfg))
+    return _score_values(
+        opt.odds,
+        consensus,
+        opt.sources,
+        ideal_odds,
+        max_sources,
+        cfg,
+        opt.odds_movement_direction,
+        opt.odds_movement_strength,
+    )
+
+
+def _score_values(
+    odds: float,
+    consensus: float,
+    sources: int,
+    ideal_odds: float,
+    max_sources: int,
+    cfg: BetSlipConfig,
+    direction: str | None,
+    strength: float,
+) -> tuple[int, float, float]:
+    """score_pick on plain values; *consensus* is already source-adjusted."""
+    tolerance = resolve_tolerance(cfg)
+    max_leg_odds = resolve_max_single_leg_odds(cfg)
     # Hard gate: max single leg odds
-    if opt.odds > max_leg_odds:
+    if odds > max_leg_odds:
         return 2, 0.0, 0.0
-    deviation_signed = (opt.odds - ideal_odds) / ideal_odds
+    deviation_signed = (odds - ideal_odds) / ideal_odds
     # Resolve active tolerance
     if deviation_signed < 0:
         active_tol = cfg.tol_lower if cfg.tol_lower is not None else tolerance
@@ -224,8 +268,8 @@ def score_pick(
     tier = 1 if abs_deviation <= active_tol else 2
     # Component scores
     c_score = score_consensus(consensus, cfg)
-    s_score = score_sources(opt.sources, max_sources)
-    b_score = score_balance(opt.odds, ideal_odds, tolerance, cfg)
+    s_score = score_sources(sources, max_sources)
+    b_score = score_balance(odds, ideal_odds, tolerance, cfg)
     quality = cfg.consensus_vs_sources * c_score + (1 - cfg.consensus_vs_sources) * s_score
     base_score = cfg.quality_vs_balance * quality + (1 - cfg.quality_vs_balance) * b_score
     # Continuous penalty for out-of-tolerance picks
@@ -236,10 +280,133 @@ def score_pick(
     else:
         final_score = base_score
     # Post-base odds movement adjustment
-    final_score = apply_odds_movement_adjustment(
-        final_score,
-        opt.odds_movement_direction,
-        opt.odds_movement_strength,
-        cfg,
-    )
+    final_score = apply_odds_movement_adjustment(final_score, direction, strength, cfg)
     return tier, round(final_score, 6), round(quality, 6)
+
+
+# ── Array kernel ──────────────────────────────────────────────────────────────
+
+# Direction that movement_factor() maps back to, for the scalar fallback
+_FACTOR_DIRECTION = {1.0: "down", 0.0: "up"}
+
+
+def movement_factor(direction: str | None) -> float:
+    """odds_movement_factor of a picked market's movement, NaN when it is stable / unknown (no adjustment)."""
+    cls = classify_odds_movement(direction)
+    return math.nan if cls == "stable" else odds_movement_factor(cls)
+
+
+def _near_rounding_edge(values: np.ndarray, decimals: int) -> np.ndarray:
+    scaled = values * 10.0**decimals
+    return np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+
+
+def _split(a: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    c = 134217729.0 * a  # 2**27 + 1 (Veltkamp split)
+    high = c - (c - a)
+    return high, a - high
+
+
+def round_like_python(values: np.ndarray, decimals: int) -> np.ndarray:
+    """
+    ``round(v, decimals)`` for every element, bit for bit.
+
+    np.round scales first, so a value whose scaled form sits on .5 can go
+    the other way than Python's correctly rounded round().  Those values
+    are decided on the exact product v × 10**decimals (Dekker's two-product),
+    half to even like round().
+
+    >>> round_like_python(np.array([0.4410625, 0.1234565]), 6).tolist() == [round(0.4410625, 6), round(0.1234565, 6)]
+    True
+    """
+    out = np.round(values, decimals)
+    edge = np.flatnonzero(_near_rounding_edge(values, decimals))
+    if not len(edge):
+        return out
+    x = values[edge]
+    scale = 10.0**decimals
+    product = x * scale
+    x_hi, x_lo = _split(x)
+    s_hi, s_lo = _split(np.full_like(x, scale))
+    error = ((x_hi * s_hi - product) + x_hi * s_lo + x_lo * s_hi) + x_lo * s_lo  # x × scale == product + error exactly
+    whole = np.floor(product)
+    above = (product - (whole + 0.5)) + error  # sign of x × scale − (whole + ½), exact
+    up = (above > 0) | ((above == 0) & (whole % 2 == 1))
+    out[edge] = (whole + up) / scale
+    return out
+
+
+def score_pick_arrays(
+    odds: np.ndarray,
+    consensus: np.ndarray,
+    sources: np.ndarray,
+    ideal_odds: float,
+    max_sources: int,
+    cfg: BetSlipConfig,
+    movement_factors: np.ndarray | None = None,
+    movement_strength: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    score_pick over arrays of picks → (tier, final_score, quality_score) arrays.
+
+    *consensus* is the source-adjusted consensus (what score_pick uses with
+    use_preadjusted); *movement_factors* holds movement_factor() per pick.
+    Every step is the same float operation as the scalar path and the
+    6-decimal rounding follows round() exactly (round_like_python), so the
+    result matches score_pick value for value.
+    """
+    odds = np.asarray(odds, dtype=np.float64)
+    consensus = np.asarray(consensus, dtype=np.float64)
+    sources = np.asarray(sources, dtype=np.float64)
+    tolerance = resolve_tolerance(cfg)
+    tol_lower = cfg.tol_lower if cfg.tol_lower is not None else tolerance
+    tol_upper = cfg.tol_upper if cfg.tol_upper is not None else (tolerance * 0.6)
+
+    deviation_signed = (odds - ideal_odds) / ideal_odds
+    active_tol = np.where(deviation_signed < 0, tol_lower, tol_upper)
+    abs_deviation = np.abs(deviation_signed)
+    outside = abs_deviation > active_tol
+    tier = np.where(outside, 2, 1)
+
+    span = 100.0 - cfg.consensus_floor
+    c_score = np.ones_like(odds) if span <= 0 else np.maximum(0.0, np.minimum(1.0, (consensus - cfg.consensus_floor) / span))
+    s_score = np.zeros_like(odds) if max_sources <= 0 else np.minimum(1.0, sources / max_sources)
+    # score_balance picks its band with odds < ideal, the same split as deviation_signed < 0
+    ratio = abs_deviation / active_tol
+    b_score = np.maximum(0.0, 1.0 - ratio) if cfg.balance_decay == "linear" else np.minimum(1.0, np.exp(-0.5 * ratio**2))
+    quality = cfg.consensus_vs_sources * c_score + (1 - cfg.consensus_vs_sources) * s_score
+    base_score = cfg.quality_vs_balance * quality + (1 - cfg.quality_vs_balance) * b_score
+    final = np.where(outside, base_score * np.exp(-TOLERANCE_EXCESS_LAMBDA * (abs_deviation - active_tol)), base_score)
+
+    w = resolve_odds_movement_weight(cfg)
+    if w > 0.0 and movement_factors is not None and movement_strength is not None:
+        factors = np.asarray(movement_factors, dtype=np.float64)
+        moved = ~(np.asarray(movement_strength, dtype=np.float64) < resolve_odds_movement_strength_min(cfg))
+        moved &= ~np.isnan(factors)
+        final = np.where(moved, final * (1.0 - w) + w * factors, final)
+
+    gated = odds > resolve_max_single_leg_odds(cfg)
+    tier[gated] = 2
+    final[gated] = 0.0
+    quality[gated] = 0.0
+    score = round_like_python(final, 6)
+    quality = round_like_python(quality, 6)
+
+    # Everything above is the scalar path's own float operations except the
+    # exponentials: where np.exp fed a score that sits on a rounding edge,
+    # an ulp of difference from math.exp could flip it, so use math.exp.
+    used_exp = outside if cfg.balance_decay == "linear" else np.ones_like(outside)
+    for i in np.flatnonzero(used_exp & ~gated & _near_rounding_edge(final, 6)).tolist():
+        factor = float(movement_factors[i]) if movement_factors is not None else math.nan
+        strength = float(movement_strength[i]) if movement_strength is not None else 0.0
+        _, score[i], _ = _score_values(
+            float(odds[i]),
+            float(consensus[i]),
+            float(sources[i]),
+            ideal_odds,
+            max_sources,
+            cfg,
+            _FACTOR_DIRECTION.get(factor),
+            strength,
+        )
+    return tier, score, quality
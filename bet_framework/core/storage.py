@@ -0,0 +1,107 @@
+"""
+bet_framework.core.storage
+───────────────────────────
+SQLite connection tuning shared by the match and slip stores.
+
+A StorageProfile is a set of PRAGMAs applied to a connection right after it
+is opened.  The named profiles are:
+
+  default         library defaults, nothing changed (rollback journal)
+  wal             WAL journal + synchronous=NORMAL, 64 MiB mmap, 16 MiB page
+                  cache, in-memory temp tables, 5 s busy timeout — readers no
+                  longer block the writer (dashboard + ticker threads)
+  wal_low_memory  the same journal settings with no mmap and a 2 MiB cache,
+                  for small boards that share RAM with other services
+
+WAL keeps ``-wal`` / ``-shm`` files next to the DB while it is open and
+changes the file's journal mode for every later reader, so it is opt-in.
+
+Public surface
+──────────────
+  StorageProfile                                  (frozen dataclass)
+  STORAGE_PROFILES, DEFAULT_STORAGE_PROFILE
+  resolve_storage_profile(profile)                → StorageProfile
+  apply_storage_profile(conn, profile)            → {pragma: value in effect}
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """PRAGMA values to set on a new connection; None leaves the SQLite default."""
+
+    journal_mode: str | None = None
+    synchronous: str | None = None
+    mmap_size: int | None = None  # bytes
+    cache_size_kib: int | None = None
+    temp_store: str | None = None
+    busy_timeout_ms: int | None = None
+
+    def pragmas(self) -> list[tuple[str, str | int]]:
+        """(pragma, value) pairs to execute, in order."""
+        values = [
+            ("busy_timeout", self.busy_timeout_ms),
+            ("journal_mode", self.journal_mode),
+            ("synchronous", self.synchronous),
+            ("mmap_size", self.mmap_size),
+            # A negative cache_size is a size in KiB rather than in pages
+            ("cache_size", -self.cache_size_kib if self.cache_size_kib is not None else None),
+            ("temp_store", self.temp_store),
+        ]
+        return [(name, value) for name, value in values if value is not None]
+
+
+STORAGE_PROFILES: dict[str, StorageProfile] = {
+    "default": StorageProfile(),
+    "wal": StorageProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        mmap_size=64 * 2**20,
+        cache_size_kib=16 * 1024,
+        temp_store="MEMORY",
+        busy_timeout_ms=5000,
+    ),
+    "wal_low_memory": StorageProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        mmap_size=0,
+        cache_size_kib=2 * 1024,
+        temp_store="MEMORY",
+        busy_timeout_ms=5000,
+    ),
+}
+DEFAULT_STORAGE_PROFILE = "default"
+
+
+def resolve_storage_profile(profile: str | StorageProfile | None) -> StorageProfile:
+    """
+    Return the StorageProfile named *profile* (None → the default one).
+
+    Raises ValueError for an unknown name.
+
+    >>> resolve_storage_profile("wal").journal_mode
+    'WAL'
+    >>> resolve_storage_profile(None) == StorageProfile()
+    True
+    """
+    if isinstance(profile, StorageProfile):
+        return profile
+    name = profile or DEFAULT_STORAGE_PROFILE
+    try:
+        return STORAGE_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown storage profile '{name}'. Available: {sorted(STORAGE_PROFILES)}") from None
+
+
+def apply_storage_profile(conn: sqlite3.Connection, profile: StorageProfile) -> dict[str, str | int]:
+    """Execute *profile*'s PRAGMAs on *conn*; returns the value SQLite reports for each one."""
+    applied: dict[str, str | int] = {}
+    for name, value in profile.pragmas():
+        conn.execute(f"PRAGMA {name} = {value}")
+        row = conn.execute(f"PRAGMA {name}").fetchone()
+        applied[name] = row[0] if row is not None else value
+    return applied
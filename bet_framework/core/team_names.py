@@ -0,0 +1,137 @@
+"""
+bet_framework.core.team_names
+──────────────────────────────
+Team-name normalisation driven by config/similarity_config.yaml, memoised so
+the 300+ acronym / synonym rules run once per distinct raw name instead of
+once per comparison.
+
+Normalisation follows the intent of the similarity config:
+
+  1. lower-case, collapse whitespace and resolve ``synonyms`` (full-name
+     aliases such as "man utd" → "manchester united")
+  2. apply the ``acronyms`` rules as whole-token replacements — "fc ",
+     " fc" and " fc " all mean the token "fc" — so a rule like "al " never
+     eats the end of "arsenal"
+  3. collapse whitespace and resolve ``synonyms`` again
+
+A name that would normalise to nothing keeps its lower-cased form.
+
+MatchesManager uses this form only to group near misses and propose
+synonyms; match decisions stay with the exact (lower-cased) keys and the
+SimilarityEngine, which is given the raw names.
+
+The phonetic key is the Soundex code of each normalised token, so spelling
+variants ("Bucuresti" / "Bucharest") share a key.
+
+Public surface
+──────────────
+  normalize_team_name(name, acronyms, synonyms)  → str
+  soundex(word)                                  → str
+  phonetic_key(normalized)                       → str
+  TeamName                                       (NamedTuple)
+  TeamNameTable(config, maxsize)                 memoised raw name → TeamName
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import NamedTuple
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+def normalize_team_name(name: str, acronyms: dict[str, str] | None = None, synonyms: dict[str, str] | None = None) -> str:
+    """Return the canonical comparison form of a raw team name.
+
+    >>> normalize_team_name("Arsenal FC", {" fc": "", "al ": ""})
+    'arsenal'
+    >>> normalize_team_name("Man Utd", {" utd": ""}, {"man utd": "manchester united"})
+    'manchester united'
+    """
+    synonyms = synonyms or {}
+    base = " ".join(str(name).lower().split())
+    base = synonyms.get(base, base)
+    text = f" {base} "
+    for pattern, replacement in (acronyms or {}).items():
+        token = f" {pattern.strip()} "
+        if token != "  " and token in text:
+            # Replace repeatedly: adjacent hits share their separating space
+            while token in text:
+                text = text.replace(token, f" {(replacement or '').strip()} ")
+    text = " ".join(text.split()) or base
+    return synonyms.get(text, text)
+
+
+def soundex(word: str) -> str:
+    """Classic 4-character American Soundex code ('' for words without letters).
+
+    >>> soundex("Robert"), soundex("Rupert")
+    ('R163', 'R163')
+    """
+    letters = [c for c in word.lower() if c.isalpha()]
+    if not letters:
+        return ""
+    first = letters[0]
+    code = [first.upper()]
+    prev = _SOUNDEX_CODES.get(first, "")
+    for c in letters[1:]:
+        digit = _SOUNDEX_CODES.get(c, "")
+        if digit and digit != prev:
+            code.append(digit)
+            if len(code) == 4:
+                break
+        if c not in "hw":  # h/w do not separate equal codes
+            prev = digit
+    return "".join(code).ljust(4, "0")
+
+
+def phonetic_key(normalized: str) -> str:
+    """Space-joined Soundex codes of the tokens of an already-normalised name."""
+    return " ".join(filter(None, (soundex(tok) for tok in normalized.split())))
+
+
+class TeamName(NamedTuple):
+    normalized: str
+    phonetic: str
+
+
+class TeamNameTable:
+    """Bounded, memoised raw team name → TeamName table for one similarity config.
+
+    Without a config, names are only lower-cased and whitespace-collapsed.
+    Build a new table (or call clear()) when the config changes.
+    """
+
+    def __init__(self, config: dict | None = None, maxsize: int = 50_000) -> None:
+        config = config or {}
+        self._acronyms: dict[str, str] = dict(config.get("acronyms") or {})
+        self._synonyms: dict[str, str] = dict(config.get("synonyms") or {})
+        self.lookup = functools.lru_cache(maxsize=maxsize)(self._build)
+
+    def _build(self, raw: str) -> TeamName:
+        normalized = normalize_team_name(raw, self._acronyms, self._synonyms)
+        return TeamName(normalized, phonetic_key(normalized))
+
+    def normalized(self, raw: str) -> str:
+        return self.lookup(raw).normalized
+
+    def phonetic(self, raw: str) -> str:
+        return self.lookup(raw).phonetic
+
+    @property
+    def hits(self) -> int:
+        return self.lookup.cache_info().hits
+
+    @property
+    def misses(self) -> int:
+        return self.lookup.cache_info().misses
+
+    def clear(self) -> None:
+        self.lookup.cache_clear()
@@ -10,12 +10,21 @@ Public surface
 ──────────────
   is_valid_url(url)        → bool
   coerce_datetime_str(dt)  → str | None
+  frame_memory_report(df)  → dict (rows, total_bytes, per-column bytes)
+  widen_float32(df)        → copy of df with float32 columns as float64
 """
 
 from __future__ import annotations
 
 from typing import Any
 
+import numpy as np
+import pandas as pd
+
+# float32 keeps ~7 significant digits: prices (2 d.p.) and consensus
+# percentages (1 d.p.) come back exactly when rounded to this many places.
+FLOAT32_DECIMALS = 3
+
 
 def is_valid_url(url: Any) -> bool:
     """
@@ -63,3 +72,41 @@ def coerce_datetime_str(dt: Any) -> str | None:
     if hasattr(dt, "isoformat"):
         return dt.isoformat()
     return str(dt)
+
+
+def frame_memory_report(df: pd.DataFrame | None) -> dict[str, Any]:
+    """
+    Deep memory footprint of *df*: row count, total bytes and bytes per column.
+
+    Object columns are measured including the Python objects they point to.
+
+    >>> frame_memory_report(pd.DataFrame({"a": [1, 2]}))["columns"]
+    {'a': 16}
+    """
+    if df is None:
+        return {"rows": 0, "total_bytes": 0, "columns": {}}
+    usage = df.memory_usage(deep=True, index=False)
+    return {
+        "rows": len(df),
+        "total_bytes": int(usage.sum()),
+        "columns": {str(col): int(n) for col, n in usage.items()},
+    }
+
+
+def widen_float32(df: pd.DataFrame, decimals: int = FLOAT32_DECIMALS) -> pd.DataFrame:
+    """
+    Copy of *df* with every float32 column widened to float64.
+
+    Values are rounded to *decimals* places so a price stored as float32
+    reads back as the decimal it was (1.85, not 1.850000023841858).
+
+    >>> widen_float32(pd.DataFrame({"p": np.array([1.85], dtype=np.float32)}))["p"].tolist()
+    [1.85]
+    """
+    narrow = [col for col, dtype in df.dtypes.items() if dtype == np.float32]
+    if not narrow:
+        return df.copy()
+    out = df.copy()
+    for col in narrow:
+        out[col] = out[col].astype(np.float64).round(decimals)
+    return out
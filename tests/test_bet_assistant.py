@@ -4,7 +4,7 @@ Comprehensive tests for BetAssistant.
 Public API covered:
   BetSlipConfig, get_profile, load_matches, filter_matches,
   build_slip, build_slip_auto_exclude, save_slip, get_slips,
-  delete_slip, get_excluded_urls, update_leg, close
+  delete_slip, get_excluded_urls, is_excluded, update_leg, close
 
 Private helpers covered via integration:
   _calc_consensus, _collect_candidates, _select_legs,
@@ -16,32 +16,52 @@ Plus 5 complex integration scenarios at the bottom.
 """
 
 import contextlib
+import hashlib
+import itertools
 import math
 import os
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from bet_framework.BetAssistant import BetAssistant
+from bet_framework.BetAssistant import (
+    _CONSENSUS_COLUMNS,
+    _ODDS_COLUMNS,
+    MARKET_MAP,
+    BetAssistant,
+    _compact_match_frame,
+)
 from bet_framework.core.consensus import calc_consensus
+from bet_framework.core.optimizer import optimize_legs
 from bet_framework.core.outcomes import determine_outcome, parse_score
 from bet_framework.core.scoring import (
+    adjusted_consensus,
     apply_odds_movement_adjustment,
     classify_odds_movement,
+    movement_factor,
     odds_movement_factor,
     resolve_max_legs,
+    resolve_max_single_leg_odds,
+    resolve_min_pick_quality,
+    resolve_min_source_edge,
     resolve_odds_movement_strength_min,
     resolve_odds_movement_weight,
+    resolve_optimizer,
+    resolve_optimizer_budget_ms,
+    resolve_shrinkage_k,
     resolve_stop_threshold,
     resolve_tolerance,
     score_balance,
     score_consensus,
     score_pick,
+    score_pick_arrays,
     score_sources,
 )
 from bet_framework.core.Slip import PROFILES, BetSlipConfig, CandidateLeg, get_profile
 from bet_framework.core.types import MarketLabel, MarketType, Outcome
+from bet_framework.core.utils import is_valid_url, widen_float32
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -221,6 +241,14 @@ class TestResolveHelpers:
         cfg = BetSlipConfig(target_legs=6)
         assert resolve_max_legs(cfg) == 8
 
+    def test_optimizer_unknown_falls_back_to_greedy(self):
+        assert resolve_optimizer(BetSlipConfig()) == "greedy"
+        assert resolve_optimizer(BetSlipConfig(optimizer="beam")) == "greedy"
+        assert resolve_optimizer(BetSlipConfig(optimizer="dp")) == "dp"
+        assert resolve_optimizer_budget_ms(BetSlipConfig()) == 25.0
+        assert resolve_optimizer_budget_ms(BetSlipConfig(optimizer_budget_ms=0.1)) == 5.0
+        assert resolve_optimizer_budget_ms(BetSlipConfig(optimizer_budget_ms=5000)) == 1000.0
+
 
 # ── Scoring functions ─────────────────────────────────────────────────────────
 
@@ -295,6 +323,42 @@ class TestScoringFunctions:
         assert 0.0 <= score <= 1.0
         assert 0.0 <= quality <= 1.0
 
+    def test_score_pick_arrays_matches_score_pick(self):
+        rng = np.random.default_rng(5)
+        picks = [
+            CandidateLeg(
+                match_name="A vs B",
+                datetime=DT_BASE,
+                market=MarketLabel.HOME,
+                market_type=MarketType.RESULT,
+                consensus=round(float(rng.uniform(0, 100)), 1),
+                odds=round(float(rng.uniform(1.01, 6.0)), 2),
+                result_url="http://x.com",
+                sources=int(rng.integers(0, 8)),
+                odds_movement_direction=[None, "up", "down", "stable"][i % 4],
+                odds_movement_strength=[0.0, 0.03, 0.1, 0.2][i % 3],
+            )
+            for i in range(3000)
+        ]
+        for p in picks:
+            p._adjusted_consensus = adjusted_consensus(p.consensus, p.sources)
+        max_sources = max(p.sources for p in picks)
+        configs = [*PROFILES.values(), BetSlipConfig(balance_decay="linear", tol_lower=0.2, odds_movement_weight=0.3)]
+        for cfg in configs:
+            for ideal in (1.3, 1.77, 2.5):
+                tier, score, quality = score_pick_arrays(
+                    np.array([p.odds for p in picks]),
+                    np.array([p._adjusted_consensus for p in picks]),
+                    np.array([p.sources for p in picks]),
+                    ideal,
+                    max_sources,
+                    cfg,
+                    np.array([movement_factor(p.odds_movement_direction) for p in picks]),
+                    np.array([p.odds_movement_strength for p in picks]),
+                )
+                got = list(zip(tier.tolist(), score.tolist(), quality.tolist(), strict=True))
+                assert got == [score_pick(p, ideal, max_sources, cfg, use_preadjusted=True) for p in picks]
+
 
 # ── Odds Movement Scoring ────────────────────────────────────────────────────
 
@@ -546,6 +610,96 @@ class TestLoadMatches:
         ba.load_matches(df)
         assert ba._df.iloc[0]["sources"] == 0
 
+    def test_normal_compact_dtypes(self, loaded_ba):
+        df = loaded_ba._df
+        for col in ("home", "away", "league"):
+            assert isinstance(df[col].dtype, pd.CategoricalDtype)
+        assert pd.api.types.is_datetime64_any_dtype(df["datetime"])
+        assert df["cons_home"].dtype == np.float32
+        assert df["odds_home"].dtype == np.float32
+        assert "odds" not in df.columns
+
+    def test_normal_raw_odds_kept_beside_frame(self, loaded_ba):
+        assert loaded_ba.match_odds(0)["home"] == 1.5
+        assert loaded_ba.match_odds(10) is None
+
+    def test_normal_memory_report_halves_object_layout(self, ba):
+        ba.load_matches(make_matches_df(200))
+        report = ba.memory_report()
+        assert report["rows"] == 200
+        assert report["total_bytes"] == sum(report["columns"].values())
+        wide = ba._df.astype(dict.fromkeys(("home", "away", "league", "datetime"), object))
+        wide = wide.astype({c: np.float64 for c in wide.columns if c.startswith(("cons_", "odds_"))})
+        wide["odds"] = ba._odds
+        assert report["total_bytes"] <= 0.5 * wide.memory_usage(deep=True, index=False).sum()
+
+    @staticmethod
+    def _row_by_row(df):
+        """The former iterrows + calc_consensus loop of load_matches."""
+        rows, raw_odds = [], []
+        for idx, row in df.iterrows():
+            try:
+                key = f"{row['home_name']}_{row['away_name']}_{row['datetime']}".encode()
+                odds = row.get("odds") or {}
+                scores = row.get("scores") or []
+                cons = calc_consensus(scores)
+                record = {
+                    "match_id": f"match_{idx}_{hashlib.md5(key, usedforsecurity=False).hexdigest()}",
+                    "datetime": row["datetime"],
+                    "home": row["home_name"],
+                    "away": row["away_name"],
+                    "sources": len({s.get("source", "") for s in scores if s.get("source")}),
+                    "result_url": row.get("result_url"),
+                    "league": row.get("league"),
+                }
+                record.update({col: cons[m][side] for col, (m, side) in _CONSENSUS_COLUMNS.items()})
+                record.update({col: odds.get(k, 0.0) for col, k in _ODDS_COLUMNS.items()})
+                rows.append(record)
+                raw_odds.append(row.get("odds"))
+            except Exception:
+                continue
+        return _compact_match_frame(rows), raw_odds
+
+    def test_normal_matches_row_by_row_consensus(self, ba):
+        rng = np.random.default_rng(3)
+        records = []
+        for i in range(300):
+            scores = [
+                {"home": int(rng.integers(0, 5)), "away": float(rng.integers(0, 5)), "source": f"s{j % 4}"}
+                for j in range(int(rng.integers(0, 7)))
+            ]
+            odds = {"home": round(float(rng.uniform(1.1, 5)), 2), "btts_y": 1.9} if i % 5 else None
+            records.append(
+                {
+                    "home_name": f"H{i % 40}",
+                    "away_name": f"A{i % 37}",
+                    "datetime": DT_BASE + timedelta(hours=i),
+                    "scores": scores,
+                    "odds": odds,
+                    "result_url": f"https://example.com/match/{i}",
+                    "league": f"L{i % 6}" if i % 7 else None,
+                }
+            )
+        # Awkward rows: None / NaN goals, string goals, a non-dict score, missing keys, odds set to a string
+        records[1]["scores"] = [{"home": None, "away": 2}, {"home": float("nan"), "away": 1, "source": "x"}]
+        records[2]["scores"] = [{"home": "2", "away": "1", "source": "x"}]
+        records[3]["scores"] = [{"home": 1, "away": 0}, "1:0"]
+        records[4]["scores"] = [{"source": "only"}]
+        records[5]["odds"] = "1.5"
+        df = pd.DataFrame(records, index=range(100, 400))
+
+        ba.load_matches(df)
+        expected, expected_odds = self._row_by_row(df)
+        assert len(ba._df) == 298
+        pd.testing.assert_frame_equal(ba._df, expected)
+        assert ba._odds == expected_odds
+        assert ba._df.loc[1, "cons_draw"] == 50.0  # None-vs-2 is an away win, NaN-vs-1 a draw
+        assert ba._df.loc[2, "cons_home"] == 0.0  # string goals: consensus falls back to zeros
+
+    def test_edge_missing_required_column_loads_nothing(self, ba):
+        ba.load_matches(make_matches_df(3).drop(columns=["away_name"]))
+        assert ba._df.empty and ba._odds == []
+
 
 # ── filter_matches ────────────────────────────────────────────────────────────
 
@@ -577,6 +731,11 @@ class TestFilterMatches:
         result = loaded_ba.filter_matches(min_sources=1)
         assert len(result) == 10
 
+    def test_normal_prices_read_back_as_float64(self, loaded_ba):
+        result = loaded_ba.filter_matches()
+        assert result["odds_home"].dtype == np.float64
+        assert result["odds_home"].iloc[3] == 1.8
+
 
 # ── build_slip ────────────────────────────────────────────────────────────────
 
@@ -623,6 +782,220 @@ class TestBuildSlip:
         match_names = [leg.match_name for leg in legs]
         assert len(match_names) == len(set(match_names))
 
+    def test_normal_candidate_odds_are_exact_decimals(self, loaded_ba):
+        cfg = BetSlipConfig(consensus_floor=0.0, min_odds=1.01)
+        for leg in loaded_ba._collect_candidates(cfg):
+            assert leg.odds == round(leg.odds, 2)
+            assert leg.consensus == round(leg.consensus, 1)
+
+    @staticmethod
+    def _row_by_row_candidates(assistant, cfg):
+        """The former iterrows × MARKET_MAP loop of _collect_candidates."""
+        excluded = set(cfg.excluded_urls or [])
+        date_from = pd.to_datetime(cfg.date_from) if cfg.date_from else None
+        date_to = (pd.to_datetime(cfg.date_to) + pd.Timedelta(days=1)) if cfg.date_to else None
+        out = []
+        for pos, row in widen_float32(assistant._df).iterrows():
+            if (date_from and row["datetime"] < date_from) or (date_to and row["datetime"] >= date_to):
+                continue
+            url = row.get("result_url")
+            if not is_valid_url(url) or url in excluded:
+                continue
+            league = None if pd.isna(row.get("league")) else row.get("league")
+            if cfg.included_leagues and (league is None or league not in cfg.included_leagues):
+                continue
+            for m_type, market_cols in MARKET_MAP.items():
+                for cons_col, odds_col, label in market_cols:
+                    if cfg.included_markets and label not in cfg.included_markets:
+                        continue
+                    consensus, odds = float(row[cons_col]), float(row[odds_col])
+                    if consensus < cfg.consensus_floor or odds < cfg.min_odds or odds > resolve_max_single_leg_odds(cfg):
+                        continue
+                    adj = adjusted_consensus(consensus, int(row["sources"]), resolve_shrinkage_k(cfg))
+                    if (adj / 100.0) - 1.0 / odds < resolve_min_source_edge(cfg):
+                        continue
+                    mov = assistant._get_market_movement(
+                        assistant.match_odds(pos), assistant.match_history(pos), odds_col.replace("odds_", "")
+                    )
+                    out.append(
+                        CandidateLeg(
+                            match_name=f"{row['home']} vs {row['away']}",
+                            datetime=row["datetime"],
+                            market=label,
+                            market_type=m_type,
+                            consensus=consensus,
+                            odds=odds,
+                            result_url=row["result_url"],
+                            sources=int(row["sources"]),
+                            league=league,
+                            _adjusted_consensus=adj,
+                            odds_movement_direction=mov[0],
+                            odds_movement_strength=mov[1],
+                        )
+                    )
+        return out
+
+    def test_normal_candidate_table_matches_row_by_row(self, ba):
+        rng = np.random.default_rng(11)
+        records = []
+        for i in range(120):
+            scores = [
+                {"home": int(rng.integers(0, 4)), "away": int(rng.integers(0, 4)), "source": f"s{j}"}
+                for j in range(int(rng.integers(1, 6)))
+            ]
+            odds = {key: round(float(rng.uniform(1.02, 4.5)), 2) for key in ("home", "draw", "away", "over_25", "btts_y")}
+            if i % 3 == 0:
+                odds["history"] = [{"home": round(odds["home"] * 1.2, 2), "over_25": odds["over_25"]}, dict(odds)]
+            records.append(
+                {
+                    "home_name": f"H{i}",
+                    "away_name": f"A{i}",
+                    "datetime": DT_BASE + timedelta(hours=6 * i),
+                    "scores": scores,
+                    "odds": odds,
+                    "result_url": f"https://example.com/match/{i}" if i % 11 else "not a url",
+                    "league": f"L{i % 4}" if i % 5 else None,
+                }
+            )
+        ba.load_matches(pd.DataFrame(records))
+        configs = [
+            *(get_profile(name) for name in PROFILES),
+            BetSlipConfig(consensus_floor=0.0, min_odds=1.01, max_single_leg_odds=10.0),
+            BetSlipConfig(
+                consensus_floor=40.0,
+                min_source_edge=0.05,
+                included_leagues=["L1", "L3"],
+                included_markets=["1", "Over 2.5", "BTTS Yes"],
+                date_from=(DT_BASE + timedelta(days=3)).strftime("%Y-%m-%d"),
+                date_to=(DT_BASE + timedelta(days=20)).strftime("%Y-%m-%d"),
+                excluded_urls=[f"https://example.com/match/{i}" for i in range(0, 120, 2)],
+            ),
+        ]
+        for cfg in configs:
+            assert ba._collect_candidates(cfg) == self._row_by_row_candidates(ba, cfg)
+        assert any(c.odds_movement_direction == "down" for c in ba._collect_candidates(configs[-2]))
+
+    @staticmethod
+    def _sort_each_round(candidates, cfg):
+        """The former _select_legs: re-score with score_pick and sort every round."""
+        max_sources = max(c.sources for c in candidates)
+        min_legs = max(1, int(cfg.target_legs * cfg.min_legs_fill_ratio))
+        selected, seen, total = [], set(), 1.0
+        while len(selected) < resolve_max_legs(cfg):
+            if total >= cfg.target_odds * resolve_stop_threshold(cfg) and len(selected) >= min_legs:
+                break
+            ideal = (cfg.target_odds / total) ** (1.0 / max(1, cfg.target_legs - len(selected)))
+            scored = [
+                (*score_pick(c, ideal, max_sources, cfg, use_preadjusted=True), c)
+                for c in candidates
+                if c.match_name not in seen
+            ]
+            if not scored:
+                break
+            scored.sort(key=lambda x: (-x[1], x[0]))
+            tier, score, quality, best = scored[0]
+            if resolve_min_pick_quality(cfg) > 0.0 and quality < resolve_min_pick_quality(cfg):
+                break
+            selected.append((best.result_url, best.market, tier, score, quality))
+            seen.add(best.match_name)
+            total *= best.odds
+        return selected if len(selected) >= min_legs else []
+
+    def test_normal_array_selection_matches_sorted_rounds(self, ba):
+        records = make_matches_df(60, sources_per_match=4).to_dict("records")
+        rng = np.random.default_rng(2)
+        for i, rec in enumerate(records):
+            rec["scores"] = [
+                {"home": int(rng.integers(0, 4)), "away": int(rng.integers(0, 3)), "source": f"s{j}"} for j in range(i % 5 + 1)
+            ]
+            rec["odds"] = {
+                key: round(float(rng.uniform(1.05, 3.4)), 2)
+                for key in ("home", "draw", "away", "over_25", "under_25", "btts_y")
+            }
+        ba.load_matches(pd.DataFrame(records))
+        configs = [
+            *(get_profile(name) for name in PROFILES),
+            BetSlipConfig(target_odds=40.0, target_legs=6, consensus_floor=30.0),
+        ]
+        for cfg in configs:
+            expected = self._sort_each_round(ba._collect_candidates(cfg), cfg)
+            built = ba.build_slip(cfg)
+            assert [(c.result_url, c.market, c.tier, c.score, c.quality) for c in built] == expected
+            selected = ba._select_legs(ba._collect_candidates(cfg), cfg)
+            assert [(c.result_url, c.market, c.tier, c.score, c.quality) for c in selected] == expected
+        assert any(ba.build_slip(cfg) for cfg in configs)
+
+    def test_normal_dp_optimizer_finds_best_slip_in_band(self):
+        rng = np.random.default_rng(5)
+        n = 36
+        odds = np.round(rng.uniform(1.1, 3.0, n), 2)
+        consensus = rng.uniform(50.0, 95.0, n)
+        sources = rng.integers(1, 6, n)
+        match_keys = np.arange(n) // 3  # three markets per match
+        no_movement = np.full(n, np.nan), np.zeros(n)
+        for target_odds, target_legs in ((4.0, 3), (2.5, 2), (9.0, 4)):
+            cfg = BetSlipConfig(target_odds=target_odds, target_legs=target_legs, optimizer="dp", optimizer_budget_ms=1000)
+            _, score, quality = score_pick_arrays(
+                odds, consensus, sources, target_odds ** (1 / target_legs), 5, cfg, *no_movement
+            )
+            low, high = target_odds * resolve_stop_threshold(cfg), target_odds / resolve_stop_threshold(cfg)
+            usable = [i for i in range(n) if quality[i] >= resolve_min_pick_quality(cfg)]
+            min_legs = max(1, int(target_legs * cfg.min_legs_fill_ratio))
+            best = max(
+                score[list(combo)].mean()
+                for k in range(min_legs, resolve_max_legs(cfg) + 1)
+                for combo in itertools.combinations(usable, k)
+                if len(set(match_keys[list(combo)])) == k and low <= math.prod(odds[list(combo)]) <= high
+            )
+            picks = optimize_legs(odds, consensus, sources, *no_movement, match_keys, cfg)
+            chosen = [i for i, _, _, _ in picks]
+            assert len(set(match_keys[chosen])) == len(chosen)
+            assert low <= math.prod(odds[chosen]) <= high
+            assert np.mean([s for _, _, s, _ in picks]) == pytest.approx(best)
+
+    def test_normal_dp_optimizer_builds_slip(self, loaded_ba):
+        cfg = BetSlipConfig(target_odds=3.0, target_legs=2, consensus_floor=0.0, optimizer="dp")
+        legs = loaded_ba.build_slip(cfg)
+        assert legs
+        assert len({leg.match_name for leg in legs}) == len(legs)
+        assert all(leg.score > 0 for leg in legs)
+
+    def test_normal_build_slips_matches_one_slip_at_a_time(self, tmp_path):
+        df = make_matches_df(40)
+        plan = [
+            ("two_legs", BetSlipConfig(target_odds=3.0, target_legs=2, consensus_floor=0.0), 4),
+            ("three_legs", BetSlipConfig(target_odds=5.0, target_legs=3, consensus_floor=0.0), 3),
+            ("never", BetSlipConfig(consensus_floor=100.0, min_odds=10.0), 2),
+        ]
+        with BetAssistant(str(tmp_path / "run.db")) as run, BetAssistant(str(tmp_path / "loop.db")) as loop:
+            for assistant in (run, loop):
+                assistant.load_matches(df)
+                assistant.save_slip("earlier", assistant.build_slip(plan[0][1]))
+
+            expected = []
+            for name, cfg, count in plan:
+                for _ in range(count):
+                    legs = loop.build_slip_auto_exclude(cfg)
+                    if not legs:
+                        break
+                    loop.save_slip(name, legs)
+                    expected.append((name, [(leg.result_url, leg.market, leg.score) for leg in legs]))
+
+            built = run.build_slips(plan)
+            assert [(name, [(leg.result_url, leg.market, leg.score) for leg in legs]) for name, legs in built] == expected
+            assert len(run.get_slips()) == 1  # nothing written yet
+            run.save_slips([(name, legs, 1.0) for name, legs in built])
+            assert sorted(run.get_excluded_urls()) == sorted(loop.get_excluded_urls())
+        assert len(expected) > 2
+
+    def test_normal_candidate_table_built_once_per_load(self, loaded_ba):
+        table = loaded_ba._candidate_table()
+        loaded_ba.build_slip("medium_risk")
+        assert loaded_ba._candidate_table() is table
+        assert len(table) == 10 * sum(len(cols) for cols in MARKET_MAP.values())
+        loaded_ba.load_matches(make_matches_df(4))
+        assert len(loaded_ba._candidate_table()) == 4 * sum(len(cols) for cols in MARKET_MAP.values())
+
 
 # ── save_slip and get_slips ───────────────────────────────────────────────────
 
@@ -690,6 +1063,23 @@ class TestSaveAndGetSlips:
         slips = ba.get_slips()
         assert slips[0].slip_status == Outcome.PENDING
 
+    def test_normal_save_slips_in_one_transaction(self, ba):
+        ba.get_excluded_urls()  # build the exclusion set first
+        legs = self._make_legs(4)
+        slip_ids = ba.save_slips([("a", legs[:2], 1.0), ("b", legs[2:], 2.0)])
+        slips = {slip.slip_id: slip for slip in ba.get_slips()}
+        assert sorted(slips) == sorted(slip_ids)
+        assert [(slips[i].profile, slips[i].units, len(slips[i].legs)) for i in slip_ids] == [("a", 1.0, 2), ("b", 2.0, 2)]
+        assert sorted(ba.get_excluded_urls()) == sorted(leg.result_url for leg in legs)
+
+    def test_error_save_slips_writes_nothing_on_failure(self, ba):
+        broken = self._make_legs(1)
+        broken[0].odds = None  # fails in the second slip, after the first is inserted
+        with pytest.raises(TypeError):
+            ba.save_slips([("a", self._make_legs(2), 1.0), ("b", broken, 1.0)])
+        assert ba.get_slips() == []
+        assert ba.get_excluded_urls() == []
+
 
 # ── delete_slip ───────────────────────────────────────────────────────────────
 
@@ -841,6 +1231,70 @@ class TestGetExcludedUrls:
     def test_edge_empty_db_returns_empty_list(self, ba):
         assert ba.get_excluded_urls() == []
 
+    @staticmethod
+    def _legs(*urls):
+        return [
+            CandidateLeg(
+                match_name=f"M{i}",
+                datetime=DT_BASE,
+                market=MarketLabel.HOME,
+                market_type=MarketType.RESULT,
+                odds=1.5,
+                result_url=url,
+                consensus=80.0,
+                sources=3,
+            )
+            for i, url in enumerate(urls)
+        ]
+
+    @staticmethod
+    def _sql_excluded(ba):
+        rows = ba.fetch_rows("""
+            SELECT DISTINCT result_url FROM legs
+            WHERE status IN ('Won', 'Lost', 'Live')
+               OR (status = 'Pending' AND slip_id NOT IN (SELECT slip_id FROM legs WHERE status = 'Lost'))
+        """)
+        return {r[0] for r in rows if r[0] is not None}
+
+    def test_normal_set_tracks_save_update_delete(self, ba):
+        assert not ba.is_excluded("http://a")  # builds the set before any write
+        s1 = ba.save_slip("p", self._legs("http://a", "http://b"))
+        s2 = ba.save_slip("p", self._legs("http://b", "http://c"))
+        assert set(ba.get_excluded_urls()) == {"http://a", "http://b", "http://c"}
+
+        legs = {(r["slip_id"], r["result_url"]): r["leg_id"] for r in ba.fetch_rows("SELECT * FROM legs")}
+        ba.update_leg(legs[(s1, "http://a")], Outcome.LOST)  # slip 1 lost: its pending b no longer counts
+        assert ba.is_excluded("http://b")  # still pending in slip 2
+        ba.update_leg(legs[(s2, "http://c")], Outcome.LOST)
+        assert not ba.is_excluded("http://b")
+        assert set(ba.get_excluded_urls()) == self._sql_excluded(ba) == {"http://a", "http://c"}
+
+        ba.update_leg(legs[(s1, "http://a")], Outcome.PENDING)  # manual override revives slip 1
+        assert set(ba.get_excluded_urls()) == self._sql_excluded(ba) == {"http://a", "http://b", "http://c"}
+
+        ba.delete_slip(s1)
+        ba.delete_slip(s2)
+        assert ba.get_excluded_urls() == []
+
+    def test_edge_write_from_other_connection_rebuilds(self, ba, tmp_path):
+        assert ba.get_excluded_urls() == []
+        with BetAssistant(str(tmp_path / "slips.db")) as other:
+            other.save_slip("p", self._legs("http://other"))
+        assert ba.is_excluded("http://other")
+
+    def test_normal_legs_indexes_exist(self, ba):
+        names = {r[0] for r in ba.fetch_rows("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'legs'")}
+        assert {"idx_legs_slip_id", "idx_legs_status", "idx_legs_result_url"} <= names
+
+    def test_normal_auto_exclude_leaves_config_untouched(self, loaded_ba):
+        cfg = get_profile("medium_risk")
+        legs = loaded_ba.build_slip_auto_exclude(cfg)
+        assert legs
+        loaded_ba.save_slip("p", legs)
+        again = loaded_ba.build_slip_auto_exclude(cfg)
+        assert cfg.excluded_urls is None
+        assert not {leg.result_url for leg in legs} & {leg.result_url for leg in again}
+
 
 # ── _rows_to_slips ────────────────────────────────────────────────────────────
 
@@ -1051,6 +1505,25 @@ class TestContextManager:
         assert os.path.exists(path)
 
 
+# ── Storage profile ───────────────────────────────────────────────────────────
+
+
+class TestStorageProfile:
+    def test_normal_default_profile_keeps_rollback_journal(self, ba):
+        assert ba.conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+    def test_normal_named_profile_applied_on_open(self, tmp_path):
+        with BetAssistant(str(tmp_path / "wal.db"), storage_profile="wal_low_memory") as ba:
+            assert ba.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert ba.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert ba.conn.execute("PRAGMA cache_size").fetchone()[0] == -2048
+            assert ba.conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    def test_error_unknown_profile_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown storage profile"):
+            BetAssistant(str(tmp_path / "x.db"), storage_profile="turbo")
+
+
 # ── Complex Scenarios ─────────────────────────────────────────────────────────
 
 
@@ -0,0 +1,101 @@
+"""Tests for the MatchWriter queue between finder threads and MatchesManager."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from bet_framework.core.Match import Match, Score
+from bet_framework.MatchesManager import MatchesManager
+from bet_framework.MatchWriter import MatchWriter
+
+DT_BASE = datetime(2026, 4, 1, 15, 0, 0)
+
+
+def make_match(i: int) -> Match:
+    return Match(
+        home_team=f"Home {i}",
+        away_team=f"Away {i}",
+        datetime=DT_BASE,
+        predictions=[Score("src_a", 1, 0)],
+        odds=None,
+    )
+
+
+@pytest.fixture
+def manager(tmp_path):
+    m = MatchesManager(str(tmp_path / "chunk.db"), ingest=True)
+    yield m
+    m.close()
+
+
+class SlowManager:
+    """Stand-in manager whose add_match takes a while, to fill the queue."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.added: list[Match] = []
+        self.flushed = False
+
+    def add_match(self, match):
+        time.sleep(self.delay)
+        self.added.append(match)
+        return len(self.added) - 1
+
+    def flush(self) -> None:
+        self.flushed = True
+
+
+def test_threads_submit_and_close_flushes(manager):
+    with MatchWriter(manager, maxsize=8) as writer:
+        threads = [
+            threading.Thread(target=lambda base=t: [writer.submit(make_match(base * 50 + i)) for i in range(50)])
+            for t in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    metrics = writer.metrics()
+    assert (metrics.submitted, metrics.written, metrics.failed, metrics.depth) == (200, 200, 0, 0)
+    assert manager.fetch_rows("SELECT COUNT(*) FROM matches")[0][0] == 200  # flushed on close
+
+
+def test_full_queue_blocks_callers():
+    slow = SlowManager(delay=0.01)
+    with MatchWriter(slow, maxsize=1) as writer:
+        for i in range(10):
+            writer.submit(make_match(i))
+    metrics = writer.metrics()
+    assert metrics.blocked_puts > 0 and metrics.blocked_seconds > 0
+    assert metrics.max_depth == 1
+    assert [m.home_team for m in slow.added] == [f"Home {i}" for i in range(10)]
+    assert slow.flushed
+
+
+def test_failed_matches_are_counted_and_draining_continues():
+    slow = SlowManager(delay=0)
+    calls = iter([None, RuntimeError("boom")])
+
+    def add_match(match):
+        result = next(calls, 0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    slow.add_match = add_match
+    with MatchWriter(slow) as writer:
+        for i in range(3):
+            writer.submit(make_match(i))
+    assert writer.metrics()[:3] == (3, 1, 2)
+
+
+def test_submit_after_close_raises(manager):
+    writer = MatchWriter(manager).start()
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.submit(make_match(0))
@@ -11,14 +11,26 @@ Plus 5 complex integration scenarios at the bottom.
 import contextlib
 import json
 import os
+import random
 import sqlite3
+import zlib
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 import pandas as pd
 import pytest
 
+from bet_framework.core.matching import NearMissTracker, PairScoreCache, score_block
 from bet_framework.core.Match import Match, Odds, Score
-from bet_framework.MatchesManager import MatchesManager
+from bet_framework.core.team_names import TeamNameTable, soundex
+from bet_framework.MatchesManager import (
+    ODDS_MARKET_GROUPS,
+    ODDS_VALID_HIGH,
+    ODDS_VALID_LOW,
+    MatchesManager,
+    NearMiss,
+)
+from bet_framework.TeamRegistry import TeamRegistry
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -322,6 +334,30 @@ class TestFetchMatches:
         df = mm.fetch_matches()
         assert df.iloc[0]["scores"] == []
 
+    def test_edge_malformed_rows_dropped(self, mm):
+        mm.add_match(make_match("Good", "Row", preds=[Score("s1", 1, 0)], odds=Odds(home=1.5)))
+        for dt_value, preds in (("not-a-date", None), (None, "[]")):
+            mm.insert(
+                {
+                    "home_team_name": "Bad",
+                    "away_team_name": "Row",
+                    "datetime": dt_value,
+                    "predictions_scores": preds,
+                    "odds": None,
+                    "result_url": None,
+                    "league": None,
+                }
+            )
+        df = mm.fetch_matches()
+        assert list(df["home_name"]) == ["Good"]
+        assert df.iloc[0]["odds"]["home"] == 1.5
+
+    def test_edge_same_frame_without_orjson(self, populated_mm):
+        populated_mm.add_match(make_match("X", "Y", preds=[Score("s9", 0, 0)], odds=Odds(home=2.5, draw=3.1)))
+        expected = populated_mm.fetch_matches()
+        with patch("bet_framework.MatchesManager.orjson", None):
+            pd.testing.assert_frame_equal(populated_mm.fetch_matches(), expected)
+
 
 # ── reset_matches_db ──────────────────────────────────────────────────────────
 
@@ -375,6 +411,45 @@ class TestFlush:
         assert "idx_datetime" in index_names
         assert "idx_home_team" in index_names
 
+    def test_normal_flush_writes_only_changed_rows(self, mm):
+        for i in range(5):
+            mm.add_match(make_match(f"Home {i}", f"Away {i}", preds=[Score("s1", 1, 0)]))
+        mm.flush()
+        ids = list(mm.ensure_buffer()["id"])
+        assert all(pd.notna(ids))
+
+        mm.add_match(make_match("Home 2", "Away 2", preds=[Score("s2", 2, 2)]))
+        mm.add_match(make_match("New", "Row"))
+        statements = []
+        mm.conn.set_trace_callback(statements.append)
+        mm.flush()
+        mm.conn.set_trace_callback(None)
+
+        written = [s.split()[0] for s in statements if s.split()[0] in ("INSERT", "UPDATE", "DELETE")]
+        assert sorted(written) == ["INSERT", "UPDATE"]
+        row = mm.fetch_rows("SELECT * FROM matches WHERE home_team_name = ?", ("Home 2",))[0]
+        assert row["id"] == ids[2]
+        assert len(json.loads(row["predictions_scores"])) == 2
+        assert mm.fetch_rows("SELECT COUNT(*) AS n FROM matches")[0]["n"] == 6
+
+    def test_normal_flush_assigns_ids_to_new_rows(self, mm):
+        mm.add_match(make_match("A", "B"))
+        mm.flush()
+        buf = mm.ensure_buffer()
+        row = mm.fetch_rows("SELECT id FROM matches WHERE home_team_name = ?", ("A",))[0]
+        assert buf.iloc[0]["id"] == row["id"]
+        # A later update of the same row is an UPDATE, not a second INSERT
+        mm.add_match(make_match("A", "B", preds=[Score("s1", 1, 1)]))
+        mm.flush()
+        assert mm.fetch_rows("SELECT COUNT(*) AS n FROM matches")[0]["n"] == 1
+
+    def test_edge_replaced_buffer_rewritten_in_full(self, populated_mm):
+        populated_mm.flush()
+        populated_mm._buffer = populated_mm._buffer.iloc[:1].copy()
+        populated_mm._dirty = True
+        populated_mm.flush()
+        assert populated_mm.fetch_rows("SELECT COUNT(*) AS n FROM matches")[0]["n"] == 1
+
 
 # ── _find ─────────────────────────────────────────────────────────────────────
 
@@ -425,6 +500,217 @@ class TestFind:
         found, _ = mm_no_sim._find("Arsenaal", "Chelseea", DT_BASE)  # typos
         assert found is None  # no engine → fuzzy cannot find
 
+    def test_normal_date_index_tracks_direct_insert(self, mm):
+        mm.insert({"home_team_name": "Arsenal", "away_team_name": "Chelsea", "datetime": DT_BASE.isoformat()})
+        found, idx = mm._find("Arsenal", "Chelsea", DT_BASE)
+        assert found is not None
+        assert idx == 0
+
+    def test_edge_date_index_rebuilt_after_reset(self, mm):
+        mm.add_match(make_match("Arsenal", "Chelsea"))
+        mm.reset_matches_db()
+        found, _ = mm._find("Arsenal", "Chelsea", DT_BASE)
+        assert found is None
+        mm.add_match(make_match("Liverpool", "Everton"))
+        found, idx = mm._find("Liverpool", "Everton", DT_BASE)
+        assert found is not None
+        assert idx == 0
+
+    def test_edge_date_index_follows_datetime_update(self, mm_no_sim):
+        # Midnight placeholder on the previous day is refined to a specific kickoff
+        mm_no_sim.add_match(make_match("Arsenal", "Chelsea", dt=datetime(2026, 3, 31, 0, 0)))
+        mm_no_sim.add_match(make_match("Arsenal", "Chelsea", dt=datetime(2026, 4, 1, 20, 0)))
+        found, idx = mm_no_sim._find("Arsenal", "Chelsea", datetime(2026, 4, 2, 12, 0))
+        assert found is not None
+        assert idx == 0
+        assert "2026-04-01T20:00" in found["datetime"]
+
+    def test_normal_exact_key_hit_skips_similarity_engine(self, mm):
+        mm.add_match(make_match("Arsenal", "Chelsea"))
+        with patch.object(mm.similarity_engine, "is_similar") as mock_sim:
+            found, idx = mm._find("ARSENAL", "chelsea", DT_BASE + timedelta(days=1))
+        assert found is not None
+        assert idx == 0
+        assert mock_sim.call_count == 0
+        assert mm._exact_hits == 1
+
+    def test_edge_exact_key_prefers_earliest_row_in_window(self, mm_no_sim):
+        mm_no_sim.insert({"home_team_name": "Arsenal", "away_team_name": "Chelsea", "datetime": DT_BASE.isoformat()})
+        mm_no_sim.insert(
+            {
+                "home_team_name": "Arsenal",
+                "away_team_name": "Chelsea",
+                "datetime": (DT_BASE - timedelta(days=1)).isoformat(),
+            }
+        )
+        _, idx = mm_no_sim._find("Arsenal", "Chelsea", DT_BASE)
+        assert idx == 0
+
+
+# ── batched similarity scoring ────────────────────────────────────────────────
+
+
+def _reference_block(is_similar, home, away, homes, aways):
+    """Row-by-row scoring exactly as _find did before batching (parity oracle)."""
+    best, max_score, near = None, -1.0, []
+    for i, (rh, ra) in enumerate(zip(homes, aways, strict=True)):
+        ok_h, sc_h = is_similar(rh, home)
+        if not ok_h:
+            if sc_h >= 30:
+                _, sc_a = is_similar(ra, away)
+                combined = (sc_h + sc_a) / 2
+                if 40 <= combined < 65:
+                    near.append((i, combined))
+            continue
+        ok_a, sc_a = is_similar(ra, away)
+        if not ok_a:
+            combined = (sc_h + sc_a) / 2
+            if 40 <= combined < 65:
+                near.append((i, combined))
+            continue
+        avg = (sc_h + sc_a) / 2
+        if avg > max_score:
+            max_score, best = avg, i
+    return best, max_score, near
+
+
+def _hashed_scorer(a, b):
+    """Deterministic pseudo-random integer scores; ties are frequent on purpose."""
+    score = zlib.crc32(f"{a}|{b}".encode()) % 101
+    return score >= 65, score
+
+
+class TestBatchedScoring:
+    def test_normal_parity_with_row_by_row_scoring(self):
+        rng = random.Random(1234)
+        names = [f"Team {i}" for i in range(25)]
+        for _ in range(500):
+            size = rng.randint(0, 40)
+            homes = [rng.choice(names) for _ in range(size)]
+            aways = [rng.choice(names) for _ in range(size)]
+            home, away = rng.choice(names), rng.choice(names)
+            got = score_block(_hashed_scorer, home, away, homes, aways)
+            best, max_score, near = _reference_block(_hashed_scorer, home, away, homes, aways)
+            assert got.best == best
+            assert got.best_score == max_score
+            assert got.near_misses == near
+
+    def test_normal_parity_with_similarity_engine(self, mm):
+        homes = ["Manchester United", "Man City", "Liverpool", "Everton", "Leeds United", "Manchester Utd"]
+        aways = ["Liverpool FC", "Arsenal", "Manchester United", "Chelsea", "Newcastle", "Liverpool"]
+        engine = mm.similarity_engine.is_similar
+        for home, away in [("Manchester United FC", "Liverpool"), ("Leeds", "Newcastle Utd"), ("Everton", "Chelsea FC")]:
+            got = score_block(engine, home, away, homes, aways)
+            best, max_score, near = _reference_block(engine, home, away, homes, aways)
+            assert got.best == best
+            assert got.near_misses == near
+            if best is not None:
+                assert got.best_score == max_score
+
+    def test_normal_find_matches_reference_decision(self, mm):
+        pairs = [("Manchester United", "Liverpool"), ("Man City", "Arsenal"), ("Leeds United", "Newcastle")]
+        for i, (h, a) in enumerate(pairs):
+            mm.insert({"home_team_name": h, "away_team_name": a, "datetime": (DT_BASE + timedelta(hours=i)).isoformat()})
+        found, idx = mm._find("Manchester United FC", "Liverpool FC", DT_BASE)
+        best, _, near = _reference_block(
+            mm.similarity_engine.is_similar,
+            "Manchester United FC",
+            "Liverpool FC",
+            [h for h, _ in pairs],
+            [a for _, a in pairs],
+        )
+        assert idx == best
+        assert len(mm._near_misses) == len(near)
+
+    def test_edge_each_distinct_pair_scored_once(self):
+        calls = []
+
+        def scorer(a, b):
+            calls.append((a, b))
+            return _hashed_scorer(a, b)
+
+        score_block(scorer, "X", "Y", ["A", "A", "B", "A"], ["C", "C", "C", "D"])
+        assert len(calls) == len(set(calls))
+
+    def test_edge_empty_block(self):
+        got = score_block(_hashed_scorer, "X", "Y", [], [])
+        assert got.best is None
+        assert got.near_misses == []
+
+    def test_normal_pair_cache_memoises_and_evicts(self):
+        cache = PairScoreCache(_hashed_scorer, maxsize=2)
+        assert cache.is_similar("A", "B") == _hashed_scorer("A", "B")
+        cache.is_similar("A", "B")
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.is_similar("C", "D")
+        cache.is_similar("E", "F")
+        assert len(cache) == 2
+        cache.is_similar("A", "B")  # evicted → scored again
+        assert cache.misses == 4
+
+
+# ── normalised team names ─────────────────────────────────────────────────────
+
+NAME_CONFIG = {
+    **SIMILARITY_CONFIG,
+    "acronyms": {" fc": "", "fc ": "", "al ": "", " utd": ""},
+    "synonyms": {"man utd": "manchester united", "porto": "fc porto"},
+}
+
+
+class TestTeamNames:
+    def test_normal_normalisation_rules(self):
+        table = TeamNameTable(NAME_CONFIG)
+        assert table.normalized("Arsenal FC") == "arsenal"  # "al " is a token rule, not a suffix strip
+        assert table.normalized("FC  Porto") == "fc porto"
+        assert table.normalized("Man Utd") == "manchester united"
+        assert table.normalized("Al Ahly") == "ahly"
+
+    def test_normal_phonetic_key(self):
+        assert soundex("Robert") == soundex("Rupert") == "R163"
+        table = TeamNameTable(NAME_CONFIG)
+        assert table.phonetic("Steaua Bucuresti") == table.phonetic("Steaua Bucharest")
+
+    def test_normal_table_counts_hits_and_misses(self):
+        table = TeamNameTable(NAME_CONFIG)
+        table.normalized("Arsenal FC")
+        table.normalized("Arsenal FC")
+        table.phonetic("Arsenal FC")
+        assert (table.hits, table.misses) == (2, 1)
+
+    def test_normal_exact_key_is_case_insensitive_only(self, tmp_path):
+        manager = MatchesManager(str(tmp_path / "names.db"), similarity_config=NAME_CONFIG)
+        manager.add_match(make_match("Man Utd", "Arsenal FC", preds=[Score("s1", 1, 0)]))
+        with patch.object(manager.similarity_engine, "is_similar", return_value=(False, 0.0)) as mock_sim:
+            assert manager.add_match(make_match("MAN UTD", "arsenal fc", preds=[Score("s2", 2, 1)])) == 0
+            assert mock_sim.call_count == 0
+            # Synonyms / acronyms are left to the engine, never applied to the exact key
+            manager._find("Manchester United", "Arsenal", DT_BASE)
+            assert mock_sim.call_count > 0
+        manager.close()
+
+    def test_normal_fuzzy_search_scores_raw_names(self, tmp_path):
+        manager = MatchesManager(str(tmp_path / "names.db"), similarity_config=NAME_CONFIG)
+        manager.add_match(make_match("Arsenal FC", "Chelsea"))
+        with patch.object(manager.similarity_engine, "is_similar", return_value=(False, 0.0)) as mock_sim:
+            manager._find("Man Utd", "Chelsea FC", DT_BASE)
+            manager._find("Man Utd", "Chelsea FC", DT_BASE)
+        # The engine sees the names as scraped; a repeat is a pair-cache hit
+        assert [c.args for c in mock_sim.call_args_list] == [("Arsenal FC", "Man Utd")]
+        manager.close()
+
+    def test_edge_config_change_invalidates_names(self, tmp_path):
+        manager = MatchesManager(str(tmp_path / "names.db"), similarity_config=NAME_CONFIG)
+        manager.add_match(make_match("Man Utd", "Arsenal"))
+        manager.set_similarity_config(None)
+        assert manager.similarity_engine is None
+        assert manager.team_name_cache_info()["name_misses"] == 0
+        found, _ = manager._find("Manchester United", "Arsenal", DT_BASE)
+        assert found is None  # not an exact key, and no engine left to score it
+        found, _ = manager._find("man utd", "ARSENAL", DT_BASE)
+        assert found is not None
+        manager.close()
+
 
 # ── merge_databases ───────────────────────────────────────────────────────────
 
@@ -480,6 +766,139 @@ class TestMergeDatabases:
         sources = {p["source"] for p in preds}
         assert sources == {"src_a", "src_b"}
 
+    def test_normal_repeated_rows_bypass_similarity_engine(self, mm, tmp_path):
+        chunk_dir = tmp_path / "chunks"
+        chunk_dir.mkdir()
+        make_chunk_db(chunk_dir / "chunk1.db", [make_match("Arsenal", "Chelsea", preds=[Score("s1", 2, 1)])])
+        make_chunk_db(chunk_dir / "chunk2.db", [make_match("Arsenal", "Chelsea", preds=[Score("s2", 1, 1)])])
+        make_chunk_db(chunk_dir / "chunk3.db", [make_match("arsenal", "CHELSEA", preds=[Score("s3", 0, 0)])])
+        # A buffered fixture disables the SQL collapse, so every row takes the exact-key path
+        mm.add_match(make_match("Arsenal", "Chelsea", preds=[Score("s0", 3, 0)]))
+        with patch.object(mm.similarity_engine, "is_similar") as mock_sim:
+            mm.merge_databases(str(chunk_dir))
+        assert mock_sim.call_count == 0
+        assert mm._exact_hits == 3
+        buf = mm.ensure_buffer()
+        assert len(buf) == 1
+        assert len(json.loads(buf.iloc[0]["predictions_scores"])) == 4
+
+    def test_normal_exact_duplicates_collapsed_in_sql(self, mm, tmp_path):
+        chunk_dir = tmp_path / "chunks"
+        chunk_dir.mkdir()
+        make_chunk_db(
+            chunk_dir / "chunk1.db",
+            [
+                make_match(
+                    "Arsenal", "Chelsea", DT_BASE.replace(hour=0), [Score("s1", 2, 1)], odds=Odds(home=1.5, draw=3.2, away=4.0)
+                )
+            ],
+        )
+        make_chunk_db(chunk_dir / "chunk2.db", [make_match("arsenal", "CHELSEA", preds=[Score("s2", 1, 1)])])
+        make_chunk_db(
+            chunk_dir / "chunk3.db", [make_match("Arsenal", "Chelsea", preds=[Score("s3", 0, 0), Score("s4", 1, 0)])]
+        )
+        with patch.object(mm, "add_match", wraps=mm.add_match) as add:
+            mm.merge_databases(str(chunk_dir))
+        assert add.call_count == 1
+        row = mm.ensure_buffer().iloc[0]
+        assert row["home_team_name"] == "Arsenal"
+        assert row["datetime"] == DT_BASE.isoformat()  # midnight placeholder replaced by the kickoff
+        assert [p["source"] for p in json.loads(row["predictions_scores"])] == ["s1", "s2", "s3", "s4"]
+        assert json.loads(row["odds"])["home"] == 1.5
+
+    def test_edge_source_collision_not_collapsed_in_sql(self, mm, tmp_path):
+        chunk_dir = tmp_path / "chunks"
+        chunk_dir.mkdir()
+        make_chunk_db(chunk_dir / "chunk1.db", [make_match("Arsenal", "Chelsea", preds=[Score("s1", 2, 1)])])
+        make_chunk_db(chunk_dir / "chunk2.db", [make_match("Arsenal", "Chelsea", preds=[Score("s1", 0, 0)])])
+        make_chunk_db(chunk_dir / "chunk3.db", [make_match("Liverpool", "Everton", preds=[Score("s1", 1, 1)])])
+        with patch.object(mm, "add_match", wraps=mm.add_match) as add:
+            mm.merge_databases(str(chunk_dir))
+        assert add.call_count == 3
+        # add_match resolves the collision as before: first prediction per source kept
+        buf = mm.ensure_buffer()
+        preds = json.loads(buf[buf["home_team_name"] == "Arsenal"].iloc[0]["predictions_scores"])
+        assert [(p["source"], p["home"]) for p in preds] == [("s1", 2)]
+
+    def test_edge_collapse_matches_sequential_with_fuzzy_neighbour(self, tmp_path):
+        """An exact group interleaved with a fuzzy neighbour merges as add_match row by row would."""
+        chunks = {
+            "chunk1.db": [
+                make_match("Arsenal", "Chelsea", preds=[Score("s1", 2, 1)], odds=Odds(home=1.5)),
+                make_match("Arsenal London", "Chelsea", DT_BASE + timedelta(hours=2), [Score("s2", 1, 1)]),
+                make_match("Aston Villa", "Brentford", DT_BASE + timedelta(days=3), [Score("s1", 1, 2)], Odds(home=2.1)),
+                # Both names spelled differently: shares no exact name with the group
+                make_match(
+                    "Aston Villa Birmingham", "Brentford London", DT_BASE + timedelta(days=3, hours=2), [Score("s2", 0, 1)]
+                ),
+                make_match("Everton", "Fulham", DT_BASE + timedelta(days=5), [Score("s1", 0, 0)]),
+            ],
+            "chunk2.db": [
+                make_match("arsenal", "CHELSEA", preds=[Score("s3", 0, 2)]),
+                make_match("ASTON VILLA", "brentford", DT_BASE + timedelta(days=3), [Score("s3", 2, 2)]),
+                make_match("Everton", "Fulham", DT_BASE + timedelta(days=5), [Score("s2", 1, 0)]),
+            ],
+        }
+        chunk_dir = tmp_path / "chunks"
+        chunk_dir.mkdir()
+        for name, matches in chunks.items():
+            make_chunk_db(chunk_dir / name, matches)
+
+        merged = MatchesManager(str(tmp_path / "merged.db"), similarity_config=SIMILARITY_CONFIG)
+        with patch.object(merged, "add_match", wraps=merged.add_match) as add:
+            merged.merge_databases(str(chunk_dir))
+        assert add.call_count == 7  # Everton - Fulham (no other row within a day) is still folded
+        sequential = MatchesManager(str(tmp_path / "seq.db"), similarity_config=SIMILARITY_CONFIG)
+        for matches in chunks.values():
+            for match in matches:
+                sequential.add_match(match)
+        sequential.flush()
+
+        columns = ["home_team_name", "away_team_name", "datetime", "predictions_scores", "odds"]
+        pd.testing.assert_frame_equal(merged.ensure_buffer()[columns], sequential.ensure_buffer()[columns])
+        assert len(merged.ensure_buffer()) == 3
+        merged.close()
+        sequential.close()
+
+    def test_normal_partitioned_merge_matches_sequential(self, tmp_path):
+        chunk_dir = tmp_path / "chunks"
+        chunk_dir.mkdir()
+        day = datetime(2026, 4, 1)
+        make_chunk_db(
+            chunk_dir / "a.db",
+            [
+                make_match("Manchester United", "Liverpool", day, [Score("s1", 2, 0)]),
+                make_match("Leeds United", "Everton", day + timedelta(days=1, hours=18), [Score("s1", 1, 1)]),
+                make_match("Porto", "Benfica", day + timedelta(days=5, hours=20), [Score("s1", 0, 1)]),
+            ],
+        )
+        make_chunk_db(
+            chunk_dir / "b.db",
+            [
+                make_match("Manchester United FC", "Liverpool", day + timedelta(hours=20), [Score("s2", 1, 1)]),
+                make_match("Leeds Utd", "Everton FC", day + timedelta(days=1, hours=18), [Score("s2", 2, 2)]),
+                make_match("Benfica", "Porto", day + timedelta(days=5, hours=20), [Score("s2", 3, 1)]),
+            ],
+        )
+        # Midnight placeholder on day 8 moves to day 9 (kickoff known), then meets day 10
+        make_chunk_db(
+            chunk_dir / "c.db",
+            [
+                make_match("Sporting Braga", "Vitoria", day + timedelta(days=8), [Score("s3", 1, 0)]),
+                make_match("SPORTING BRAGA", "Vitoria", day + timedelta(days=9, hours=21), [Score("s4", 1, 0)]),
+                make_match("Sporting Braga FC", "Vitoria", day + timedelta(days=10, hours=1), [Score("s5", 2, 0)]),
+            ],
+        )
+        sequential = MatchesManager(str(tmp_path / "seq.db"), similarity_config=SIMILARITY_CONFIG)
+        sequential.merge_databases(str(chunk_dir))
+        partitioned = MatchesManager(str(tmp_path / "part.db"), similarity_config=SIMILARITY_CONFIG)
+        partitioned.merge_databases(str(chunk_dir), workers=2)
+
+        pd.testing.assert_frame_equal(sequential.ensure_buffer(), partitioned.ensure_buffer())
+        assert partitioned.team_name_cache_info()["pair_misses"] == 0  # every score came from the pool
+        sequential.close()
+        partitioned.close()
+
     def test_edge_empty_directory_is_noop(self, mm, tmp_path):
         empty_dir = tmp_path / "empty_chunks"
         empty_dir.mkdir()
@@ -500,6 +919,296 @@ class TestMergeDatabases:
         assert odds["home"] == 1.5
 
 
+# ── odds validation ───────────────────────────────────────────────────────────
+
+
+def _reference_issues(rows):
+    """Row-by-row implied-probability check, as the scan did before the NumPy kernel."""
+    issues = []
+    for home, away, odds in rows:
+        for label, fields in ODDS_MARKET_GROUPS:
+            values = [odds.get(f) for f, _ in fields]
+            if any(v is None or not isinstance(v, (int, float)) or v <= 0 for v in values):
+                continue
+            implied = sum(1.0 / v for v in values) * 100.0
+            if not ODDS_VALID_LOW <= implied <= ODDS_VALID_HIGH:
+                vals = {lbl: float(odds[f]) for f, lbl in fields}
+                issues.append((home, away, label, round(implied, 2), vals))
+    return issues
+
+
+class TestOddsValidation:
+    def test_normal_vectorised_scan_matches_row_by_row(self, mm):
+        rng = random.Random(3)
+        fields = [f for _, group in ODDS_MARKET_GROUPS for f, _ in group]
+        rows = []
+        for i in range(300):
+            odds = {f: rng.choice([round(rng.uniform(1.01, 9.0), 2), None, -1.0, "2.0", 0]) for f in fields}
+            odds.update({f: round(rng.uniform(1.2, 4.0), 2) for f in ("home", "draw", "away")} if i % 2 else {})
+            rows.append((f"H{i}", f"A{i}", odds))
+            mm.insert(
+                {
+                    "home_team_name": f"H{i}",
+                    "away_team_name": f"A{i}",
+                    "datetime": DT_BASE.isoformat(),
+                    "odds": json.dumps(odds),
+                }
+            )
+        mm.insert({"home_team_name": "H", "away_team_name": "A", "datetime": DT_BASE.isoformat(), "odds": None})
+
+        got = [tuple(issue) for issue in mm._validate_all_odds()]
+        assert got == _reference_issues(rows)
+        assert got  # the random prices do produce out-of-range books
+
+    def test_edge_empty_buffer(self, mm):
+        assert mm._validate_all_odds() == []
+
+    def test_normal_update_rejects_implausible_group(self, mm):
+        mm.add_match(make_match("Arsenal", "Chelsea", preds=[Score("s1", 1, 0)], odds=Odds(home=2.0)))
+        # 1/2.0 + 1/1.1 + 1/1.1 → 232 %: the completed 1X2 book is rejected, the other market kept
+        mm.add_match(make_match("Arsenal", "Chelsea", preds=[Score("s2", 1, 0)], odds=Odds(draw=1.1, away=1.1, btts_y=1.8)))
+        odds = json.loads(mm.ensure_buffer().iloc[0]["odds"])
+        assert odds["draw"] is None and odds["away"] is None
+        assert odds["btts_y"] == 1.8
+
+
+# ── columnar odds ─────────────────────────────────────────────────────────────
+
+
+class TestColumnarOdds:
+    def test_normal_migration_backfills_price_columns(self, tmp_path):
+        path = str(tmp_path / "odds.db")
+        legacy = MatchesManager(path)
+        legacy.add_match(make_match("Arsenal", "Chelsea", odds=Odds(home=1.8, draw=3.5, away=4.2)))
+        legacy.close()
+
+        manager = MatchesManager(path, columnar_odds=True)
+        row = manager.fetch_rows("SELECT odds_home, odds_draw, odds_btts_y FROM matches")[0]
+        assert (row["odds_home"], row["odds_draw"], row["odds_btts_y"]) == (1.8, 3.5, None)
+        manager.close()
+
+    def test_normal_prices_read_from_columns_and_dual_written(self, tmp_path):
+        manager = MatchesManager(str(tmp_path / "odds.db"), columnar_odds=True)
+        manager.add_match(make_match("Arsenal", "Chelsea", odds=Odds(home=1.8)))
+        manager.add_match(make_match("Arsenal", "Chelsea", odds=Odds(draw=3.5, away=4.2)))
+        manager.flush()
+        row = manager.fetch_rows("SELECT odds, odds_home, odds_away FROM matches")[0]
+        assert (row["odds_home"], row["odds_away"]) == (1.8, 4.2)
+        assert json.loads(row["odds"])["draw"] == 3.5  # JSON layout kept in step
+        odds = manager.fetch_matches().iloc[0]["odds"]
+        assert (odds["home"], odds["draw"], odds["away"]) == (1.8, 3.5, 4.2)
+        manager.close()
+
+    def test_edge_migrated_db_stays_columnar(self, tmp_path):
+        path = str(tmp_path / "odds.db")
+        MatchesManager(path, columnar_odds=True).close()
+        manager = MatchesManager(path)
+        manager.add_match(make_match("A", "B", odds=Odds(home=2.0)))
+        manager.flush()
+        assert manager.fetch_rows("SELECT odds_home FROM matches")[0]["odds_home"] == 2.0
+        manager.close()
+
+
+# ── compact buffer ────────────────────────────────────────────────────────────
+
+
+class TestCompactBuffer:
+    def _seed(self, path):
+        seed = MatchesManager(path)
+        seed.add_match(make_match("Arsenal", "Chelsea", odds=Odds(home=1.8), url="http://x/1"))
+        seed.add_match(make_match("Everton", "Fulham", dt=DT_BASE.replace(hour=0)))
+        seed.close()
+
+    def test_normal_loaded_columns_are_categorical(self, tmp_path):
+        path = str(tmp_path / "compact.db")
+        self._seed(path)
+        manager = MatchesManager(path, compact_buffer=True)
+        buf = manager.ensure_buffer()
+        for col in ("home_team_name", "away_team_name", "datetime", "league"):
+            assert isinstance(buf[col].dtype, pd.CategoricalDtype)
+        expected = MatchesManager(path).fetch_matches()
+        pd.testing.assert_frame_equal(manager.fetch_matches(), expected)
+        report = manager.memory_report()
+        assert report["rows"] == 2 and report["total_bytes"] > 0
+        manager.close()
+
+    def test_normal_updates_and_inserts_on_compact_buffer(self, tmp_path):
+        path = str(tmp_path / "compact.db")
+        self._seed(path)
+        manager = MatchesManager(path, compact_buffer=True)
+        match = make_match("Everton", "Fulham")
+        match.league = "Premier League"
+        manager.add_match(match)  # new league category + kickoff moves off midnight
+        buf = manager.ensure_buffer()
+        assert buf.iloc[1]["league"] == "Premier League"
+        assert buf.iloc[1]["datetime"] == DT_BASE.isoformat()
+
+        manager.add_match(make_match("Leeds", "Wolves"))
+        manager.add_match(make_match("Arsenal", "Chelsea", odds=Odds(draw=3.5)))
+        buf = manager.ensure_buffer()
+        assert len(buf) == 3
+        assert not isinstance(buf["home_team_name"].dtype, pd.CategoricalDtype)
+        manager.flush()
+        assert manager.fetch_rows("SELECT COUNT(*) FROM matches")[0][0] == 3
+        manager.close()
+
+
+# ── ingest mode ───────────────────────────────────────────────────────────────
+
+
+def make_ingested_chunk(path):
+    """Chunk written in ingest mode: one exact repeat, one spelling only a fuzzy match would join."""
+    chunk = MatchesManager(str(path), similarity_config=SIMILARITY_CONFIG, ingest=True)
+    chunk.add_match(make_match("Manchester United", "Chelsea", preds=[Score("src_a", 2, 1)]))
+    chunk.add_match(make_match("Man Utd", "Chelsea", preds=[Score("src_b", 1, 1)]))
+    chunk.add_match(make_match("manchester united", "CHELSEA", preds=[Score("src_c", 0, 0)]))
+    chunk.close()
+
+
+class TestIngestMode:
+    def test_normal_ingest_collapses_exact_repeats_only(self, tmp_path):
+        make_ingested_chunk(tmp_path / "chunk.db")
+        chunk = MatchesManager(str(tmp_path / "chunk.db"), similarity_config=SIMILARITY_CONFIG, ingest=True)
+        assert chunk.similarity_engine is None
+        buf = chunk.ensure_buffer()
+        assert list(buf["home_team_name"]) == ["Manchester United", "Man Utd"]
+        assert {p["source"] for p in json.loads(buf.iloc[0]["predictions_scores"])} == {"src_a", "src_c"}
+        chunk.close()
+
+    def test_normal_merge_reconciles_ingested_rows(self, mm, tmp_path):
+        chunk_dir = tmp_path / "chunks"
+        chunk_dir.mkdir()
+        make_ingested_chunk(chunk_dir / "chunk1.db")
+        with patch.object(mm.similarity_engine, "is_similar", return_value=(True, 90.0)):
+            mm.merge_databases(str(chunk_dir))
+        buf = mm.ensure_buffer()
+        assert len(buf) == 1
+        assert {p["source"] for p in json.loads(buf.iloc[0]["predictions_scores"])} == {"src_a", "src_b", "src_c"}
+
+
+# ── decoded JSON cells ────────────────────────────────────────────────────────
+
+
+class TestJsonCellCache:
+    def test_normal_updates_reuse_decoded_cells(self, mm):
+        mm.add_match(make_match("Arsenal", "Chelsea", preds=[Score("src_a", 2, 1)], odds=Odds(home=1.8)))
+        mm.add_match(make_match("Arsenal", "Chelsea", preds=[Score("src_b", 1, 1)], odds=Odds(draw=3.5)))
+        mm.add_match(make_match("Arsenal", "Chelsea", preds=[Score("src_c", 0, 1)], odds=Odds(away=4.2)))
+        info = mm.json_cache_info()
+        assert info["decodes"] == 0  # the inserted row seeded the cache
+        assert info["stores"] == 4 and info["encodes"] == 0
+
+        buf = mm.ensure_buffer()  # reading the buffer writes the cells back
+        assert {p["source"] for p in json.loads(buf.iloc[0]["predictions_scores"])} == {"src_a", "src_b", "src_c"}
+        odds = json.loads(buf.iloc[0]["odds"])
+        assert (odds["home"], odds["draw"], odds["away"]) == (1.8, 3.5, 4.2)
+        assert mm.json_cache_info()["encodes"] == 2
+
+    def test_normal_loaded_row_decoded_once_and_flushed(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        seed = MatchesManager(path)
+        seed.add_match(make_match("Arsenal", "Chelsea", preds=[Score("src_a", 2, 1)], odds=Odds(home=1.8)))
+        seed.close()
+
+        manager = MatchesManager(path)
+        manager.add_match(make_match("Arsenal", "Chelsea", preds=[Score("src_b", 1, 1)], odds=Odds(draw=3.5)))
+        manager.add_match(make_match("Arsenal", "Chelsea", preds=[Score("src_c", 0, 1)], odds=Odds(away=4.2)))
+        info = manager.json_cache_info()
+        assert info["decodes"] == 2  # predictions + odds, once each
+        assert info["decode_hits"] == 4
+        manager.flush()
+        row = manager.fetch_rows("SELECT predictions_scores, odds FROM matches")[0]
+        assert len(json.loads(row["predictions_scores"])) == 3
+        assert json.loads(row["odds"])["away"] == 4.2
+        manager.close()
+
+
+# ── near misses / team registry ──────────────────────────────────────────────
+
+
+class TestNearMisses:
+    def test_normal_tracker_keeps_top_k_deduplicated(self):
+        tracker = NearMissTracker(limit=2)
+        assert tracker.add("a", 50.0, "a1")
+        assert tracker.add("b", 45.0, "b1")
+        assert tracker.add("a", 60.0, "a2")  # repeat key keeps the better score
+        assert not tracker.add("c", 40.0, "c1")  # below the current top 2
+        assert tracker.add("d", 55.0, "d1")  # evicts b
+        assert tracker.items() == ["a2", "d1"]
+        for i in range(100):
+            tracker.add("a", 61.0 + i, f"a{i}")
+        assert len(tracker) == 2
+        assert len(tracker._heap) <= 4
+
+    def test_normal_merge_near_misses_persisted_per_run(self, tmp_path):
+        registry_path = str(tmp_path / "teams.db")
+        for run in range(2):
+            manager = MatchesManager(str(tmp_path / f"run{run}.db"), NAME_CONFIG, registry_path=registry_path)
+            manager._track_near_miss(NearMiss("Wolves", "Everton", "Wolverhampton", "Everton", 55.0, "", ""))
+            manager._track_near_miss(NearMiss("Wolves FC", "Everton", "Wolverhampton", "Everton", 52.0, "", ""))
+            manager._persist_near_misses()
+            manager.close()
+
+        registry = TeamRegistry(registry_path)
+        rows = registry.fetch_rows("SELECT name_a, name_b, runs, hits, best_score FROM near_miss_candidates")
+        assert [tuple(r) for r in rows] == [("wolverhampton", "wolves", 2, 2, 55.0)]  # "Wolves FC" is the same near miss
+        registry.close()
+
+    def test_normal_synonym_suggestions(self, tmp_path):
+        registry = TeamRegistry(str(tmp_path / "teams.db"))
+        for _ in range(3):
+            registry.record_near_misses([("man utd", "manchester united", 58.0), ("spurs", "tottenham", 45.0)], "2026-04-01")
+        registry.record_near_misses([("inter", "internazionale", 60.0)], "2026-04-01")
+
+        suggestions = registry.synonym_suggestions(min_runs=3, min_score=50.0)
+        assert [(s.name, s.canonical, s.runs) for s in suggestions] == [("man utd", "manchester united", 3)]
+        assert registry.synonym_suggestions(min_runs=3, min_score=50.0, known={"man utd": "manchester united"}) == []
+        registry.close()
+
+
+class TestAliasRegistry:
+    def test_normal_accepted_fuzzy_match_is_learned_for_later_runs(self, tmp_path):
+        registry_path = str(tmp_path / "teams.db")
+        first = MatchesManager(str(tmp_path / "run0.db"), SIMILARITY_CONFIG, registry_path=registry_path)
+        first.add_match(make_match("Manchester United", "Liverpool"))
+        with patch.object(first.similarity_engine, "is_similar", return_value=(True, 90.0)):
+            first.add_match(make_match("Manchester United FC", "Liverpool FC"))
+        assert len(first.ensure_buffer()) == 1
+        first.close()
+
+        second = MatchesManager(str(tmp_path / "run1.db"), SIMILARITY_CONFIG, registry_path=registry_path)
+        second.add_match(make_match("Manchester United", "Liverpool"))
+        with patch.object(second.similarity_engine, "is_similar") as mock_sim:
+            idx = second.add_match(make_match("Manchester United FC", "Liverpool FC", dt=DT_BASE + timedelta(hours=2)))
+        assert idx == 0
+        assert mock_sim.call_count == 0  # answered by the exact-key index through the aliases
+        second.close()
+
+    def test_normal_unlink_blocks_relearning_and_set_alias_corrects(self, tmp_path):
+        registry = TeamRegistry(str(tmp_path / "teams.db"))
+        assert registry.add_aliases([("arsenal u21", "arsenal"), ("gunners", "arsenal")], "2026-04-01") == 2
+        assert registry.unlink_alias("arsenal u21", "2026-04-02")
+        assert registry.alias_map() == {"gunners": "arsenal"}
+        assert registry.add_aliases([("arsenal u21", "arsenal")], "2026-04-03") == 0
+        assert registry.blocked_aliases() == {"arsenal u21"}
+
+        registry.set_alias("arsenal u21", "arsenal youth", "2026-04-04")
+        assert registry.alias_map()["arsenal u21"] == "arsenal youth"
+        assert [(a.alias, a.source) for a in registry.aliases("arsenal")] == [("gunners", "fuzzy")]
+        registry.close()
+
+    def test_edge_canonical_names_never_become_aliases(self, tmp_path):
+        registry_path = str(tmp_path / "teams.db")
+        seed = TeamRegistry(registry_path)
+        seed.add_aliases([("man utd", "manchester united")], "2026-04-01")
+        seed.close()
+
+        manager = MatchesManager(str(tmp_path / "m.db"), SIMILARITY_CONFIG, registry_path=registry_path)
+        manager._learn_aliases("Manchester United", "Liverpool", "Manchester Utd", "Liverpool")
+        assert manager._pending_aliases == {}
+        manager.close()
+
+
 # ── Complex Scenarios ─────────────────────────────────────────────────────────
 
 
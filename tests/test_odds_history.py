@@ -1,15 +1,19 @@
-"""Tests for embedded odds history tracking functionality."""
+"""Tests for odds history tracking functionality."""
 
 from __future__ import annotations
 
 import json
 import os
+import sqlite3
 import tempfile
 from datetime import datetime, timedelta
 
 import pytest
 
+from bet_framework.BetAssistant import BetAssistant
+from bet_framework.core.Match import Match, Odds
 from bet_framework.MatchesManager import MatchesManager
+from bet_framework.TeamRegistry import TeamRegistry
 
 
 @pytest.fixture
@@ -81,57 +85,66 @@ class TestGetCurrentOddsSnapshot:
         assert MatchesManager._get_current_odds_snapshot(None) == {}
 
 
-class TestAppendToHistory:
-    """Test _append_to_history helper."""
+class TestOddsHistoryTable:
+    """Test the append-only odds_history table."""
 
-    def test_append_first_snapshot(self):
-        odds = {"home": 1.5, "draw": 3.0}
-        snapshot = {"ts": "2026-05-18T10:00:00", "home": 1.6, "draw": 3.1}
-        result = MatchesManager._append_to_history(odds, snapshot, max_entries=3)
+    def test_record_and_read_snapshots(self, manager):
+        key = manager.history_key("Team A", "Team B", "2026-05-20T18:00:00")
+        manager.record_odds_snapshot(key, "2026-05-18T10:00:00", {"home": 1.6, "draw": 3.0, "away": None})
+        manager.record_odds_snapshot(key, "2026-05-17T10:00:00", {"home": 1.7, "history": []})
 
-        assert "history" in result
-        assert len(result["history"]) == 1
-        assert result["history"][0]["ts"] == "2026-05-18T10:00:00"
-        assert result["home"] == 1.5  # Current values preserved
+        history = manager.odds_history(key)
+        assert history == [
+            {"ts": "2026-05-17T10:00:00", "home": 1.7},
+            {"ts": "2026-05-18T10:00:00", "home": 1.6, "draw": 3.0},
+        ]
 
-    def test_append_to_existing_history(self):
-        odds = {
-            "home": 1.5,
-            "history": [{"ts": "2026-05-17T10:00:00", "home": 1.7}],
-        }
-        snapshot = {"ts": "2026-05-18T10:00:00", "home": 1.6}
-        result = MatchesManager._append_to_history(odds, snapshot, max_entries=3)
+    def test_history_key_ignores_case_and_time(self, manager):
+        a = manager.history_key("Team A", "Team B", "2026-05-20T18:00:00")
+        b = manager.history_key("team a", "TEAM B", datetime(2026, 5, 20, 20, 30))
+        assert a == b
+        assert manager.history_key("Team A", "Team B", "not a date") is None
+        assert manager.odds_history(None) == []
 
-        assert len(result["history"]) == 2
-        assert result["history"][0]["ts"] == "2026-05-17T10:00:00"
-        assert result["history"][1]["ts"] == "2026-05-18T10:00:00"
+    def test_prune_applies_time_retention(self, manager):
+        key = manager.history_key("Team A", "Team B", "2026-05-20T18:00:00")
+        for day in (10, 15, 18):
+            manager.record_odds_snapshot(key, f"2026-05-{day}T10:00:00", {"home": 1.5})
 
-    def test_append_trims_to_max_entries(self):
-        odds = {
-            "home": 1.5,
-            "history": [
-                {"ts": "2026-05-16T10:00:00", "home": 1.8},
-                {"ts": "2026-05-17T10:00:00", "home": 1.7},
-                {"ts": "2026-05-18T10:00:00", "home": 1.6},
-            ],
-        }
-        snapshot = {"ts": "2026-05-19T10:00:00", "home": 1.55}
-        result = MatchesManager._append_to_history(odds, snapshot, max_entries=3)
+        assert manager.prune_odds_history("2026-05-14T00:00:00") == 1
+        assert [h["ts"][:10] for h in manager.odds_history(key)] == ["2026-05-15", "2026-05-18"]
 
-        assert len(result["history"]) == 3
-        # Oldest entry should be trimmed
-        assert result["history"][0]["ts"] == "2026-05-17T10:00:00"
-        assert result["history"][2]["ts"] == "2026-05-19T10:00:00"
+    def test_prune_uses_ts_index(self, manager):
+        plan = manager.conn.execute("EXPLAIN QUERY PLAN DELETE FROM odds_history WHERE ts < ?", ("2026-05-14",)).fetchall()
+        assert any("idx_odds_history_ts" in row[-1] for row in plan)
 
-    def test_append_empty_snapshot_returns_unchanged(self):
-        odds = {"home": 1.5}
-        result = MatchesManager._append_to_history(odds, {}, max_entries=3)
-        assert result == odds
+    def test_history_reads_use_covering_index(self, manager):
+        plan = manager.fetch_rows(
+            "EXPLAIN QUERY PLAN SELECT ts, market, value FROM odds_history WHERE match_key = ? ORDER BY ts", ("k",)
+        )
+        assert "COVERING INDEX idx_odds_history" in " ".join(r["detail"] for r in plan)
+
+    def test_embedded_history_migrated_on_open(self, temp_db):
+        legacy = MatchesManager(temp_db)
+        legacy.ensure_buffer()
+        legacy.insert(
+            {
+                "home_team_name": "Team A",
+                "away_team_name": "Team B",
+                "datetime": "2026-05-20T18:00:00",
+                "predictions_scores": None,
+                "odds": json.dumps({"home": 1.5, "history": [{"ts": "2026-05-17T10:00:00", "home": 1.6}]}),
+                "result_url": None,
+                "league": None,
+            }
+        )
+        legacy.close()
 
-    def test_append_snapshot_with_only_ts_returns_unchanged(self):
-        odds = {"home": 1.5}
-        result = MatchesManager._append_to_history(odds, {"ts": "2026-05-18T10:00:00"}, max_entries=3)
-        assert result == odds
+        reopened = MatchesManager(temp_db)
+        odds = json.loads(reopened.fetch_rows("SELECT odds FROM matches")[0]["odds"])
+        assert odds == {"home": 1.5}
+        assert reopened.get_odds_history_from_row(0) == [{"timestamp": "2026-05-17T10:00:00", "odds": {"home": 1.6}}]
+        reopened.close()
 
 
 class TestCalculateMovementFromOdds:
@@ -200,27 +213,22 @@ class TestGetOddsHistoryFromRow:
         assert result == []
 
     def test_get_history_converts_format(self, manager):
-        # Insert a match with embedded history
+        match_dt = datetime.now().isoformat()
         manager.ensure_buffer()
         manager.insert(
             {
                 "home_team_name": "Team A",
                 "away_team_name": "Team B",
-                "datetime": datetime.now().isoformat(),
+                "datetime": match_dt,
                 "predictions_scores": None,
-                "odds": json.dumps(
-                    {
-                        "home": 1.5,
-                        "history": [
-                            {"ts": "2026-05-17T10:00:00", "home": 1.6, "draw": 3.0},
-                            {"ts": "2026-05-18T10:00:00", "home": 1.55, "draw": 3.1},
-                        ],
-                    }
-                ),
+                "odds": json.dumps({"home": 1.5}),
                 "result_url": None,
                 "league": None,
             }
         )
+        key = manager.history_key("Team A", "Team B", match_dt)
+        manager.record_odds_snapshot(key, "2026-05-17T10:00:00", {"home": 1.6, "draw": 3.0})
+        manager.record_odds_snapshot(key, "2026-05-18T10:00:00", {"home": 1.55, "draw": 3.1})
 
         result = manager.get_odds_history_from_row(0)
         assert len(result) == 2
@@ -228,6 +236,41 @@ class TestGetOddsHistoryFromRow:
         assert result[0]["odds"]["home"] == 1.6
         assert "ts" not in result[0]["odds"]  # ts should not be in odds dict
 
+    def test_history_survives_midnight_placeholder_move(self, manager):
+        """A midnight placeholder moving to the next day takes its history along."""
+        day = datetime(2026, 5, 20)
+        manager.add_match(Match("Team A", "Team B", day, [], Odds(home=1.5)))
+        manager.record_odds_snapshot(manager.history_key("Team A", "Team B", day), "2026-05-18T10:00:00", {"home": 1.6})
+
+        manager.add_match(Match("Team A", "Team B", day + timedelta(days=1, hours=1), [], Odds(home=1.5)))
+
+        assert manager.ensure_buffer().iloc[0]["datetime"].startswith("2026-05-21")
+        assert [h["odds"]["home"] for h in manager.get_odds_history_from_row(0)] == [1.6]
+        assert manager.odds_history(manager.history_key("Team A", "Team B", day)) == []
+
+    def test_history_survives_alias_changes(self, temp_db, tmp_path):
+        """Learning or unlinking a team alias leaves the history key alone."""
+        registry_path = str(tmp_path / "teams.db")
+        mgr = MatchesManager(temp_db, registry_path=registry_path)
+        mgr.add_match(Match("Team A", "Team B", datetime(2026, 5, 20, 18), [], Odds(home=1.5)))
+        mgr.flush()
+        key = mgr.history_key("Team A", "Team B", "2026-05-20T18:00:00")
+        mgr.record_odds_snapshot(key, "2026-05-18T10:00:00", {"home": 1.6})
+        mgr.close()
+
+        for change in ("link", "unlink"):
+            registry = TeamRegistry(registry_path)
+            if change == "link":
+                registry.set_alias("team a", "alpha", "2026-05-19")
+            else:
+                registry.unlink_alias("team a", "2026-05-19")
+            registry.close()
+
+            mgr = MatchesManager(temp_db, registry_path=registry_path)
+            assert mgr.history_key("Team A", "Team B", "2026-05-20T18:00:00") == key
+            assert [h["odds"]["home"] for h in mgr.get_odds_history_from_row(0)] == [1.6]
+            mgr.close()
+
 
 class TestGetMovementForRow:
     """Test get_movement_for_row method."""
@@ -237,24 +280,21 @@ class TestGetMovementForRow:
         assert result == {}
 
     def test_get_movement_with_data(self, manager):
+        match_dt = datetime.now().isoformat()
         manager.ensure_buffer()
         manager.insert(
             {
                 "home_team_name": "Team A",
                 "away_team_name": "Team B",
-                "datetime": datetime.now().isoformat(),
+                "datetime": match_dt,
                 "predictions_scores": None,
-                "odds": json.dumps(
-                    {
-                        "home": 1.6,
-                        "draw": 3.0,
-                        "history": [{"ts": "2026-05-17T10:00:00", "home": 1.5, "draw": 3.0}],
-                    }
-                ),
+                "odds": json.dumps({"home": 1.6, "draw": 3.0}),
                 "result_url": None,
                 "league": None,
             }
         )
+        key = manager.history_key("Team A", "Team B", match_dt)
+        manager.record_odds_snapshot(key, "2026-05-17T10:00:00", {"home": 1.5, "draw": 3.0})
 
         result = manager.get_movement_for_row(0)
         assert result["home"] == "up"
@@ -311,20 +351,21 @@ class TestMergeWithHistoryPreservation:
         fresh_manager.close()
 
         # Merge with history preservation
-        current_manager.merge_with_history_preservation(fresh_db, max_history=3, local_tz="UTC")
+        current_manager.merge_with_history_preservation(fresh_db, history_days=4, local_tz="UTC")
 
-        # Check that history was transferred
+        # Check that history was recorded
         buf = current_manager.ensure_buffer()
         assert len(buf) == 1
 
-        odds_json = buf.iloc[0]["odds"]
-        odds = json.loads(odds_json)
-
-        assert "history" in odds
-        assert len(odds["history"]) == 1
-        assert odds["history"][0]["home"] == 1.5  # Old odds in history
+        odds = json.loads(buf.iloc[0]["odds"])
+        assert "history" not in odds
         assert odds["home"] == 1.6  # New current odds
 
+        history = current_manager.get_odds_history_from_row(0)
+        assert len(history) == 1
+        assert history[0]["odds"]["home"] == 1.5  # Old odds in history
+        assert current_manager.get_movement_for_row(0)["home"] == "up"
+
         current_manager.close()
 
     def test_merge_prunes_past_matches(self, temp_db, fresh_db):
@@ -366,7 +407,7 @@ class TestMergeWithHistoryPreservation:
         fresh_manager.close()
 
         # Merge - past match should not transfer any history
-        current_manager.merge_with_history_preservation(fresh_db, max_history=3, local_tz="UTC")
+        current_manager.merge_with_history_preservation(fresh_db, history_days=4, local_tz="UTC")
 
         # Buffer should have the fresh match only (no history since no matching current future match)
         buf = current_manager.ensure_buffer()
@@ -374,7 +415,187 @@ class TestMergeWithHistoryPreservation:
         assert buf.iloc[0]["home_team_name"] == "Future Team A"
 
         # No history should be present (past match was ignored)
-        odds = json.loads(buf.iloc[0]["odds"])
-        assert "history" not in odds or len(odds.get("history", [])) == 0
+        assert current_manager.get_odds_history_from_row(0) == []
+
+        current_manager.close()
 
+    def test_merge_rekeys_history_when_fresh_row_moves(self, temp_db, fresh_db):
+        """History follows a match whose kickoff date changes in the fresh DB."""
+        current_manager = MatchesManager(temp_db)
+        day = (datetime.now() + timedelta(days=2)).replace(hour=0, minute=0, second=0, microsecond=0)
+        current_manager.add_match(Match("Team A", "Team B", day, [], Odds(home=1.5)))
+        current_manager.flush()
+        old_key = current_manager.history_key("Team A", "Team B", day)
+        current_manager.record_odds_snapshot(old_key, datetime.now().isoformat(), {"home": 1.4})
+
+        fresh_manager = MatchesManager(fresh_db)
+        fresh_manager.add_match(Match("Team A", "Team B", day + timedelta(days=1, hours=1), [], Odds(home=1.6)))
+        fresh_manager.close()
+
+        current_manager.merge_with_history_preservation(fresh_db, history_days=4, local_tz="UTC")
+
+        history = current_manager.get_odds_history_from_row(0)
+        assert [h["odds"]["home"] for h in history] == [1.4, 1.5]
+        assert current_manager.odds_history(old_key) == []
+        current_manager.close()
+
+    def test_merge_prunes_expired_history(self, temp_db, fresh_db):
+        current_manager = MatchesManager(temp_db)
+        current_manager.record_odds_snapshot("a|b|2020-01-01", "2020-01-01T10:00:00+00:00", {"home": 1.5})
+
+        fresh_manager = MatchesManager(fresh_db)
+        fresh_manager.add_match(Match("X", "Y", datetime.now() + timedelta(days=1), [], Odds(home=2.0)))
+        fresh_manager.close()
+
+        current_manager.merge_with_history_preservation(fresh_db, history_days=4, local_tz="UTC")
+        assert current_manager.odds_history("a|b|2020-01-01") == []
+        current_manager.close()
+
+    def test_merge_joins_on_result_url_without_fuzzy(self, temp_db, fresh_db):
+        """A fixture renamed in the fresh DB is still joined through its result URL."""
+        current_manager = MatchesManager(temp_db)  # no similarity config: no fuzzy fallback
+        day = datetime.now() + timedelta(days=1)
+        url = "https://example.com/match/1"
+        current_manager.add_match(Match("Team A", "Team B", day, [], Odds(home=1.5), result_url=url))
+        current_manager.flush()
+
+        fresh_manager = MatchesManager(fresh_db)
+        fresh_manager.add_match(Match("Team A FC", "Team B United", day, [], Odds(home=1.6), result_url=url))
+        fresh_manager.close()
+
+        current_manager.merge_with_history_preservation(fresh_db, history_days=4, local_tz="UTC")
+
+        assert current_manager.ensure_buffer().iloc[0]["home_team_name"] == "Team A FC"
+        assert [h["odds"]["home"] for h in current_manager.get_odds_history_from_row(0)] == [1.5]
         current_manager.close()
+
+    def test_merge_swaps_in_new_file(self, temp_db, fresh_db):
+        """The merged DB replaces the file in one rename and the manager keeps working on it."""
+        current_manager = MatchesManager(temp_db, columnar_odds=True)
+        day = datetime.now() + timedelta(days=1)
+        current_manager.add_match(Match("Team A", "Team B", day, [], Odds(home=1.5)))
+        current_manager.add_match(Match("Old C", "Old D", day, [], Odds(home=3.0)))
+        current_manager.flush()
+
+        fresh_manager = MatchesManager(fresh_db)
+        fresh_manager.add_match(Match("Team A", "Team B", day, [], Odds(home=1.6)))
+        fresh_manager.close()
+
+        current_manager.merge_with_history_preservation(fresh_db, history_days=4, local_tz="UTC")
+
+        assert not os.path.exists(f"{temp_db}.merge-tmp")
+        rows = current_manager.fetch_rows("SELECT home_team_name, odds_home FROM matches")
+        assert [(r[0], r[1]) for r in rows] == [("Team A", 1.6)]
+        assert len(current_manager.get_odds_history_from_row(0)) == 1
+
+        current_manager.add_match(Match("New E", "New F", day, [], Odds(home=2.2)))
+        current_manager.flush()
+        assert len(current_manager.fetch_rows("SELECT id FROM matches")) == 2
+        current_manager.close()
+
+    def test_merge_swap_keeps_storage_profile(self, temp_db, fresh_db):
+        """The connection reopened on the swapped-in file gets the manager's PRAGMAs again."""
+        current_manager = MatchesManager(temp_db, storage_profile="wal")
+        assert current_manager.fetch_rows("PRAGMA journal_mode")[0][0] == "wal"
+        day = datetime.now() + timedelta(days=1)
+        fresh_manager = MatchesManager(fresh_db)
+        fresh_manager.add_match(Match("Team A", "Team B", day, [], Odds(home=1.6)))
+        fresh_manager.close()
+
+        current_manager.merge_with_history_preservation(fresh_db, history_days=4, local_tz="UTC")
+
+        assert current_manager.fetch_rows("PRAGMA journal_mode")[0][0] == "wal"
+        assert current_manager.fetch_rows("PRAGMA busy_timeout")[0][0] == 5000
+        current_manager.close()
+
+    def test_merge_reads_fresh_db_without_changing_it(self, temp_db, fresh_db):
+        """The downloaded DB is only read: no odds_history table or indexes are added to it."""
+        fresh_manager = MatchesManager(fresh_db)
+        fresh_manager.add_match(Match("Team A", "Team B", datetime.now() + timedelta(days=1), [], Odds(home=1.6)))
+        fresh_manager.close()
+        conn = sqlite3.connect(fresh_db)
+        conn.execute("DROP TABLE odds_history")
+        conn.commit()
+        schema = conn.execute("SELECT name FROM sqlite_master ORDER BY name").fetchall()
+        conn.close()
+
+        current_manager = MatchesManager(temp_db)
+        current_manager.merge_with_history_preservation(fresh_db, history_days=4, local_tz="UTC")
+        current_manager.close()
+
+        conn = sqlite3.connect(fresh_db)
+        assert conn.execute("SELECT name FROM sqlite_master ORDER BY name").fetchall() == schema
+        conn.close()
+
+    def test_merge_fuzzy_fallback_joins_renamed_fixture(self, temp_db, fresh_db):
+        """Without a URL or key match the odds are recorded under the fuzzy-matched fresh row."""
+        config = {"threshold": 65, "acronyms": {}, "synonyms": {}}
+        current_manager = MatchesManager(temp_db, config)
+        day = datetime.now() + timedelta(days=1)
+        current_manager.add_match(Match("Team Alpha", "Team Beta", day, [], Odds(home=1.5)))
+        current_manager.flush()
+
+        fresh_manager = MatchesManager(fresh_db)
+        fresh_manager.add_match(Match("Team Alpha FC", "Team Beta", day, [], Odds(home=1.6)))
+        fresh_manager.close()
+
+        current_manager.merge_with_history_preservation(fresh_db, history_days=4, local_tz="UTC")
+
+        assert [h["odds"]["home"] for h in current_manager.get_odds_history_from_row(0)] == [1.5]
+        current_manager.close()
+
+    def test_swap_leaves_wal_first(self, temp_db):
+        """Before the rename the WAL is checkpointed and removed with its -shm file."""
+        current_manager = MatchesManager(temp_db, storage_profile="wal")
+        current_manager.add_match(Match("Team A", "Team B", datetime.now() + timedelta(days=1), [], Odds(home=1.5)))
+        current_manager.flush()
+        assert os.path.exists(f"{temp_db}-wal")
+
+        current_manager._leave_wal()
+
+        assert not os.path.exists(f"{temp_db}-wal")
+        assert not os.path.exists(f"{temp_db}-shm")
+        assert current_manager.fetch_rows("PRAGMA journal_mode")[0][0] == "delete"
+        current_manager.close()
+
+    def test_swap_refused_while_another_connection_uses_wal(self, temp_db, fresh_db):
+        current_manager = MatchesManager(temp_db, storage_profile="wal")
+        day = datetime.now() + timedelta(days=1)
+        current_manager.add_match(Match("Old C", "Old D", day, [], Odds(home=3.0)))
+        current_manager.flush()
+        reader = sqlite3.connect(temp_db)
+        reader.execute("SELECT COUNT(*) FROM matches").fetchone()
+
+        fresh_manager = MatchesManager(fresh_db)
+        fresh_manager.add_match(Match("Team A", "Team B", day, [], Odds(home=1.6)))
+        fresh_manager.close()
+
+        with pytest.raises(RuntimeError):
+            current_manager.merge_with_history_preservation(fresh_db, history_days=4, local_tz="UTC")
+
+        assert not os.path.exists(f"{temp_db}.merge-tmp")
+        assert reader.execute("SELECT home_team_name FROM matches").fetchall() == [("Old C",)]
+        reader.close()
+        current_manager.close()
+
+    def test_slip_builder_sees_movement_after_two_merges(self, temp_db, fresh_db, tmp_path):
+        """Snapshots recorded by the merges reach BetAssistant's candidate legs."""
+        day = datetime.now() + timedelta(days=1)
+        current_manager = MatchesManager(temp_db)
+        current_manager.add_match(Match("Team A", "Team B", day, [], Odds(home=1.5, away=5.0)))
+        current_manager.flush()
+        for home, away in ((1.6, 4.8), (1.8, 4.2)):
+            if os.path.exists(fresh_db):
+                os.remove(fresh_db)
+            fresh_manager = MatchesManager(fresh_db)
+            fresh_manager.add_match(Match("Team A", "Team B", day, [], Odds(home=home, away=away)))
+            fresh_manager.close()
+            current_manager.merge_with_history_preservation(fresh_db, history_days=4, local_tz="UTC")
+
+        with BetAssistant(str(tmp_path / "slips.db")) as assistant:
+            assistant.load_matches(current_manager.fetch_matches(), current_manager.odds_history_lookup())
+            assert [h["home"] for h in assistant.match_history(0)] == [1.5, 1.6]
+            directions = assistant._candidate_table().directions
+        current_manager.close()
+
+        assert sorted(directions.values()) == ["down", "up"]